@@ -0,0 +1,12 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+"""
+Performance benchmarks of ctapipe algorithms, run on toymodel inputs for
+each known camera type. Use the ``ctapipe-benchmark`` tool to run them and
+write the results to a table.
+"""
+
+from .core import (benchmark, get_benchmark_names, time_callable,
+                   run_benchmarks, compare_benchmarks)
+
+__all__ = ['benchmark', 'get_benchmark_names', 'time_callable',
+           'run_benchmarks', 'compare_benchmarks']
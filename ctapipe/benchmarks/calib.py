@@ -0,0 +1,53 @@
+"""
+Benchmarks of the camera calibration in `ctapipe.calib`.
+"""
+import numpy as np
+
+from ctapipe.calib.camera.r1 import HessioR1Calibrator
+from ctapipe.io.containers import DataContainer
+from .core import benchmark
+from .image import make_benchmark_waveforms
+
+__all__ = ['make_benchmark_r0_event']
+
+
+def make_benchmark_r0_event(geom, n_tels=1, pedestal=100):
+    """
+    Build a hessio-like event with R0 data of ``n_tels`` telescopes of one
+    camera type, as expected by `HessioR1Calibrator`.
+
+    Parameters
+    ----------
+    geom: `ctapipe.instrument.CameraGeometry`
+        camera geometry of all telescopes
+    n_tels: int
+        number of telescopes with data
+    pedestal: float
+        pedestal per sample in ADC counts
+
+    Returns
+    -------
+    `ctapipe.io.containers.DataContainer`
+    """
+    waveforms = make_benchmark_waveforms(geom)
+    n_chan, n_pix, n_samples = waveforms.shape
+    adc_samples = np.clip(waveforms * 10 + pedestal, 0, None).astype(np.uint16)
+
+    event = DataContainer()
+    event.meta['origin'] = 'hessio'
+    event.r0.tels_with_data = set(range(1, n_tels + 1))
+    for tel_id in event.r0.tels_with_data:
+        event.r0.tel[tel_id].adc_samples = adc_samples
+        event.mc.tel[tel_id].pedestal = np.full((n_chan, n_pix),
+                                                pedestal * n_samples,
+                                                dtype=np.float32)
+        event.mc.tel[tel_id].dc_to_pe = np.full((n_chan, n_pix), 0.1,
+                                                dtype=np.float32)
+    return event
+
+
+@benchmark('calib.HessioR1Calibrator.calibrate')
+def bench_r1_calibrate(geom):
+    event = make_benchmark_r0_event(geom)
+    calibrator = HessioR1Calibrator(None, None)
+    return lambda: calibrator.calibrate(event)
@@ -0,0 +1,28 @@
+"""
+Benchmarks of the creation and reset of the data containers in
+`ctapipe.io.containers`. The ``rate`` column of the results gives the number
+of containers per second.
+"""
+from ctapipe.io.containers import (DataContainer, DL1CameraContainer,
+                                   HillasParametersContainer,
+                                   ReconstructedShowerContainer)
+from .core import benchmark
+
+__all__ = []
+
+
+def _register_container_benchmark(container_class):
+    @benchmark('containers.' + container_class.__name__, per_camera=False)
+    def bench_container():
+        return container_class
+
+
+for _container in [DataContainer, DL1CameraContainer,
+                   HillasParametersContainer, ReconstructedShowerContainer]:
+    _register_container_benchmark(_container)
+
+
+@benchmark('containers.DataContainer.reset', per_camera=False)
+def bench_data_container_reset():
+    event = DataContainer()
+    return event.reset
@@ -0,0 +1,216 @@
+"""
+Minimal benchmark harness: a registry of benchmark set-up functions, a timer
+and conversion of the timings to an `astropy.table.Table`, so that results
+can be written to disk and compared between releases.
+"""
+import platform
+import timeit
+from collections import OrderedDict
+
+import numpy as np
+from astropy.table import Table, join
+
+import ctapipe
+from ctapipe.instrument import CameraGeometry
+
+__all__ = ['benchmark', 'get_benchmark_names', 'time_callable',
+           'run_benchmarks', 'compare_benchmarks']
+
+_BENCHMARKS = OrderedDict()
+
+
+def benchmark(name, per_camera=True):
+    """
+    Decorator registering a benchmark set-up function.
+
+    The decorated function takes a `ctapipe.instrument.CameraGeometry` and
+    returns a callable without arguments, which is what will be timed. All
+    the preparation of the inputs (toymodel images, waveforms,
+    containers, ...) should be done in the set-up function, so that it is
+    not included in the timing. The set-up function may return None if the
+    benchmark does not apply to the given camera.
+
+    Parameters
+    ----------
+    name: str
+        unique name of the benchmark, e.g. 'image.hillas_parameters_4'
+    per_camera: bool
+        if False, the benchmark does not depend on the camera: it is run
+        only once, and the set-up function takes no argument
+    """
+    def register(setup_function):
+        if name in _BENCHMARKS:
+            raise KeyError("benchmark '{}' is already registered".format(name))
+        _BENCHMARKS[name] = (setup_function, per_camera)
+        return setup_function
+
+    return register
+
+
+def get_benchmark_names():
+    """
+    Returns
+    -------
+    list(str):
+        names of all registered benchmarks
+    """
+    _import_benchmark_modules()
+    return list(_BENCHMARKS.keys())
+
+
+def time_callable(func, repeat=5, number=None):
+    """
+    Time a callable using `timeit`.
+
+    Parameters
+    ----------
+    func: callable
+        function without arguments to time
+    repeat: int
+        number of independent timing runs
+    number: int or None
+        number of calls per timing run. If None, it is chosen such that one
+        run takes at least 0.2 s
+
+    Returns
+    -------
+    dict:
+        best, mean and standard deviation of the time per call in seconds,
+        along with the number of calls and repetitions used
+    """
+    timer = timeit.Timer(func)
+    if number is None:
+        number = _autorange(timer)
+
+    per_call = np.array(timer.repeat(repeat=repeat, number=number)) / number
+    return dict(best=per_call.min(),
+                mean=per_call.mean(),
+                std=per_call.std(),
+                number=number,
+                repeat=repeat)
+
+
+def run_benchmarks(cameras=None, names=None, repeat=5, number=None,
+                   log=None):
+    """
+    Run the registered benchmarks for a set of cameras.
+
+    Parameters
+    ----------
+    cameras: list(str or CameraGeometry) or None
+        camera names (as accepted by `CameraGeometry.from_name`) or
+        geometries to benchmark. By default all cameras returned by
+        `CameraGeometry.get_known_camera_names` are used.
+    names: list(str) or None
+        names of the benchmarks to run, by default all registered benchmarks
+    repeat: int
+        number of timing runs per benchmark, see `time_callable`
+    number: int or None
+        number of calls per timing run, see `time_callable`
+    log: logging.Logger or None
+        if given, progress is reported at debug level
+
+    Returns
+    -------
+    astropy.table.Table:
+        one row per benchmark and camera, with the time per call in
+        seconds and the number of calls per second (``rate``) of the best
+        run. Benchmarks that do not depend on the camera have an empty
+        camera name. The ctapipe version and the platform are stored in the
+        table meta-data.
+    """
+    _import_benchmark_modules()
+
+    if cameras is None:
+        cameras = CameraGeometry.get_known_camera_names()
+    if names is None:
+        names = list(_BENCHMARKS.keys())
+
+    rows = []
+
+    def run(name, func, cam_id='', n_pixels=0):
+        if func is None:
+            return
+        if log is not None:
+            log.debug("benchmarking %s for %s", name, cam_id or 'all cameras')
+        result = time_callable(func, repeat=repeat, number=number)
+        rows.append((name, cam_id, n_pixels, result['best'],
+                     result['mean'], result['std'], 1 / result['best'],
+                     result['number'], result['repeat']))
+
+    for name in names:
+        setup_function, per_camera = _BENCHMARKS[name]
+        if not per_camera:
+            run(name, setup_function())
+
+    for camera in cameras:
+        geom = camera
+        if not isinstance(camera, CameraGeometry):
+            geom = CameraGeometry.from_name(camera)
+
+        for name in names:
+            setup_function, per_camera = _BENCHMARKS[name]
+            if per_camera:
+                run(name, setup_function(geom), str(geom.cam_id),
+                    len(geom.pix_id))
+
+    table = Table(rows=rows if rows else None,
+                  names=['benchmark', 'camera', 'n_pixels', 'best', 'mean',
+                         'std', 'rate', 'number', 'repeat'],
+                  dtype=[str, str, int, float, float, float, float, int,
+                         int])
+    for col in ['best', 'mean', 'std']:
+        table[col].unit = 's'
+    table['rate'].unit = '1 / s'
+    table.meta['CTAPIPE'] = ctapipe.__version__
+    table.meta['PYTHON'] = platform.python_version()
+    table.meta['NUMPY'] = np.__version__
+    table.meta['PLATFORM'] = platform.platform()
+    return table
+
+
+def compare_benchmarks(reference, current, tolerance=0.2):
+    """
+    Compare two benchmark tables as returned by `run_benchmarks` (or read
+    back from disk).
+
+    Parameters
+    ----------
+    reference: astropy.table.Table
+        timings of the reference version (e.g. the previous release)
+    current: astropy.table.Table
+        timings of the version to check
+    tolerance: float
+        relative slow-down of the best time above which a benchmark is
+        flagged as a regression
+
+    Returns
+    -------
+    astropy.table.Table:
+        benchmarks present in both tables, with the reference and current
+        best time, their ratio (current / reference) and a boolean
+        `regression` column
+    """
+    keys = ['benchmark', 'camera']
+    joined = join(reference[keys + ['best']], current[keys + ['best']],
+                  keys=keys, table_names=['reference', 'current'])
+    joined['ratio'] = (np.asarray(joined['best_current'])
+                       / np.asarray(joined['best_reference']))
+    joined['regression'] = joined['ratio'] > 1 + tolerance
+    return joined
+
+
+def _autorange(timer, min_time=0.2):
+    """ smallest number of calls in 1, 2, 5, 10, 20, ... taking min_time """
+    multiplier = 1
+    while True:
+        for number in (1, 2, 5):
+            number *= multiplier
+            if timer.timeit(number) >= min_time:
+                return number
+        multiplier *= 10
+
+
+def _import_benchmark_modules():
+    """ make sure all modules defining benchmarks are registered """
+    from . import containers, image, calib, reco  # noqa: F401
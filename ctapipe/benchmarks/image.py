@@ -0,0 +1,111 @@
+"""
+Benchmarks of the image cleaning, parametrisation and charge extraction
+algorithms in `ctapipe.image`.
+"""
+import numpy as np
+
+from ctapipe.core import Factory
+from ctapipe.image import toymodel
+from ctapipe.image.charge_extractors import ChargeExtractor
+from ctapipe.image.cleaning import tailcuts_clean
+from ctapipe.image.hillas import (hillas_parameters_1, hillas_parameters_2,
+                                  hillas_parameters_3, hillas_parameters_4)
+from .core import benchmark
+
+__all__ = ['make_benchmark_image', 'make_benchmark_waveforms']
+
+N_SAMPLES = 40
+
+
+def make_benchmark_image(geom, psi='35d', seed=0):
+    """
+    Generate a reproducible toymodel shower image for a camera. The shower
+    size is scaled with the camera radius so that images of all cameras
+    cover a similar fraction of the pixels.
+
+    Parameters
+    ----------
+    geom: `ctapipe.instrument.CameraGeometry`
+        camera geometry
+    psi: convertable to `astropy.coordinates.Angle`
+        orientation of the shower
+    seed: int
+        random seed for the noise
+
+    Returns
+    -------
+    image: ndarray
+        pixel values in photo-electrons
+    """
+    radius = np.max(np.hypot(geom.pix_x.value, geom.pix_y.value))
+    model = toymodel.generate_2d_shower_model(
+        centroid=(0.3 * radius, 0.2 * radius),
+        width=(0.04 * radius) ** 2,
+        length=(0.15 * radius) ** 2,
+        psi=psi
+    )
+    np.random.seed(seed)
+    image, _, _ = toymodel.make_toymodel_shower_image(geom, model.pdf,
+                                                      intensity=50,
+                                                      nsb_level_pe=5)
+    return image
+
+
+def make_benchmark_waveforms(geom, n_samples=N_SAMPLES, seed=0):
+    """
+    Generate waveforms of shape (1, n_pix, n_samples) containing a gaussian
+    pulse scaled by the toymodel image of `make_benchmark_image`, with the
+    pulse time varying across the camera, plus white noise.
+    """
+    image = make_benchmark_image(geom, seed=seed)
+    rng = np.random.RandomState(seed)
+    t0 = n_samples / 2 + geom.pix_x.value / geom.pix_x.value.ptp() * 4
+    samples = np.arange(n_samples)
+    pulse = np.exp(-0.5 * ((samples - t0[:, None]) / 2.0) ** 2)
+    waveforms = image[:, None] * pulse + rng.normal(0, 0.5, pulse.shape)
+    return waveforms[None, ...]
+
+
+def _cleaned_image(geom):
+    image = make_benchmark_image(geom)
+    mask = tailcuts_clean(geom, image, picture_thresh=10, boundary_thresh=5)
+    image[~mask] = 0
+    return image
+
+
+@benchmark('image.tailcuts_clean')
+def bench_tailcuts_clean(geom):
+    image = make_benchmark_image(geom)
+    geom.neighbor_matrix_sparse  # neighbours are computed once per camera
+    return lambda: tailcuts_clean(geom, image, picture_thresh=10,
+                                  boundary_thresh=5)
+
+
+def _register_hillas_benchmark(hillas_function):
+    @benchmark('image.' + hillas_function.__name__)
+    def bench_hillas(geom):
+        image = _cleaned_image(geom)
+        if image.sum() == 0:
+            return None
+        pix_x, pix_y = geom.pix_x, geom.pix_y
+        return lambda: hillas_function(pix_x, pix_y, image,
+                                       recalculate_pixels=False)
+
+
+for _hillas in [hillas_parameters_1, hillas_parameters_2,
+                hillas_parameters_3, hillas_parameters_4]:
+    _register_hillas_benchmark(_hillas)
+
+
+def _register_extractor_benchmark(extractor_class):
+    @benchmark('image.extract_charge.' + extractor_class.__name__)
+    def bench_extractor(geom):
+        waveforms = make_benchmark_waveforms(geom)
+        extractor = extractor_class(None, None)
+        if extractor.requires_neighbours():
+            extractor.neighbours = geom.neighbor_matrix_where
+        return lambda: extractor.extract_charge(waveforms)
+
+
+for _extractor in Factory.child_subclasses(ChargeExtractor):
+    _register_extractor_benchmark(_extractor)
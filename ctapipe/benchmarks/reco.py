@@ -0,0 +1,42 @@
+"""
+Benchmarks of the shower reconstruction in `ctapipe.reco`.
+"""
+from astropy import units as u
+
+from ctapipe.image.hillas import hillas_parameters
+from ctapipe.instrument import (OpticsDescription, SubarrayDescription,
+                                TelescopeDescription)
+from ctapipe.io.containers import InstrumentContainer
+from ctapipe.reco.HillasReconstructor import HillasReconstructor
+from .core import benchmark
+from .image import make_benchmark_image
+
+__all__ = []
+
+
+@benchmark('reco.HillasReconstructor.predict')
+def bench_hillas_reconstructor(geom):
+    optics = OpticsDescription(mirror_type='DC', tel_type='MST',
+                               tel_subtype='', effective_focal_length=16 * u.m)
+    tel_positions = {1: [-100, -100] * u.m, 2: [100, -100] * u.m,
+                     3: [100, 100] * u.m, 4: [-100, 100] * u.m}
+    psis = {1: '45d', 2: '135d', 3: '-135d', 4: '-45d'}
+
+    inst = InstrumentContainer()
+    inst.subarray = SubarrayDescription(
+        'benchmark',
+        tel_positions=tel_positions,
+        tel_descriptions={tel_id: TelescopeDescription(optics, geom)
+                          for tel_id in tel_positions}
+    )
+
+    hillas_dict = {
+        tel_id: hillas_parameters(geom.pix_x, geom.pix_y,
+                                  make_benchmark_image(geom, psi=psi))
+        for tel_id, psi in psis.items()
+    }
+    tel_phi = {tel_id: 0 * u.deg for tel_id in tel_positions}
+    tel_theta = {tel_id: 20 * u.deg for tel_id in tel_positions}
+
+    reconstructor = HillasReconstructor()
+    return lambda: reconstructor.predict(hillas_dict, inst, tel_phi, tel_theta)
@@ -0,0 +1,37 @@
+from ctapipe.benchmarks import (get_benchmark_names, run_benchmarks,
+                                compare_benchmarks, time_callable)
+from ctapipe.instrument import CameraGeometry
+
+
+def test_time_callable():
+    result = time_callable(lambda: sum(range(100)), repeat=2, number=10)
+    assert result['number'] == 10
+    assert result['repeat'] == 2
+    assert 0 < result['best'] <= result['mean']
+
+
+def test_benchmark_names():
+    names = get_benchmark_names()
+    for version in range(1, 5):
+        assert 'image.hillas_parameters_{}'.format(version) in names
+    assert 'image.tailcuts_clean' in names
+    assert 'image.extract_charge.NeighbourPeakIntegrator' in names
+    assert 'calib.HessioR1Calibrator.calibrate' in names
+    assert 'reco.HillasReconstructor.predict' in names
+    assert 'containers.DataContainer' in names
+
+
+def test_run_and_compare_benchmarks():
+    geom = CameraGeometry.make_rectangular(20, 20)
+    results = run_benchmarks(cameras=[geom], repeat=1, number=1)
+
+    assert len(results) == len(get_benchmark_names())
+    assert (results['best'] > 0).all()
+    assert (results['rate'] > 0).all()
+    assert results[results['benchmark'] == 'containers.DataContainer'][
+        'camera'][0] == ''
+    assert 'CTAPIPE' in results.meta
+
+    comparison = compare_benchmarks(results, results)
+    assert len(comparison) == len(results)
+    assert not comparison['regression'].any()
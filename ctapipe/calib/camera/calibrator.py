@@ -4,7 +4,10 @@ Conveniance calibrator to handle the full camera calibration.
 This calibrator will apply the calibrations found in r1.py, dl0.py and dl1.py.
 """
 
+import numpy as np
+
 from ctapipe.core import Component
+from ctapipe.core.traits import Bool
 from ctapipe.calib.camera import CameraR1CalibratorFactory, CameraDL0Reducer, \
     CameraDL1Calibrator
 from ctapipe.image import ChargeExtractorFactory, WaveformCleanerFactory
@@ -40,9 +43,24 @@ class CameraCalibrator(Component):
         cleaner='WaveformCleanerFactory.cleaner',
         cleaner_t0='WaveformCleanerFactory.t0',
         ))
+
+    With `fused`, each telescope is calibrated from R0 to DL1 in one go:
+    the R1 pe samples are computed in a float32 buffer that is allocated
+    once per telescope and reused for every event, and directly reduced,
+    cleaned and integrated. The r1 and dl0 containers (and the cleaned
+    waveforms of dl1) are only filled, with copies of the waveforms, if
+    `keep_waveforms` is set. Telescopes without R0 data are left unchanged.
+    This requires an R1 calibrator with `supports_fused` set (e.g.
+    `HessioR1Calibrator`).
     
     """
     name = 'CameraCalibrator'
+    fused = Bool(False, help='Calibrate each telescope from R0 to DL1 in '
+                             'one pass, in float32 buffers reused between '
+                             'events').tag(config=True)
+    keep_waveforms = Bool(False, help='In fused mode, also store the R1, '
+                                      'DL0 and cleaned waveforms in the '
+                                      'event').tag(config=True)
 
     def __init__(self, config, tool, origin='hessio', **kwargs):
         """
@@ -82,6 +100,13 @@ class CameraCalibrator(Component):
         self.dl1 = CameraDL1Calibrator(config=config, tool=tool,
                                        extractor=extractor, cleaner=cleaner)
 
+        if self.fused and not self.r1.supports_fused:
+            self.log.warning("%s does not support the fused calibration, "
+                             "using the separate calibration steps",
+                             self.r1.name)
+            self.fused = False
+        self._scratch = {}
+
     def calibrate(self, event):
         """
         Perform the full camera calibration from R0 to DL1. Any calibration
@@ -93,6 +118,43 @@ class CameraCalibrator(Component):
         event : container
             A `ctapipe` event container
         """
-        self.r1.calibrate(event)
-        self.dl0.reduce(event)
-        self.dl1.calibrate(event)
+        if self.fused:
+            self._calibrate_fused(event)
+        else:
+            self.r1.calibrate(event)
+            self.dl0.reduce(event)
+            self.dl1.calibrate(event)
+
+    def _get_scratch(self, telid, shape):
+        """ float32 buffer of the waveforms of a telescope """
+        scratch = self._scratch.get(telid)
+        if scratch is None or scratch.shape != shape:
+            scratch = np.empty(shape, dtype=np.float32)
+            self._scratch[telid] = scratch
+        return scratch
+
+    def _calibrate_fused(self, event):
+        """ calibrate each telescope from R0 to DL1 in one pass """
+        for telid in event.r0.tels_with_data:
+            if not self.r1.check_r0_exists(event, telid):
+                continue
+            shape = event.r0.tel[telid].adc_samples.shape
+            # single-sample waveforms are stored as the dl1 image
+            out = self._get_scratch(telid, shape) if shape[2] > 1 else None
+
+            r1 = self.r1.calibrate_telescope(event, telid, out=out)
+            dl0 = self.dl0.reduce_waveforms(r1)
+            if self.keep_waveforms:
+                # the buffer is overwritten by the next event
+                if r1 is out:
+                    kept = r1.copy()
+                    dl0 = kept if dl0 is r1 else dl0
+                    r1 = kept
+                event.r1.tel[telid].pe_samples = r1
+                event.dl0.tel[telid].pe_samples = dl0
+                self.dl1.calibrate_telescope(event, telid, dl0)
+            else:
+                event.r1.tel[telid].pe_samples = None
+                event.dl0.tel[telid].pe_samples = None
+                self.dl1.calibrate_telescope(event, telid, dl0,
+                                             keep_cleaned=False)
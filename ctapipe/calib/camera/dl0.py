@@ -9,6 +9,7 @@ if a reductor from `ctapipe.image.reductors` is passed to the
 `CameraDL0Reducer`, then the reduction will be applied.
 """
 from ctapipe.core import Component
+from ctapipe.core.traits import CaselessStrEnum
 
 __all__ = ['CameraDL0Reducer']
 
@@ -35,6 +36,10 @@ class CameraDL0Reducer(Component):
     """
 
     name = 'CameraDL0Reducer'
+    dtype = CaselessStrEnum(['float64', 'float32'], None, allow_none=True,
+                            help='Floating point type of the dl0 pe samples. '
+                                 'Set to None to keep the type of the r1 '
+                                 'samples.').tag(config=True)
 
     def __init__(self, config, tool, reductor=None, **kwargs):
         super().__init__(config=config, parent=tool, **kwargs)
@@ -87,8 +92,25 @@ class CameraDL0Reducer(Component):
         for telid in tels:
             r1 = event.r1.tel[telid].pe_samples
             if self.check_r1_exists(event, telid):
-                if self._reductor is None:
-                    event.dl0.tel[telid].pe_samples = r1
-                else:
-                    reduction = self._reductor.reduce_waveforms(r1)
-                    event.dl0.tel[telid].pe_samples = reduction
+                event.dl0.tel[telid].pe_samples = self.reduce_waveforms(r1)
+
+    def reduce_waveforms(self, waveforms):
+        """
+        Apply the data volume reduction to the waveforms of one telescope.
+
+        Parameters
+        ----------
+        waveforms : ndarray
+            R1 pe samples of shape (n_chan, n_pix, n_samples)
+
+        Returns
+        -------
+        ndarray
+            The reduced waveforms, or ``waveforms`` itself if no reductor is
+            used and it is already of type `dtype`.
+        """
+        if self.dtype is not None:
+            waveforms = waveforms.astype(self.dtype, copy=False)
+        if self._reductor is None:
+            return waveforms
+        return self._reductor.reduce_waveforms(waveforms)
@@ -10,9 +10,9 @@ from `ctapipe.image.charge_extractors`.
 import numpy as np
 
 from ctapipe.core import Component
-from ctapipe.core.traits import Float
+from ctapipe.core.traits import Float, CaselessStrEnum, Bool
 from ctapipe.image import NeighbourPeakIntegrator, NullWaveformCleaner
-from ctapipe.instrument import CameraGeometry
+from ctapipe.instrument import geometry_registry
 
 __all__ = ['CameraDL1Calibrator']
 
@@ -80,7 +80,9 @@ class CameraDL1Calibrator(Component):
     The calibrator for DL1 charge extraction. Fills the dl1 container.
 
     It handles the integration correction and, if required, the list of
-    neighbours.
+    neighbours. The integration correction only depends on the reference
+    pulse shape and sampling of the telescope type and on the window of the
+    extractor, so it is computed once per combination of those.
 
     Parameters
     ----------
@@ -111,6 +113,15 @@ class CameraDL1Calibrator(Component):
                            help='Amplitude in p.e. above which the signal is '
                                 'clipped. Set to None for no '
                                 'clipping.').tag(config=True)
+    dtype = CaselessStrEnum(['float64', 'float32'], None, allow_none=True,
+                            help='Floating point type of the cleaned '
+                                 'waveforms and image. Set to None to keep '
+                                 'the type of the dl0 samples.').tag(
+        config=True)
+    keep_window = Bool(True, help='Store the integration window of each '
+                                  'sample in extracted_samples. Otherwise it '
+                                  'is set to None and the window array is '
+                                  'never built.').tag(config=True)
 
     def __init__(self, config, tool, extractor=None, cleaner=None, **kwargs):
         super().__init__(config=config, parent=tool, **kwargs)
@@ -121,6 +132,7 @@ class CameraDL1Calibrator(Component):
         if self.cleaner is None:
             self.cleaner = NullWaveformCleaner(config, tool)
         self._dl0_empty_warn = False
+        self._corrections = {}
 
     def check_dl0_exists(self, event, telid):
         """
@@ -162,14 +174,15 @@ class CameraDL1Calibrator(Component):
             A `ctapipe` event container
         telid : int
             The telescope id.
-            The neighbours are calculated once per telescope.
+            The geometry (and therefore the neighbours) is obtained once per
+            telescope from the shared
+            `ctapipe.instrument.geometry_registry`.
 
         Returns
         -------
         `CameraGeometry`
         """
-        return CameraGeometry.guess(*event.inst.pixel_pos[telid],
-                                    event.inst.optical_foclen[telid])
+        return geometry_registry.from_event(event, telid)
 
     def get_correction(self, event, telid):
         """
@@ -181,11 +194,15 @@ class CameraDL1Calibrator(Component):
             A `ctapipe` event container
         telid : int
             The telescope id.
-            The integration correction is calculated once per telescope.
+            The integration correction is calculated once per telescope
+            type (reference pulse shape and sampling) and extractor window.
+            As the window is part of the key, changing the window_width or
+            window_shift of the extractor gives a new correction.
 
         Returns
         -------
         ndarray
+            Read-only array of the correction for each channel.
         """
         try:
             shift = self.extractor.window_shift
@@ -194,15 +211,23 @@ class CameraDL1Calibrator(Component):
             shape = event.mc.tel[telid].reference_pulse_shape
             step = event.mc.tel[telid].meta['refstep']
             time_slice = event.mc.tel[telid].time_slice
-            correction = integration_correction(n_chan, shape, step,
-                                                time_slice, width, shift)
-            return correction
+            key = (shape.tobytes(), shape.shape, n_chan, step, time_slice,
+                   width, shift)
         except (AttributeError, KeyError):
             # Don't apply correction when window_shift or window_width
             # does not exist in extractor, or when container does not have
             # a reference pulse shape
             return np.ones(event.inst.num_channels[telid])
 
+        correction = self._corrections.get(key)
+        if correction is None:
+            correction = integration_correction(n_chan, shape, step,
+                                                time_slice, width, shift)
+            # shared by all the events of this telescope type
+            correction.flags.writeable = False
+            self._corrections[key] = correction
+        return correction
+
     def calibrate(self, event):
         """
         Fill the dl1 container with the calibration data that results from the
@@ -217,36 +242,60 @@ class CameraDL1Calibrator(Component):
 
             if self.check_dl0_exists(event, telid):
                 waveforms = event.dl0.tel[telid].pe_samples
-                n_samples = waveforms.shape[2]
-                if n_samples == 1:
-                    # To handle ASTRI and dst
-                    corrected = waveforms
-                    window = np.ones(waveforms.shape)
-                    peakpos = np.zeros(waveforms.shape[0:2])
-                    cleaned = waveforms
-                else:
-                    # Clean waveforms
-                    cleaned = self.cleaner.apply(waveforms)
-
-                    # Extract charge
-                    if self.extractor.requires_neighbours():
-                        e = self.extractor
-                        g = self.get_geometry(event, telid)
-                        e.neighbours = g.neighbor_matrix_where
-                    extract = self.extractor.extract_charge
-                    charge, peakpos, window = extract(cleaned)
-
-                    # Apply integration correction
-                    correction = self.get_correction(event, telid)[:, None]
-                    corrected = charge * correction
-
-                # Clip amplitude
-                if self.clip_amplitude:
-                    corrected[corrected > self.clip_amplitude] = \
-                        self.clip_amplitude
-
-                # Store into event container
-                event.dl1.tel[telid].image = corrected
-                event.dl1.tel[telid].extracted_samples = window
-                event.dl1.tel[telid].peakpos = peakpos
-                event.dl1.tel[telid].cleaned = cleaned
+                self.calibrate_telescope(event, telid, waveforms)
+
+    def calibrate_telescope(self, event, telid, waveforms, keep_cleaned=True):
+        """
+        Fill the dl1 container of one telescope from its DL0 waveforms.
+
+        Parameters
+        ----------
+        event : container
+            A `ctapipe` event container
+        telid : int
+            The telescope id.
+        waveforms : ndarray
+            DL0 pe samples of shape (n_chan, n_pix, n_samples). They are not
+            modified, but may be stored in the dl1 container as the cleaned
+            waveforms when no cleaning is applied.
+        keep_cleaned : bool
+            Store the cleaned waveforms in the dl1 container, otherwise it is
+            set to None.
+        """
+        if self.dtype is not None:
+            waveforms = waveforms.astype(self.dtype, copy=False)
+        n_samples = waveforms.shape[2]
+        if n_samples == 1:
+            # To handle ASTRI and dst
+            corrected = waveforms
+            window = np.ones(waveforms.shape)
+            peakpos = np.zeros(waveforms.shape[0:2])
+            cleaned = waveforms
+        else:
+            # Clean waveforms
+            cleaned = self.cleaner.apply(waveforms)
+
+            # Extract charge
+            if self.extractor.requires_neighbours():
+                e = self.extractor
+                g = self.get_geometry(event, telid)
+                e.neighbours = g.neighbor_matrix_where
+            extract = self.extractor.extract_charge
+            charge, peakpos, window = extract(cleaned,
+                                              with_window=self.keep_window)
+
+            # Apply integration correction, in the precision of the charge
+            correction = self.get_correction(event, telid)[:, None]
+            dtype = np.result_type(charge, np.float32)
+            corrected = charge * correction.astype(dtype, copy=False)
+
+        # Clip amplitude
+        if self.clip_amplitude:
+            corrected[corrected > self.clip_amplitude] = \
+                self.clip_amplitude
+
+        # Store into event container
+        event.dl1.tel[telid].image = corrected
+        event.dl1.tel[telid].extracted_samples = window
+        event.dl1.tel[telid].peakpos = peakpos
+        event.dl1.tel[telid].cleaned = cleaned if keep_cleaned else None
@@ -13,6 +13,7 @@ Through the use of `CameraR1CalibratorFactory`, the correct
 `CameraR1Calibrator` can be obtained based on the origin (MC/Camera format)
 of the data.
 """
+import numpy as np
 from traitlets import CaselessStrEnum, Unicode
 from ctapipe.core import Component, Factory
 from abc import abstractmethod
@@ -56,6 +57,15 @@ class CameraR1Calibrator(Component):
 
     name = 'CameraR1Calibrator'
     origin = None
+    # child classes supporting the fused calibration of
+    # `ctapipe.calib.camera.CameraCalibrator` set this to True and define
+    # calibrate_telescope(event, telid, out=None)
+    supports_fused = False
+    dtype = CaselessStrEnum(['float64', 'float32'], None, allow_none=True,
+                            help='Floating point type of the pe samples. '
+                                 'Set to None to use the type resulting '
+                                 'from the pedestal and gain '
+                                 'arithmetic.').tag(config=True)
 
     def __init__(self, config, tool, **kwargs):
         """
@@ -129,7 +139,9 @@ class HessioR1Calibrator(CameraR1Calibrator):
     The R1 calibrator for hessio files. Fills the r1 container.
 
     This calibrator correctly applies the pedestal subtraction and conversion
-    from counts to photoelectrons for the Monte-Carlo data.
+    from counts to photoelectrons for the Monte-Carlo data. The pe samples
+    are computed in `dtype` if it is set, otherwise in the type of the
+    pedestal and gain arithmetic (float32 for simtelarray files).
 
     Parameters
     ----------
@@ -146,20 +158,81 @@ class HessioR1Calibrator(CameraR1Calibrator):
 
     name = 'HessioR1Calibrator'
     origin = 'hessio'
+    supports_fused = True
 
     def calibrate(self, event):
+        self._check_origin(event)
+        for telid in event.r0.tels_with_data:
+            if self.check_r0_exists(event, telid):
+                samples = event.r0.tel[telid].adc_samples
+                ped, gain = self._get_pedestal_and_gain(event, telid)
+                # calibrate in place, recycling the array of a previous
+                # event if the container is reused
+                calibrated = event.r1.tel[telid].get_array(
+                    'pe_samples', samples.shape,
+                    self._get_dtype(samples, ped, gain)
+                )
+                self._apply(samples, ped, gain, calibrated)
+
+    def calibrate_telescope(self, event, telid, out=None):
+        """
+        Perform the R1 calibration of a single telescope, without filling the
+        r1 container. Used by the fused calibration of
+        `ctapipe.calib.camera.CameraCalibrator`.
+
+        Parameters
+        ----------
+        event : container
+            A `ctapipe` event container
+        telid : int
+            The telescope id.
+        out : ndarray or None
+            Array in which to store the pe samples (e.g. a float32 scratch
+            buffer), with the shape of the R0 samples. By default a new
+            array of type `dtype` (if set) is allocated.
+
+        Returns
+        -------
+        ndarray
+            The pe samples, of shape (n_chan, n_pix, n_samples).
+        """
+        self._check_origin(event)
+        samples = event.r0.tel[telid].adc_samples
+        ped, gain = self._get_pedestal_and_gain(event, telid)
+        if out is None:
+            out = np.empty(samples.shape,
+                           self._get_dtype(samples, ped, gain))
+        return self._apply(samples, ped, gain, out)
+
+    def _get_dtype(self, samples, ped, gain):
+        """ type of the pe samples """
+        if self.dtype is not None:
+            return self.dtype
+        return np.result_type(samples, ped, gain)
+
+    @staticmethod
+    def _check_origin(event):
         if event.meta['origin'] != 'hessio':
             raise ValueError('Using HessioR1Calibrator to calibrate a '
                              'non-hessio event.')
 
-        for telid in event.r0.tels_with_data:
-            if self.check_r0_exists(event, telid):
-                samples = event.r0.tel[telid].adc_samples
-                n_samples = samples.shape[2]
-                ped = event.mc.tel[telid].pedestal / n_samples
-                gain = event.mc.tel[telid].dc_to_pe * CALIB_SCALE
-                calibrated = (samples - ped[..., None]) * gain[..., None]
-                event.r1.tel[telid].pe_samples = calibrated
+    @staticmethod
+    def _get_pedestal_and_gain(event, telid):
+        """ pedestal per sample and gain, of shape (n_chan, n_pix) """
+        n_samples = event.r0.tel[telid].adc_samples.shape[2]
+        ped = event.mc.tel[telid].pedestal / n_samples
+        gain = event.mc.tel[telid].dc_to_pe * CALIB_SCALE
+        return ped, gain
+
+    @staticmethod
+    def _apply(samples, ped, gain, out):
+        """ (samples - ped) * gain, computed in ``out`` """
+        # mixing dtypes would compute in float64 and cast afterwards
+        ped = ped.astype(out.dtype, copy=False)
+        gain = gain.astype(out.dtype, copy=False)
+        np.subtract(samples, ped[..., None], out=out)
+        out *= gain[..., None]
+        return out
 
 
 # External Children
@@ -246,6 +319,11 @@ class CameraR1CalibratorFactory(Factory):
                           help='Path to an pe conversion file').tag(config=True)
     ff_path = Unicode('', allow_none=True,
                       help='Path to a flat field file').tag(config=True)
+    dtype = CaselessStrEnum(['float64', 'float32'], None, allow_none=True,
+                            help='Floating point type of the pe samples. '
+                                 'Set to None to use the type resulting '
+                                 'from the pedestal and gain '
+                                 'arithmetic.').tag(config=True)
 
     def get_factory_name(self):
         return self.name
@@ -21,3 +21,21 @@ def test_camera_calibrator():
     calibrator.calibrate(event)
     image = event.dl1.tel[telid].image
     assert_allclose(image[0, 0], -2.216, 1e-3)
+
+
+def test_fused_calibration():
+    event = get_test_event()
+    telid = 11
+
+    CameraCalibrator(None, None).calibrate(event)
+    image = event.dl1.tel[telid].image.copy()
+
+    fused = CameraCalibrator(None, None, fused=True)
+    fused.calibrate(event)
+    assert_allclose(event.dl1.tel[telid].image, image, rtol=1e-4, atol=1e-4)
+    assert event.r1.tel[telid].pe_samples is None
+    assert event.dl0.tel[telid].pe_samples is None
+
+    fused = CameraCalibrator(None, None, fused=True, keep_waveforms=True)
+    fused.calibrate(event)
+    assert event.r1.tel[telid].pe_samples is not None
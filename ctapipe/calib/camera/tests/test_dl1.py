@@ -1,3 +1,4 @@
+import numpy as np
 from ctapipe.calib.camera.dl1 import integration_correction, \
     CameraDL1Calibrator
 from ctapipe.calib.camera.dl0 import CameraDL0Reducer
@@ -51,6 +52,38 @@ def test_camera_dl1_calibrator():
     assert_allclose(image[0, 0], -2.216, 1e-3)
 
 
+def test_correction_cache():
+    event = get_test_event()
+    telid = 11
+
+    calibrator = CameraDL1Calibrator(None, None)
+    correction = calibrator.get_correction(event, telid)
+    assert calibrator.get_correction(event, telid) is correction
+
+    calibrator.extractor.window_width = 5
+    calibrator.extractor.window_shift = 2
+    other = calibrator.get_correction(event, telid)
+    assert other is not correction
+    n_chan = event.inst.num_channels[telid]
+    shape = event.mc.tel[telid].reference_pulse_shape
+    step = event.mc.tel[telid].meta['refstep']
+    time_slice = event.mc.tel[telid].time_slice
+    assert_allclose(other, integration_correction(n_chan, shape, step,
+                                                  time_slice, 5, 2))
+
+
+def test_float32_dl1_calibrator():
+    event = get_test_event()
+    previous_calibration(event)
+    telid = 11
+
+    calibrator = CameraDL1Calibrator(None, None, dtype='float32')
+    calibrator.calibrate(event)
+    image = event.dl1.tel[telid].image
+    assert image.dtype == np.float32
+    assert_allclose(image[0, 0], -2.216, 1e-3)
+
+
 def test_check_dl0_exists():
     telid = 11
     event = get_test_event()
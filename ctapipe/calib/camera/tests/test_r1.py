@@ -1,3 +1,4 @@
+import numpy as np
 from numpy.testing import assert_almost_equal
 from ctapipe.io.hessio import hessio_event_source
 from ctapipe.utils import get_dataset
@@ -21,6 +22,14 @@ def test_hessio_r1_calibrator():
     r1 = event.r1.tel[telid].pe_samples
     assert_almost_equal(r1[0, 0, 0], -0.091, 3)
 
+    # by default, the type is the one of the pedestal and gain arithmetic
+    n_samples = r1.shape[2]
+    ped = event.mc.tel[telid].pedestal / n_samples
+    gain = event.mc.tel[telid].dc_to_pe
+    expected = (event.r0.tel[telid].adc_samples - ped[..., None]) \
+        * gain[..., None]
+    assert r1.dtype == expected.dtype
+
 
 def test_check_r0_exists():
     telid = 11
@@ -41,3 +50,13 @@ def test_factory():
     calibrator.calibrate(event)
     r1 = event.r1.tel[telid].pe_samples
     assert_almost_equal(r1[0, 0, 0], -0.091, 3)
+
+
+def test_float32_r1_calibrator():
+    telid = 11
+    event = get_test_event()
+    calibrator = HessioR1Calibrator(None, None, dtype='float32')
+    calibrator.calibrate(event)
+    r1 = event.r1.tel[telid].pe_samples
+    assert r1.dtype == np.float32
+    assert_almost_equal(r1[0, 0, 0], -0.091, 3)
@@ -1,10 +1,10 @@
 # Licensed under a 3-clause BSD style license - see LICENSE.rst
 
 from .component import Component
-from .container import Container, Field, Map
+from .container import Container, ContainerBatch, Field, Map
 from .factory import Factory
 from .provenance import Provenance
 from .tool import Tool, ToolConfigurationError
 
-__all__ = ['Component', 'Container', 'Tool', 'Field', 'Map', 'Factory',
-           'Provenance', 'ToolConfigurationError']
+__all__ = ['Component', 'Container', 'ContainerBatch', 'Tool', 'Field',
+           'Map', 'Factory', 'Provenance', 'ToolConfigurationError']
@@ -1,8 +1,13 @@
 from collections import defaultdict
 from copy import deepcopy
+from functools import partial
 from pprint import pformat
 from textwrap import wrap
 
+import numpy as np
+from astropy.time import Time
+from astropy.units import Quantity, Unit
+
 
 class Field:
     """
@@ -33,6 +38,45 @@ class Field:
         return desc
 
 
+#: types of Field defaults that can be shared between Container instances
+_IMMUTABLE_TYPES = (type(None), bool, int, float, complex, str, bytes,
+                   np.generic, frozenset)
+
+
+def _default_factory(default):
+    """
+    Return a function creating a new copy of the Field default
+    ``default``, or None if the default is immutable and can be assigned
+    directly.
+    """
+    if isinstance(default, _IMMUTABLE_TYPES):
+        return None
+    if isinstance(default, tuple):
+        if all(_default_factory(item) is None for item in default):
+            return None
+    elif isinstance(default, Map) and len(default) == 0:
+        return partial(type(default), default.default_factory)
+    elif isinstance(default, Container) and _is_pristine(default):
+        return type(default)
+    return partial(deepcopy, default)
+
+
+def _is_pristine(container):
+    """ True if all fields of a Container still have their default value """
+    for name, field in container.fields.items():
+        value = getattr(container, name)
+        try:
+            if isinstance(value, Container):
+                if type(value) is not type(field.default) \
+                        or not _is_pristine(value):
+                    return False
+            elif not bool(value == field.default):
+                return False
+        except (TypeError, ValueError):
+            return False
+    return not container.meta
+
+
 class ContainerMeta(type):
     '''
     The MetaClass for the Containers
@@ -43,18 +87,32 @@ class ContainerMeta(type):
 
     This makes sure, that the metadata is immutable,
     and no new fields can be added to a container by accident.
+
+    The Field defaults are classified once, when the class is created:
+    immutable defaults are assigned as they are to new instances, while
+    mutable ones (e.g. sub-Containers, Maps or arrays) are created by a
+    factory for each instance.
     '''
     def __new__(cls, name, bases, dct):
         items = [
             k for k, v in dct.items()
             if isinstance(v, Field)
         ]
-        dct['__slots__'] = tuple(items + ['meta'])
+        dct['__slots__'] = tuple(items + ['meta', '_buffers'])
         dct['fields'] = {}
 
         for k in items:
             dct['fields'][k] = dct.pop(k)
 
+        dct['_immutable_defaults'] = []
+        dct['_mutable_defaults'] = []
+        for k, field in dct['fields'].items():
+            factory = _default_factory(field.default)
+            if factory is None:
+                dct['_immutable_defaults'].append((k, field.default))
+            else:
+                dct['_mutable_defaults'].append((k, factory))
+
         return type.__new__(cls, name, bases, dct)
 
 
@@ -113,8 +171,12 @@ class Container(metaclass=ContainerMeta):
     def __init__(self, **fields):
 
         self.meta = {}
-        for k, v in self.fields.items():
-            setattr(self, k, deepcopy(v.default))
+        self._buffers = None
+        for k, v in self._immutable_defaults:
+            setattr(self, k, v)
+        for k, factory in self._mutable_defaults:
+            if k not in fields:
+                setattr(self, k, factory())
 
         for k, v in fields.items():
             setattr(self, k, v)
@@ -169,13 +231,63 @@ class Container(metaclass=ContainerMeta):
         cls.__setattr__ = object.__setattr__
 
     def reset(self, recursive=True):
-        """ set all values back to their default values"""
-        for name, value in self.fields.items():
-            if isinstance(value, Container):
-                if recursive:
-                    getattr(self, name).reset()
+        """
+        set all values back to their default values.
+
+        With ``recursive``, sub-Containers are reset in place and `Map`
+        fields are emptied with `Map.release`, so no new objects are
+        created. Arrays held by fields with a default of None are kept to be
+        recycled by `get_array`.
+        """
+        for name, default in self._immutable_defaults:
+            if default is None:
+                value = getattr(self, name)
+                if isinstance(value, np.ndarray):
+                    if self._buffers is None:
+                        self._buffers = {}
+                    self._buffers[name] = value
+            setattr(self, name, default)
+
+        for name, factory in self._mutable_defaults:
+            value = getattr(self, name)
+            if recursive and isinstance(value, Container):
+                value.reset()
+            elif recursive and isinstance(value, Map):
+                value.release()
             else:
-                setattr(self, name, deepcopy(self.fields[name].default))
+                setattr(self, name, factory())
+
+    def get_array(self, name, shape, dtype=np.float64):
+        """
+        Get an array to be filled in place, and assign it to the field
+        ``name``.
+
+        If the field held an array of the same shape and dtype before the
+        last `reset` (e.g. for a Container reused through `Map.release`),
+        that array is recycled, otherwise a new one is allocated. Its
+        content is undefined, so it must be completely overwritten.
+
+        Parameters
+        ----------
+        name: str
+            name of the field
+        shape: tuple
+            shape of the array
+        dtype: numpy.dtype
+            type of the array
+
+        Returns
+        -------
+        array: ndarray
+        """
+        array = None
+        if self._buffers is not None:
+            array = self._buffers.pop(name, None)
+        if (array is None or array.shape != tuple(shape)
+                or array.dtype != dtype):
+            array = np.empty(shape, dtype=dtype)
+        setattr(self, name, array)
+        return array
 
     def update(self, **values):
         """
@@ -206,8 +318,34 @@ class Map(defaultdict):
     """A dictionary of sub-containers that can be added to a Container. This
     may be used e.g. to store a set of identical sub-Containers (e.g. indexed
     by `tel_id` or algorithm name).
+
+    Use `release` instead of `clear` to reuse the sub-containers (and their
+    arrays, see `Container.get_array`) when the same keys are filled again,
+    e.g. for each event.
     """
 
+    def __missing__(self, key):
+        pool = getattr(self, '_pool', None)
+        if pool and key in pool:
+            value = pool.pop(key)
+            value.reset()
+            self[key] = value
+            return value
+        return super().__missing__(key)
+
+    def release(self):
+        """
+        Remove all items like `clear`, but keep the sub-containers in a
+        pool. Accessing a missing key returns its previous sub-container,
+        reset to default values, instead of creating a new one.
+        """
+        if not hasattr(self, '_pool'):
+            self._pool = {}
+        for key, val in self.items():
+            if isinstance(val, Container):
+                self._pool[key] = val
+        self.clear()
+
     def as_dict(self, recursive=False, flatten=False):
         if not recursive:
             return dict(self.items())
@@ -229,3 +367,236 @@ class Map(defaultdict):
         for key, val in self.items():
             if isinstance(val, Container):
                 val.reset(recursive=True)
+
+
+class ContainerBatch:
+    """
+    Column-wise storage of many instances of a `Container` class, e.g. the
+    Hillas parameters of all images of a run.
+
+    The columns are generated from the `Field`s of the first appended
+    container: each field holding a number, a bool, a fixed-shape array, a
+    `~astropy.units.Quantity` or a `~astropy.time.Time` becomes a numpy
+    array with one row per container. Other fields (e.g. sub-Containers,
+    Maps, lists or None) are not stored. The arrays grow as needed.
+
+    A batch can be written at once by the table writers, which is much
+    faster than writing the containers one by one.
+
+    >>>    batch = ContainerBatch(HillasParametersContainer)
+    >>>    for event in source:
+    >>>        batch.append(compute_hillas(event))
+    >>>    batch['length']  # Quantity column
+    >>>    batch.to_container(0)  # first row as a HillasParametersContainer
+
+    Parameters
+    ----------
+    container_class: type
+        `Container` subclass of the rows
+    capacity: int
+        number of rows to allocate initially
+    """
+
+    def __init__(self, container_class, capacity=128):
+        self.container_class = container_class
+        self.meta = {}
+        self._capacity = max(int(capacity), 1)
+        self._length = 0
+        self._columns = None
+        self._units = {}
+        self._kinds = {}
+
+    @classmethod
+    def from_columns(cls, container_class, columns, units=None, meta=None):
+        """
+        Create a batch from existing column arrays, without copying them
+        (e.g. when reading a table).
+
+        Parameters
+        ----------
+        container_class: type
+            `Container` subclass of the rows
+        columns: dict
+            arrays of the same length, by field name
+        units: dict or None
+            unit of the columns to return as Quantity, by field name
+        meta: dict or None
+            metadata of the batch
+
+        Returns
+        -------
+        batch: `ContainerBatch`
+        """
+        columns = {name: np.asanyarray(column)
+                   for name, column in columns.items()}
+        lengths = {len(column) for column in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError("columns have different lengths: {}"
+                             .format(sorted(lengths)))
+        units = units or {}
+
+        batch = cls(container_class)
+        batch._columns = columns
+        batch._length = batch._capacity = lengths.pop() if lengths else 0
+        batch._units = {name: Unit(units[name])
+                        for name in columns if name in units}
+        batch._kinds = {name: Quantity if name in units else None
+                        for name in columns}
+        batch.meta.update(meta or {})
+        return batch
+
+    def __len__(self):
+        return self._length
+
+    def __repr__(self):
+        return "{}({}, n_rows={})".format(self.__class__.__name__,
+                                          self.container_class.__name__,
+                                          self._length)
+
+    @property
+    def colnames(self):
+        """ names of the stored fields """
+        return list(self._columns or [])
+
+    @property
+    def units(self):
+        """ dict of the unit of each Quantity column """
+        return dict(self._units)
+
+    def __getitem__(self, name):
+        """
+        Column ``name``, as a Quantity (of the same class as in the
+        containers) or `~astropy.time.Time` for fields holding those.
+        """
+        column = self._columns[name][:self._length]
+        kind = self._kinds[name]
+        if kind is Time:
+            return Time(column, format='mjd', scale='utc')
+        if kind is not None:
+            return kind(column, self._units[name], copy=False)
+        return column
+
+    def _setup_columns(self, container):
+        self._columns = {}
+        for name, value in container.items():
+            kind = None
+            if isinstance(value, Quantity):
+                kind = type(value)
+                unit = container.fields[name].unit or value.unit
+                self._units[name] = unit
+                value = value.to(unit).value
+            elif isinstance(value, Time):
+                kind = Time
+                value = value.utc.mjd
+
+            if isinstance(value, (bool, int, float, complex, np.generic,
+                                  np.ndarray)):
+                value = np.asanyarray(value)
+                self._columns[name] = np.empty(
+                    (self._capacity, ) + value.shape, dtype=value.dtype
+                )
+                self._kinds[name] = kind
+        self.meta.update(container.meta)
+
+    def _grow(self):
+        self._capacity = max(2 * self._capacity, 1)
+        for name, column in self._columns.items():
+            new_column = np.empty((self._capacity, ) + column.shape[1:],
+                                  dtype=column.dtype)
+            new_column[:self._length] = column[:self._length]
+            self._columns[name] = new_column
+
+    def append(self, container):
+        """
+        Append the values of a container as a new row.
+
+        Parameters
+        ----------
+        container: `Container`
+            instance of the `container_class` of the batch
+        """
+        if not isinstance(container, self.container_class):
+            raise TypeError("can only append {} to this batch, not {}".format(
+                self.container_class.__name__,
+                container.__class__.__name__
+            ))
+        if self._columns is None:
+            self._setup_columns(container)
+        if self._length == self._capacity:
+            self._grow()
+
+        row = self._length
+        for name, column in self._columns.items():
+            value = getattr(container, name)
+            kind = self._kinds[name]
+            if kind is Time:
+                value = value.utc.mjd
+            elif kind is not None:
+                value = value.to(self._units[name]).value
+            column[row] = value
+        self._length += 1
+
+    def extend(self, containers):
+        """ append several containers, see `append` """
+        for container in containers:
+            self.append(container)
+
+    def clear(self):
+        """ remove all rows, keeping the allocated arrays """
+        self._length = 0
+
+    def to_container(self, index, container=None):
+        """
+        Get a row as a container.
+
+        Parameters
+        ----------
+        index: int
+            row number
+        container: `Container` or None
+            container to fill, by default a new one is created. Fields that
+            are not stored in the batch keep their value.
+
+        Returns
+        -------
+        container: `Container`
+        """
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("row {} out of range for batch of {} rows"
+                             .format(index, self._length))
+        if container is None:
+            container = self.container_class()
+        for name, column in self._columns.items():
+            value = column[index]
+            kind = self._kinds[name]
+            if kind is Time:
+                value = Time(value, format='mjd', scale='utc')
+            elif kind is not None:
+                value = kind(value, self._units[name])
+            elif isinstance(value, np.ndarray):
+                value = value.copy()
+            setattr(container, name, value)
+        return container
+
+    def as_array(self):
+        """
+        Returns
+        -------
+        array: `numpy.ndarray`
+            structured array with one field per column, without units (see
+            `units`) and with times as MJD
+        """
+        if self._columns is None:
+            return np.empty(0)
+        dtype = [(name, column.dtype, column.shape[1:])
+                 for name, column in self._columns.items()]
+        array = np.empty(self._length, dtype=dtype)
+        for name, column in self._columns.items():
+            array[name] = column[:self._length]
+        return array
+
+    def as_dict(self):
+        """ dict of the columns, as returned by `__getitem__` """
+        return {name: self[name] for name in self.colnames}
@@ -116,6 +116,10 @@ class Provenance(metaclass=Singleton):
             self.start_activity()
         return self._activities[-1]  # current activity as at the top of stack
 
+    @property
+    def active_activities(self):
+        return self._activities
+
     @property
     def finished_activities(self):
         return self._finished_activities
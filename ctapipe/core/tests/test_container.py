@@ -96,3 +96,108 @@ def test_container_brackets():
 
     with pytest.raises(AttributeError):
         t['foo'] = 5
+
+
+def test_map_release():
+    import numpy as np
+
+    class ChildContainer(Container):
+        z = Field(1, "sub-item")
+        image = Field(None, "an array")
+
+    children = Map(ChildContainer)
+    child = children[10]
+    child.z = 5
+    image = child.get_array('image', (10, ), np.float32)
+    assert children[10].image is image
+
+    # released containers are reset and reused for the same key
+    children.release()
+    assert len(children) == 0
+    assert children[10] is child
+    assert child.z == 1
+    assert child.image is None
+    assert child.get_array('image', (10, ), np.float32) is image
+    assert children[11] is not child
+
+    # a different shape or dtype needs a new array
+    children.release()
+    assert children[10].get_array('image', (10, ), np.float64) is not image
+
+    # clear does not keep the containers
+    children.clear()
+    assert children[10] is not child
+
+
+def test_mutable_defaults():
+    import numpy as np
+
+    class ChildContainer(Container):
+        z = Field(1, "sub-item")
+
+    class ParentContainer(Container):
+        x = Field(0, "immutable value")
+        values = Field([], "a list")
+        array = Field(np.zeros(3), "an array")
+        child = Field(ChildContainer(), "a child")
+        modified_child = Field(ChildContainer(z=2), "a modified child")
+        children = Field(Map(ChildContainer), "a map")
+
+    assert [k for k, _ in ParentContainer._immutable_defaults] == ['x']
+
+    cont = ParentContainer()
+    cont2 = ParentContainer()
+    for name in ['values', 'array', 'child', 'modified_child', 'children']:
+        assert cont[name] is not cont2[name]
+    assert cont.modified_child.z == 2
+    assert isinstance(cont.children[1], ChildContainer)
+
+    cont.values.append(1)
+    cont.array[0] = 1
+    cont.reset(recursive=False)
+    assert cont.values == []
+    assert cont.array[0] == 0
+
+
+def test_container_batch():
+    import numpy as np
+    from astropy import units as u
+    from ctapipe.core import ContainerBatch
+
+    class ExampleContainer(Container):
+        x = Field(0.0, "x value")
+        energy = Field(0.0, "energy", unit=u.TeV)
+        image = Field(None, "an array")
+        children = Field(Map(), "not stored in batches")
+
+    batch = ContainerBatch(ExampleContainer, capacity=1)
+    for ii in range(5):
+        cont = ExampleContainer(x=float(ii), energy=ii * u.GeV,
+                                image=np.full(3, ii))
+        cont.meta['origin'] = 'test'
+        batch.append(cont)
+
+    assert len(batch) == 5
+    assert set(batch.colnames) == {'x', 'energy', 'image'}
+    assert np.all(batch['x'] == np.arange(5))
+    assert batch['energy'].unit == u.TeV
+    assert u.allclose(batch['energy'], np.arange(5) * u.GeV)
+    assert batch['image'].shape == (5, 3)
+    assert batch.meta['origin'] == 'test'
+
+    cont = batch.to_container(-1)
+    assert cont.x == 4
+    assert u.isclose(cont.energy, 4 * u.GeV)
+    assert np.all(cont.image == 4)
+
+    array = batch.as_array()
+    assert array.dtype.names is not None
+    assert np.all(array['image'][2] == 2)
+
+    with pytest.raises(TypeError):
+        batch.append(Container())
+    with pytest.raises(IndexError):
+        batch.to_container(5)
+
+    batch.clear()
+    assert len(batch) == 0
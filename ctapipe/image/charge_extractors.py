@@ -15,6 +15,10 @@ __all__ = ['ChargeExtractorFactory', 'FullIntegrator', 'SimpleIntegrator',
 
 class ChargeExtractor(Component):
     name = 'ChargeExtractor'
+    dtype = CaselessStrEnum(['float64', 'float32'], None, allow_none=True,
+                            help='Floating point type in which the charge is '
+                                 'extracted. Set to None to keep the type of '
+                                 'the waveforms.').tag(config=True)
 
     def __init__(self, config, tool, **kwargs):
         """
@@ -45,6 +49,25 @@ class ChargeExtractor(Component):
 
         self.neighbours = None
 
+    def cast_waveforms(self, waveforms):
+        """
+        Convert the waveforms to `dtype`, without copying them if they
+        already are of that type.
+
+        Parameters
+        ----------
+        waveforms : ndarray
+            Waveforms stored in a numpy array of shape
+            (n_chan, n_pix, n_samples).
+
+        Returns
+        -------
+        waveforms : ndarray
+        """
+        if self.dtype is None:
+            return waveforms
+        return waveforms.astype(self.dtype, copy=False)
+
     @staticmethod
     def requires_neighbours():
         """
@@ -91,7 +114,7 @@ class ChargeExtractor(Component):
         """
 
     @abstractmethod
-    def extract_charge(self, waveforms):
+    def extract_charge(self, waveforms, with_window=True):
         """
         Call the relevant functions to fully extract the charge for the
         particular extractor.
@@ -101,12 +124,19 @@ class ChargeExtractor(Component):
         waveforms : ndarray
             Waveforms stored in a numpy array of shape
             (n_chan, n_pix, n_samples).
+        with_window : bool
+            Build the window array. Otherwise None is returned in its place,
+            which saves an array of the size of the waveforms when the
+            window is not needed.
 
         Returns
         -------
         charge : ndarray
             Extracted charge stored in a numpy array of shape (n_chan, n_pix).
-        window : ndarray
+        peakpos : ndarray
+            Numpy array of the peak position for each pixel.
+            Has shape of (n_chan, n_pix).
+        window : ndarray or None
             Bool numpy array defining the samples included in the integration
             window.
         """
@@ -260,13 +290,65 @@ class Integrator(ChargeExtractor):
             shape of (n_chan, n_pix, n_samples).
 
         """
-        end = start + width
-
-        # Obtain integration window using the indices of the waveforms array
-        ind = np.indices(waveforms.shape)[2]
-        integration_window = (ind >= start[..., None]) & (ind < end[..., None])
+        n_samples = waveforms.shape[2]
+        end = np.clip(start + width, 0, n_samples)
+        start = np.clip(start, 0, n_samples)
+
+        # Row i of the table is True for the samples at or after i, so the
+        # window is obtained by indexing it rather than comparing the
+        # indices of the full waveforms array
+        ind = np.arange(n_samples)
+        after = ind >= np.arange(n_samples + 1)[:, None]
+        integration_window = after[start] & ~after[end]
         return integration_window
 
+    @staticmethod
+    def integrate(waveforms, start, width):
+        """
+        Integrate the waveforms within the integration window given by its
+        start and width, without building the window array.
+
+        The samples at each position of the window are gathered for all
+        pixels at once, so only arrays of shape (n_chan, n_pix) are
+        allocated, and only the samples inside the window are summed.
+
+        Parameters
+        ----------
+        waveforms : ndarray
+            Waveforms stored in a numpy array of shape
+            (n_chan, n_pix, n_samples).
+        start : ndarray
+            Numpy array containing the Start sample of integration window.
+            Shape: (n_chan, n_pix).
+        width : ndarray
+            Numpy array containing the window size of integration window.
+            Shape (n_chan, n_pix).
+
+        Returns
+        -------
+        charge : ndarray
+            Extracted charge stored in a numpy array of shape (n_chan, n_pix).
+        """
+        n_samples = waveforms.shape[2]
+        dtype = waveforms.dtype if waveforms.dtype.kind == 'f' else np.float64
+        samples = np.ravel(waveforms)
+        width = np.ravel(width)
+        row = np.arange(width.size) * n_samples
+        first = row + np.ravel(start)
+        last = row + n_samples - 1
+
+        charge = np.zeros(width.size, dtype=dtype)
+        min_width = width.min() if width.size else 0
+        max_width = width.max() if width.size else 0
+        for i in range(max_width):
+            if i < min_width:
+                charge += samples.take(first + i)
+            else:
+                # past the end of the narrower windows
+                index = np.minimum(first + i, last)
+                charge += np.where(i < width, samples.take(index), 0)
+        return charge.reshape(np.shape(start))
+
     @staticmethod
     def extract_from_window(waveforms, window):
         """
@@ -288,8 +370,7 @@ class Integrator(ChargeExtractor):
         charge : ndarray
             Extracted charge stored in a numpy array of shape (n_chan, n_pix).
         """
-        windowed = np.ma.array(waveforms, mask=~window)
-        charge = windowed.sum(2).data
+        charge = np.where(window, waveforms, 0).sum(2)
         return charge
 
     def get_window_from_waveforms(self, waveforms):
@@ -319,9 +400,14 @@ class Integrator(ChargeExtractor):
         window = self.get_window(waveforms, start, width)
         return window, peakpos
 
-    def extract_charge(self, waveforms):
-        window, peakpos = self.get_window_from_waveforms(waveforms)
-        charge = self.extract_from_window(waveforms, window)
+    def extract_charge(self, waveforms, with_window=True):
+        waveforms = self.cast_waveforms(waveforms)
+        peakpos = self.get_peakpos(waveforms)
+        start, width = self.get_start_and_width(waveforms, peakpos)
+        charge = self.integrate(waveforms, start, width)
+        window = None
+        if with_window:
+            window = self.get_window(waveforms, start, width)
         return charge, peakpos, window
 
 
@@ -363,6 +449,11 @@ class FullIntegrator(Integrator):
         nchan, npix, nsamples = waveforms.shape
         return np.zeros((nchan, npix), dtype=np.intp)
 
+    @staticmethod
+    def integrate(waveforms, start, width):
+        # the window always covers the full waveform
+        return waveforms.sum(2)
+
 
 class WindowIntegrator(Integrator):
     name = 'WindowIntegrator'
@@ -496,10 +587,10 @@ class PeakFindingIntegrator(WindowIntegrator):
         self._sig_channel = None
         self._sig_pixels = None
 
-    # Extract significant entries
-    def _extract_significant_entries(self, waveforms):
+    def _find_significant_entries(self, waveforms):
         """
-        Obtain the samples that the user has specified as significant.
+        Find the samples that the user has specified as significant, also
+        filling ``self._sig_pixels`` and ``self._sig_channel``.
 
         Parameters
         ----------
@@ -509,9 +600,10 @@ class PeakFindingIntegrator(WindowIntegrator):
 
         Returns
         -------
-        significant_samples : masked ndarray
-            Identical to waveforms, except the insignificant samples are
-            masked.
+        sig_entries : ndarray or None
+            Bool numpy array of the same shape as waveforms, True for the
+            significant samples. None if no cut is applied, i.e. all samples
+            are significant.
 
         """
         nchan, npix, nsamples = waveforms.shape
@@ -525,11 +617,35 @@ class PeakFindingIntegrator(WindowIntegrator):
             self._sig_channel = np.any(self._sig_pixels, axis=1)
             if not self._sig_channel[0]:
                 self.log.error("sigamp excludes all values in HG channel")
-            return np.ma.array(waveforms, mask=~sig_entries)
+            return sig_entries
         else:
             self._sig_channel = np.ones(nchan, dtype=bool)
             self._sig_pixels = np.ones((nchan, npix), dtype=bool)
+            return None
+
+    # Extract significant entries
+    def _extract_significant_entries(self, waveforms):
+        """
+        Obtain the samples that the user has specified as significant.
+
+        Parameters
+        ----------
+        waveforms : ndarray
+            Waveforms stored in a numpy array of shape
+            (n_chan, n_pix, n_samples).
+
+        Returns
+        -------
+        significant_samples : ndarray
+            Identical to waveforms, except the insignificant samples are
+            replaced by -inf, so that they are ignored by argmax and max
+            as they would be in a masked array.
+
+        """
+        sig_entries = self._find_significant_entries(waveforms)
+        if sig_entries is None:
             return waveforms
+        return np.where(sig_entries, waveforms, -np.inf)
 
     @abstractmethod
     def _obtain_peak_position(self, waveforms):
@@ -567,12 +683,16 @@ class GlobalPeakIntegrator(PeakFindingIntegrator):
 
     def _obtain_peak_position(self, waveforms):
         nchan, npix, nsamples = waveforms.shape
-        significant_samples = self._extract_significant_entries(waveforms)
-        max_t = significant_samples.argmax(2)
-        max_s = significant_samples.max(2)
+        self._find_significant_entries(waveforms)
+        # The significant samples are the ones above the cut, so the
+        # maximum of a pixel is significant if any of its samples is.
+        # Pixels without significant samples do not contribute.
+        max_t = waveforms.argmax(2)
+        max_s = np.where(self._sig_pixels, waveforms.max(2), 0)
 
         peakpos = np.zeros((nchan, npix), dtype=np.int)
-        peakpos[0, :] = np.round(np.average(max_t[0], weights=max_s[0]))
+        if self._sig_channel[0]:
+            peakpos[0, :] = np.round(np.average(max_t[0], weights=max_s[0]))
         if nchan > 1:
             if self._sig_channel[1]:
                 peakpos[1, :] = np.round(
@@ -614,10 +734,11 @@ class LocalPeakIntegrator(PeakFindingIntegrator):
 
     def _obtain_peak_position(self, waveforms):
         nchan, npix, nsamples = waveforms.shape
-        significant_samples = self._extract_significant_entries(waveforms)
-        peakpos = np.full((nchan, npix), significant_samples.argmax(2),
-                          dtype=np.int)
+        self._find_significant_entries(waveforms)
         sig_pix = self._sig_pixels
+        # The significant samples are the ones above the cut, so the
+        # maximum of a pixel is significant if any of its samples is
+        peakpos = np.where(sig_pix, waveforms.argmax(2), 0).astype(np.int)
         if nchan > 1:  # If the LG is not significant, use the HG peakpos
             peakpos[1] = np.where(sig_pix[1] < sig_pix[0],
                                   peakpos[0], peakpos[1])
@@ -661,11 +782,17 @@ class NeighbourPeakIntegrator(PeakFindingIntegrator):
 
     def _obtain_peak_position(self, waveforms):
         shape = waveforms.shape
-        significant_samples = self._extract_significant_entries(waveforms)
-        sig_sam = significant_samples.astype(np.float32)
+        sig_entries = self._find_significant_entries(waveforms)
+        # The neighbours are summed over all their samples, only the
+        # significant samples of the pixel itself are considered for its
+        # peak. get_sum_array works in float32 whatever the type of the
+        # waveforms.
+        sig_sam = waveforms.astype(np.float32, copy=False)
         sum_data = np.zeros_like(sig_sam)
         n = self.neighbours.astype(np.uint16)
         get_sum_array(sig_sam, sum_data, *shape, n, n.shape[0], self.lwt)
+        if sig_entries is not None:
+            sum_data = np.where(sig_entries, sum_data, -np.inf)
         return sum_data.argmax(2).astype(np.int)
 
 
@@ -699,9 +826,18 @@ class AverageWfPeakIntegrator(PeakFindingIntegrator):
 
     def _obtain_peak_position(self, waveforms):
         nchan, npix, nsamples = waveforms.shape
-        significant_samples = self._extract_significant_entries(waveforms)
+        sig_entries = self._find_significant_entries(waveforms)
         peakpos = np.zeros((nchan, npix), dtype=np.int)
-        avg_wf = np.mean(significant_samples, axis=1)
+        if sig_entries is None:
+            avg_wf = np.mean(waveforms, axis=1)
+        else:
+            # average of the significant samples only, samples without any
+            # being ignored by the argmax
+            total = np.where(sig_entries, waveforms, 0).sum(axis=1)
+            count = sig_entries.sum(axis=1)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                avg_wf = total * 1. / count
+            avg_wf[count == 0] = -np.inf
         peakpos += np.argmax(avg_wf, axis=1)[:, None]
         return peakpos
 
@@ -745,6 +881,10 @@ class ChargeExtractorFactory(Factory):
                       'only, 1: local pixel counts as much as any neighbour). '
                       'Only applicable to '
                       'NeighbourPeakIntegrator').tag(config=True)
+    dtype = CaselessStrEnum(['float64', 'float32'], None, allow_none=True,
+                            help='Floating point type in which the charge is '
+                                 'extracted. Set to None to keep the type of '
+                                 'the waveforms.').tag(config=True)
 
     def get_factory_name(self):
         return self.name
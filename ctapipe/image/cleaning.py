@@ -2,7 +2,7 @@
 Image Cleaning Algorithms (identification of noisy pixels)
 """
 
-__all__ = ['tailcuts_clean', 'dilate']
+__all__ = ['tailcuts_clean', 'dilate', 'tailcuts_clean_batch', 'dilate_batch']
 
 import numpy as np
 
@@ -46,19 +46,18 @@ def tailcuts_clean(geom, image, picture_thresh=7, boundary_thresh=5,
 
     pixels_in_picture = image >= picture_thresh
 
-    # by broadcasting together pixels_in_picture (1d) with the neighbor
-    # matrix (2d), we find all pixels that are above the boundary threshold
-    # AND have any neighbor that is in the picture
+    # by multiplying the sparse neighbor matrix with pixels_in_picture, we
+    # find all pixels that have any neighbor that is in the picture (the
+    # boolean product is an OR over the neighbors of each pixel)
+    neighbors = geom.neighbor_matrix_sparse
     pixels_above_boundary = image >= boundary_thresh
-    pixels_with_picture_neighbors = (pixels_in_picture &
-                                     geom.neighbor_matrix).any(axis=1)
+    pixels_with_picture_neighbors = neighbors.dot(pixels_in_picture)
 
     if keep_isolated_pixels:
         return (pixels_above_boundary
                 & pixels_with_picture_neighbors) | pixels_in_picture
     else:
-        pixels_with_boundary_neighbors = (pixels_above_boundary &
-                                         geom.neighbor_matrix).any(axis=1)
+        pixels_with_boundary_neighbors = neighbors.dot(pixels_above_boundary)
         return ((pixels_above_boundary & pixels_with_picture_neighbors) |
                 (pixels_in_picture &  pixels_with_boundary_neighbors))
 
@@ -79,4 +78,79 @@ def dilate(geom, mask):
     mask: ndarray 
         input mask (array of booleans) to be dilated
     """
-    return mask | (mask & geom.neighbor_matrix).any(axis=1)
+    return mask | geom.neighbor_matrix_sparse.dot(mask)
+
+
+def tailcuts_clean_batch(geom, images, picture_thresh=7, boundary_thresh=5,
+                         keep_isolated_pixels=False):
+    """Apply `tailcuts_clean` to a stack of images of the same camera type
+    in a single vectorised pass.
+
+    Parameters
+    ----------
+    geom: `ctapipe.instrument.CameraGeometry`
+        Camera geometry information, common to all images
+    images: array
+        pixel values, shape (n_images, n_pix)
+    picture_thresh: float or array
+        threshold above which all pixels are retained. Arrays are broadcast
+        against ``images``: use shape (n_pix,) for per-pixel thresholds,
+        (n_images, 1) for per-image thresholds or (n_images, n_pix) for both
+    boundary_thresh: float or array
+        threshold above which pixels are retained if they have a neighbor 
+        already above the picture_thresh, broadcast like picture_thresh
+    keep_isolated_pixels: bool
+        If True, pixels above the picture threshold will be included always, 
+        if not they are only included if a neighbor is in the picture or 
+        boundary
+
+    Returns
+    -------
+
+    A boolean mask of *clean* pixels with shape (n_images, n_pix), where row
+    i is identical to the result of `tailcuts_clean` for ``images[i]``.
+
+    """
+    images = np.atleast_2d(images)
+
+    pixels_in_picture = images >= picture_thresh
+    pixels_above_boundary = images >= boundary_thresh
+
+    neighbors = geom.neighbor_matrix_sparse
+    pixels_with_picture_neighbors = _neighbor_any(neighbors, pixels_in_picture)
+
+    if keep_isolated_pixels:
+        return (pixels_above_boundary
+                & pixels_with_picture_neighbors) | pixels_in_picture
+    else:
+        pixels_with_boundary_neighbors = _neighbor_any(neighbors,
+                                                       pixels_above_boundary)
+        return ((pixels_above_boundary & pixels_with_picture_neighbors) |
+                (pixels_in_picture & pixels_with_boundary_neighbors))
+
+
+def dilate_batch(geom, masks):
+    """
+    Add one row of neighbors to the True values of each pixel mask in a stack
+    and return the new masks. Row i of the result is identical to
+    ``dilate(geom, masks[i])``.
+
+    Parameters
+    ----------
+    geom: `~ctapipe.instrument.CameraGeometry`
+        Camera geometry information
+    masks: ndarray
+        input masks (array of booleans) of shape (n_images, n_pix) to be
+        dilated
+    """
+    masks = np.atleast_2d(masks)
+    return masks | _neighbor_any(geom.neighbor_matrix_sparse, masks)
+
+
+def _neighbor_any(neighbors, masks):
+    """
+    For each mask in the (n_images, n_pix) stack, find the pixels that have
+    any neighbor set in the mask, i.e. ``neighbors.dot(mask)`` applied to
+    every row at once.
+    """
+    return np.asarray(neighbors.dot(masks.T).T, dtype=bool)
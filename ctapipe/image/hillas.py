@@ -4,7 +4,8 @@
 Hillas-style moment-based shower image parametrization.
 """
 
-from collections import namedtuple
+from collections import namedtuple, OrderedDict
+import weakref
 import numpy as np
 from astropy.units import Quantity
 from astropy.coordinates import Angle
@@ -17,6 +18,8 @@ __all__ = [
     'hillas_parameters_2',
     'hillas_parameters_3',
     'hillas_parameters_4',
+    'hillas_parameters_batch',
+    'pixel_moments',
     'HillasParameterizationError',
 ]
 
@@ -164,10 +167,33 @@ def hillas_parameters_1(pix_x, pix_y, image, recalculate_pixels=True):
                             skewness=skewness,
                             kurtosis=kurtosis)
 
-def static_pix(pix_x, pix_y, recalculate_pixels):
-    """Hold static variables for a given camera's pixel positions,
-    #if the camera's pixel positions haven't changed since last call, and otherwise or
-    if first call initializes them to the right values.
+
+PIXEL_MOMENT_CACHE_SIZE = 16
+_pixel_moment_cache = OrderedDict()
+
+
+def _owner(array):
+    """ the array owning the data of a view with the same layout (e.g. the
+    `Quantity` of ``quantity.value``), so views share one cache entry """
+    interface = array.__array_interface__
+    base = array.base
+    while isinstance(base, np.ndarray) and \
+            base.__array_interface__ == interface:
+        array, base = base, base.base
+    return array
+
+
+def pixel_moments(pix_x, pix_y, recalculate_pixels=False):
+    """Products of the pixel coordinates needed to compute the image moments
+    up to 4th order, cached per camera.
+
+    The products are kept in a least-recently-used cache of
+    `PIXEL_MOMENT_CACHE_SIZE` entries, keyed by the identity of the pixel
+    coordinate arrays (so ``geom.pix_x`` and ``geom.pix_x.value`` share one
+    entry), which is checked with weak references so that the key of a
+    deleted array is not reused. Event streams mixing several cameras thus
+    do not recompute the products, but arrays modified in place need
+    ``recalculate_pixels``.
 
     Parameters
     ----------
@@ -175,33 +201,55 @@ def static_pix(pix_x, pix_y, recalculate_pixels):
         Pixel x-coordinate
     pix_y : array_like
         Pixel y-coordinate
-    recalculate_pixels : Boolean
-        Recalculate the pixel higher multiples (e.g., if pixels move (!) or pixel list changes between calls)
+    recalculate_pixels : Boolean (default False)
+        Compute the products without using nor filling the cache, e.g. if the
+        pixel coordinate arrays were modified in place.
 
     Returns
     -------
-    Nothing, but keeps variables as attributes to the function, so acts like a static variable holder."""
-
-    # If not called before or recalculate_pixels
-    if (not hasattr(static_pix, "pixdata") or recalculate_pixels): # \
-      #or not (np.array_equal(pix_x,static_xy.pix_x) and np.array_equal(pix_y,static_xy.pix_y)):
-      #, or if the pixel positions have changed, but this adds 15% calculation time
-        static_pix.pixdata = np.row_stack([pix_x,
-                                           pix_y,
-                                           pix_x * pix_x,
-                                           pix_x * pix_y,
-                                           pix_y * pix_y])
-
-        static_pix.pixdataHO = \
-        np.row_stack([pix_x * static_pix.pixdata[2],
-                      static_pix.pixdata[2] * pix_y,
-                      pix_x * static_pix.pixdata[4],
-                      pix_y * static_pix.pixdata[4],
-                      static_pix.pixdata[2] * static_pix.pixdata[2],
-                      static_pix.pixdata[2] * static_pix.pixdata[3],
-                      static_pix.pixdata[2] * static_pix.pixdata[4],
-                      static_pix.pixdata[3] * static_pix.pixdata[4],
-                      static_pix.pixdata[4] * static_pix.pixdata[4]])
+    moments : ndarray
+        Array of shape (14, n_pix), with rows x, y, x², xy, y², x³, x²y,
+        xy², y³, x⁴, x³y, x²y², xy³ and y⁴ of the pixel coordinates (without
+        units).
+    """
+    pix_x = np.asanyarray(pix_x)
+    pix_y = np.asanyarray(pix_y)
+
+    if recalculate_pixels:
+        return _compute_pixel_moments(pix_x, pix_y)
+
+    owner_x = _owner(pix_x)
+    owner_y = _owner(pix_y)
+    key = (id(owner_x), id(owner_y))
+    try:
+        ref_x, ref_y, moments = _pixel_moment_cache[key]
+        if ref_x() is owner_x and ref_y() is owner_y:
+            _pixel_moment_cache.move_to_end(key)
+            return moments
+    except KeyError:
+        pass
+
+    moments = _compute_pixel_moments(pix_x, pix_y)
+    _pixel_moment_cache[key] = (weakref.ref(owner_x), weakref.ref(owner_y),
+                                moments)
+    _pixel_moment_cache.move_to_end(key)
+    while len(_pixel_moment_cache) > PIXEL_MOMENT_CACHE_SIZE:
+        _pixel_moment_cache.popitem(last=False)
+
+    return moments
+
+
+def _compute_pixel_moments(pix_x, pix_y):
+    """ see `pixel_moments` """
+    x = Quantity(pix_x, dtype=np.float64).value
+    y = Quantity(pix_y, dtype=np.float64).value
+    x2 = x * x
+    y2 = y * y
+    xy = x * y
+    moments = np.row_stack([x, y, x2, xy, y2,
+                            x2 * x, x2 * y, x * y2, y * y2,
+                            x2 * x2, x2 * xy, x2 * y2, xy * y2, y2 * y2])
+    return moments
 
 
 def hillas_parameters_2(pix_x, pix_y, image, recalculate_pixels=True):
@@ -220,7 +268,9 @@ def hillas_parameters_2(pix_x, pix_y, image, recalculate_pixels=True):
     image : array_like
         Pixel values corresponding
     recalculate_pixels : Boolean (default True)
-        Recalculate the pixel higher multiples (e.g., if pixels move (!) or pixel list changes between calls)
+        Recalculate the pixel higher multiples, instead of using those cached
+        for these pixel coordinate arrays by `pixel_moments` (which must
+        then not be modified in place)
 
     Returns
     -------
@@ -233,6 +283,9 @@ def hillas_parameters_2(pix_x, pix_y, image, recalculate_pixels=True):
     else:
         unit = 1.0
 
+    # the pixel moments are cached per pixel coordinate array, so look them
+    # up before the coordinates are converted
+    pixdata = pixel_moments(pix_x, pix_y, recalculate_pixels)
     pix_x = Quantity(np.asanyarray(pix_x, dtype=np.float64)).value
     pix_y = Quantity(np.asanyarray(pix_y, dtype=np.float64)).value
     image = np.asanyarray(image)
@@ -245,24 +298,17 @@ def hillas_parameters_2(pix_x, pix_y, image, recalculate_pixels=True):
     if size == 0.0:
         raise (HillasParameterizationError("Empty pixels! Cannot calculate image parameters. Exiting..."))
 
-    #call static_xy to initialize the "static variables"
-    #actually, would be nice to just call this if we know the pixel positions have changed
-    static_pix(pix_x, pix_y, recalculate_pixels)
-
     # Compute image moments (done in a bit faster way, but putting all
     # into one 2D array, where each row will be summed to calculate a
     # moment) However, this doesn't avoid a temporary created for the
     # 2D array
 
 
-    momdata = static_pix.pixdata * image
-    moms = momdata.sum(axis=1) / size
-    momdataHO = static_pix.pixdataHO * image
-    momsHO = momdataHO.sum(axis=1) / size
+    moms = pixdata.dot(image) / size
 
     # give the moms values comprehensible names
-    xm, ym, x2m, xym, y2m = moms
-    x3m, x2ym, xy2m, y3m, x4m, x3ym, x2y2m, xy3m, y4m = momsHO
+    (xm, ym, x2m, xym, y2m,
+     x3m, x2ym, xy2m, y3m, x4m, x3ym, x2y2m, xy3m, y4m) = moms
 
     # intermediate variables (could be avoided if compiler which understands powers, etc)
     xm2 = xm * xm
@@ -527,45 +573,6 @@ def hillas_parameters_3(pix_x, pix_y, image, recalculate_pixels=True):
                             miss=miss*unit,
                             skewness=skewness, kurtosis=kurtosis)
 
-def static_xy(pix_x, pix_y, recalculate_pixels):
-    """Hold static variables for a given camera's pixel positions,
-    #if the camera's pixel positions haven't changed since last call, and otherwise or
-    if first call initializes them to the right values.
-
-    Parameters
-    ----------
-    pix_x : array_like
-        Pixel x-coordinate
-    pix_y : array_like
-        Pixel y-coordinate
-    recalculate_pixels : Boolean
-        Recalculate the pixel higher multiples (e.g., if pixels move (!) or pixel list changes between calls)
-
-    Returns
-    -------
-    Nothing, but keeps variables as attributes to the function, so acts like a static variable holder."""
-
-    # If not called before or recalculate_pixels
-    if (not hasattr(static_xy, "pix_x") or recalculate_pixels): # \
-      #or not (np.array_equal(pix_x,static_xy.pix_x) and np.array_equal(pix_y,static_xy.pix_y)):
-      #, or if the pixel positions have changed, but this adds 15% calculation time
-        static_xy.pix_x = pix_x
-        static_xy.pix_y = pix_y
-        static_xy.pix_x2 = pix_x * pix_x
-        static_xy.pix_y2 = pix_y * pix_y
-        static_xy.pix_xy = pix_x * pix_y
-        static_xy.pix_x3 = static_xy.pix_x2 * pix_x
-        static_xy.pix_x2y = static_xy.pix_x2 * pix_y
-        static_xy.pix_xy2 = pix_x * static_xy.pix_y2
-
-        static_xy.pix_y3 = pix_y * static_xy.pix_y2
-        static_xy.pix_x4 = static_xy.pix_x3 * pix_x
-        static_xy.pix_x3y = static_xy.pix_x3 * pix_y
-        static_xy.pix_x2y2 = static_xy.pix_x2 * static_xy.pix_y2
-        static_xy.pix_xy3 = pix_x * static_xy.pix_y3
-        static_xy.pix_y4 = static_xy.pix_y3 * pix_y
-
-
 def hillas_parameters_4(pix_x, pix_y, image, recalculate_pixels=True):
     """Compute Hillas parameters for a given shower image.
 
@@ -584,7 +591,9 @@ def hillas_parameters_4(pix_x, pix_y, image, recalculate_pixels=True):
     image : array_like
         Pixel values corresponding
     recalculate_pixels : Boolean (default True)
-        Recalculate the pixel higher multiples (e.g., if pixels move (!) or pixel list changes between calls)
+        Recalculate the pixel higher multiples, instead of using those cached
+        for these pixel coordinate arrays by `pixel_moments` (which must
+        then not be modified in place)
 
     Returns
     -------
@@ -599,37 +608,19 @@ def hillas_parameters_4(pix_x, pix_y, image, recalculate_pixels=True):
         unit = 1.0
     # MP: Actually, I don't know why we need to strip the units... shouldn' the calculations all work with them?
 
+    # the pixel moments are cached per pixel coordinate array, so look them
+    # up before the coordinates are converted
+    pixdata = pixel_moments(pix_x, pix_y, recalculate_pixels)
     pix_x = Quantity(np.asanyarray(pix_x, dtype=np.float64)).value
     pix_y = Quantity(np.asanyarray(pix_y, dtype=np.float64)).value
     image = np.asanyarray(image, dtype=np.float64)
     assert pix_x.shape == image.shape
     assert pix_y.shape == image.shape
 
-    (sumsig , sumxsig, sumysig, sumx2sig, sumy2sig, sumxysig, sumx3sig,
-     sumx2ysig, sumxy2sig, sumy3sig) = np.zeros(10)
-
-    # Call static_xy to initialize the "static variables"
-    # Actually, would be nice to just call this if we know the pixel positions have changed
-    static_xy(pix_x, pix_y, recalculate_pixels)
-
     sumsig = image.sum()
-    sumxsig = (image * pix_x).sum()
-    sumysig = (image * pix_y).sum()
-    sumx2sig = (image * static_xy.pix_x2).sum()
-    sumy2sig = (image * static_xy.pix_y2).sum()
-    sumxysig = (image * static_xy.pix_xy).sum()
-
-
-    sumx3sig = (image * static_xy.pix_x3).sum()
-    sumx2ysig = (image * static_xy.pix_x2y).sum()
-    sumxy2sig = (image * static_xy.pix_xy2).sum()
-    sumy3sig = (image * static_xy.pix_y3).sum()
-
-    sumx4sig = (image * static_xy.pix_x4).sum()
-    sumx3ysig = (image * static_xy.pix_x3y).sum()
-    sumx2y2sig = (image * static_xy.pix_x2y2).sum()
-    sumxy3sig = (image * static_xy.pix_xy3).sum()
-    sumy4sig = (image * static_xy.pix_y4).sum()
+    (sumxsig, sumysig, sumx2sig, sumxysig, sumy2sig,
+     sumx3sig, sumx2ysig, sumxy2sig, sumy3sig,
+     sumx4sig, sumx3ysig, sumx2y2sig, sumxy3sig, sumy4sig) = pixdata.dot(image)
 
     if sumsig == 0.0:
         raise (HillasParameterizationError("Empty pixels! Cannot calculate image parameters. Exiting..."))
@@ -769,6 +760,126 @@ def hillas_parameters_4(pix_x, pix_y, image, recalculate_pixels=True):
                             miss=miss*unit,
                             skewness=skewness, kurtosis=kurtosis)
 
+
+def hillas_parameters_batch(pix_x, pix_y, images):
+    """Compute Hillas parameters for a stack of shower images of the same
+    camera in one vectorised pass.
+
+    Uses the same moment formulae as `hillas_parameters_4`, but computes the
+    image moments of all images with a single matrix product and returns
+    plain columnar arrays instead of one `MomentParameters` of Quantities
+    per image, so the result can be written directly to a table.
+
+    Parameters
+    ----------
+    pix_x : array_like
+        Pixel x-coordinate, shape (n_pix,)
+    pix_y : array_like
+        Pixel y-coordinate, shape (n_pix,)
+    images : array_like or `numpy.ma.MaskedArray`
+        Pixel values, shape (n_images, n_pix). Masked pixels (e.g. those
+        removed by `ctapipe.image.tailcuts_clean_batch`) are treated as
+        zero.
+
+    Returns
+    -------
+    hillas_parameters : `MomentParameters`
+        Each field is an ndarray of shape (n_images,). Lengths are in the
+        unit of ``pix_x`` and angles (phi, psi) in radians. Images with
+        zero size have NaN parameters instead of raising
+        `HillasParameterizationError`.
+    """
+    pixdata = pixel_moments(pix_x, pix_y)
+    images = np.ma.filled(images, 0.0).astype(np.float64, copy=False)
+    images = np.atleast_2d(images)
+    assert images.shape[1:] == pixdata.shape[1:]
+
+    # pixel products for all moments up to 4th order, summed for every image
+    # with a single matrix product
+    sums = images.dot(pixdata.T)
+
+    size = images.sum(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        (xm, ym, x2m, xym, y2m, x3m, x2ym, xy2m, y3m,
+         x4m, x3ym, x2y2m, xy3m, y4m) = (sums / size[:, None]).T
+
+        xm2 = xm * xm
+        ym2 = ym * ym
+        xmym = xm * ym
+
+        vx2 = x2m - xm2
+        vy2 = y2m - ym2
+        vxy = xym - xmym
+
+        vx3 = x3m - 3.0 * xm * x2m + 2.0 * xm2 * xm
+        vx2y = x2ym - x2m * ym - 2.0 * xym * xm + 2.0 * xm2 * ym
+        vxy2 = xy2m - y2m * xm - 2.0 * xym * ym + 2.0 * xm * ym2
+        vy3 = y3m - 3.0 * ym * y2m + 2.0 * ym2 * ym
+
+        d = vy2 - vx2
+        dist = np.sqrt(xm2 + ym2)
+        phi = np.arctan2(ym, xm)
+
+        z = np.hypot(d, 2.0 * vxy)
+        length = np.sqrt((vx2 + vy2 + z) / 2.0)
+        width = np.sqrt((vy2 + vx2 - z) / 2.0)
+
+        uu = 1 + d / z
+        vv = 2 - uu
+        miss = np.where(
+            z == 0.0,
+            dist,
+            np.sqrt((uu * xm2 + vv * ym2) / 2.0 - xmym * (2.0 * vxy / z))
+        )
+
+        tanpsi_numer = (d + z) * ym + 2.0 * vxy * xm
+        tanpsi_denom = 2.0 * vxy * ym - (d - z) * xm
+        psi = np.arctan2(tanpsi_numer, tanpsi_denom)
+
+        vx4 = x4m - 4.0 * xm * x3m + 6.0 * xm2 * x2m - 3.0 * xm2 * xm2
+        vx3y = x3ym - 3.0 * xm * x2ym + 3.0 * xm2 * xym - x3m * ym \
+            + 3.0 * x2m * xmym - 3.0 * xm2 * xm * ym
+        vx2y2 = x2y2m - 2.0 * ym * x2ym + x2m * ym2 \
+            - 2.0 * xm * xy2m + 4.0 * xym * xmym + xm2 * y2m - 3.0 * xm2 * ym2
+        vxy3 = xy3m - 3.0 * ym * xy2m + 3.0 * ym2 * xym - y3m * xm \
+            + 3.0 * y2m * xmym - 3.0 * ym2 * ym * xm
+        vy4 = y4m - 4.0 * ym * y3m + 6.0 * ym2 * y2m - 3.0 * ym2 * ym2
+
+        hyp = np.hypot(tanpsi_numer, tanpsi_denom)
+        cpsi = np.where(hyp != 0., tanpsi_denom / hyp, 1.)
+        spsi = np.where(hyp != 0., tanpsi_numer / hyp, 0.)
+
+        cpsi2 = cpsi * cpsi
+        spsi2 = spsi * spsi
+        cspsi = cpsi * spsi
+
+        sk3bylen3 = (vx3 * cpsi * cpsi2 +
+                     3.0 * vx2y * cpsi2 * spsi +
+                     3.0 * vxy2 * cpsi * spsi2 +
+                     vy3 * spsi * spsi2)
+        asym = np.copysign(np.power(np.abs(sk3bylen3), 1. / 3.),
+                           sk3bylen3) / length
+        skewness = asym * asym * asym
+
+        kurt = (vx4 * cpsi2 * cpsi2 +
+                4.0 * vx3y * cpsi2 * cspsi +
+                6.0 * vx2y2 * cpsi2 * spsi2 +
+                4.0 * vxy3 * cspsi * spsi2 +
+                vy4 * spsi2 * spsi2)
+        kurtosis = kurt / (length * length * length * length)
+
+    # Skip higher moments for images with zero length, as hillas_parameters_4
+    no_length = length == 0.0
+    psi[no_length] = 0.0
+    skewness[no_length] = 0.0
+    kurtosis[no_length] = 0.0
+
+    return MomentParameters(size=size, cen_x=xm, cen_y=ym,
+                            length=length, width=width, r=dist,
+                            phi=phi, psi=psi, miss=miss,
+                            skewness=skewness, kurtosis=kurtosis)
+
+
 # use the 4 version by default.
 hillas_parameters = hillas_parameters_4
 
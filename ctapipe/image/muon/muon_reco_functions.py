@@ -1,6 +1,6 @@
 from ctapipe.io.containers import  MuonRingParameter, MuonIntensityParameter
 from astropy import log
-from ctapipe.instrument import CameraGeometry
+from ctapipe.instrument import geometry_registry
 from ctapipe.image.cleaning import tailcuts_clean
 from ctapipe.coordinates import CameraFrame, NominalFrame, HorizonFrame
 import numpy as np
@@ -74,8 +74,7 @@ def analyze_muon_event(event, params=None, geom_dict=None):
             geom = geom_dict[telid]
         else:
             log.debug("[calib] Guessing camera geometry")
-            geom = CameraGeometry.guess(*event.inst.pixel_pos[telid],
-                                        event.inst.optical_foclen[telid])
+            geom = geometry_registry.from_event(event, telid)
             log.debug("[calib] Camera geometry found")
             if geom_dict is not None:
                 geom_dict[telid] = geom
@@ -1,11 +1,12 @@
 import numpy as np
-from numpy.testing import assert_almost_equal
+from numpy.testing import assert_almost_equal, assert_array_equal
 
-from ctapipe.image.charge_extractors import FullIntegrator, \
+from ctapipe.image.charge_extractors import Integrator, FullIntegrator, \
     SimpleIntegrator, GlobalPeakIntegrator, LocalPeakIntegrator, \
     NeighbourPeakIntegrator, ChargeExtractorFactory, AverageWfPeakIntegrator
 from ctapipe.io.hessio import hessio_event_source
 from ctapipe.utils import get_dataset
+from ctapipe.utils.neighbour_sum import get_sum_array
 
 
 def get_test_event():
@@ -127,6 +128,75 @@ def test_averagewf_peak_integration():
     assert peakpos[1][0] == 10
 
 
+def test_integrate_window():
+    rng = np.random.RandomState(1)
+    waveforms = rng.normal(0, 10, (2, 50, 30))
+    start = rng.randint(-2, 30, (2, 50))
+    width = rng.randint(0, 9, (2, 50))
+    Integrator.check_window_width_and_start(30, start, width)
+
+    window = Integrator.get_window(waveforms, start, width)
+    ind = np.arange(30)
+    expected = (ind >= start[..., None]) & (ind < (start + width)[..., None])
+    assert (window == expected).all()
+
+    charge = Integrator.integrate(waveforms, start, width)
+    assert_almost_equal(charge, (waveforms * window).sum(2))
+
+    integrator = LocalPeakIntegrator(None, None)
+    charge, peakpos, window = integrator.extract_charge(waveforms,
+                                                        with_window=False)
+    assert window is None
+    _, _, window = integrator.extract_charge(waveforms)
+    assert_almost_equal(charge, (waveforms * window).sum(2))
+
+
+def test_significant_peakpos_matches_masked():
+    # reference: peak finding on masked arrays, as previously implemented
+    rng = np.random.RandomState(2)
+    n_pix = 40
+    waveforms = rng.normal(0, 1, (2, n_pix, 30))
+    waveforms[..., 10:14] += rng.uniform(0, 20, (2, n_pix, 1))
+    waveforms[:, :5] = -1  # pixels without significant samples
+    kwargs = dict(sig_amp_cut_HG=3, sig_amp_cut_LG=5)
+    mask = np.empty(waveforms.shape, dtype=bool)
+    mask[0] = waveforms[0] <= 3
+    mask[1] = waveforms[1] <= 5
+    masked = np.ma.array(waveforms, mask=mask)
+    sig_pix = ~mask.all(axis=2)
+
+    expected = masked.argmax(2)
+    expected[1] = np.where(sig_pix[1] < sig_pix[0], expected[0], expected[1])
+    peakpos = LocalPeakIntegrator(None, None, **kwargs).get_peakpos(waveforms)
+    assert_array_equal(peakpos, expected)
+
+    max_t = masked.argmax(2)
+    max_s = masked.max(2)
+    expected = [np.round(np.average(max_t[c], weights=max_s[c]))
+                for c in range(2)]
+    integrator = GlobalPeakIntegrator(None, None, **kwargs)
+    peakpos = integrator.get_peakpos(waveforms)
+    assert (peakpos == np.array(expected)[:, None]).all()
+
+    expected = np.argmax(np.mean(masked, axis=1), axis=1)
+    integrator = AverageWfPeakIntegrator(None, None, **kwargs)
+    peakpos = integrator.get_peakpos(waveforms)
+    assert (peakpos == expected[:, None]).all()
+
+    # the neighbour sum includes all samples, only the peak of the pixel
+    # itself is restricted to its significant samples
+    neighbours = np.array([[i, i + 1] for i in range(n_pix - 1)] +
+                          [[i + 1, i] for i in range(n_pix - 1)])
+    sum_data = np.zeros(waveforms.shape, dtype=np.float32)
+    nei = neighbours.astype(np.uint16)
+    get_sum_array(waveforms.astype(np.float32), sum_data, *waveforms.shape,
+                  nei, nei.shape[0], 0)
+    expected = np.ma.array(sum_data, mask=mask).argmax(2)
+    integrator = NeighbourPeakIntegrator(None, None, **kwargs)
+    integrator.neighbours = neighbours
+    assert_array_equal(integrator.get_peakpos(waveforms), expected)
+
+
 def test_charge_extractor_factory():
     extractor_f = ChargeExtractorFactory(None, None)
     extractor_f.extractor = 'LocalPeakIntegrator'
@@ -143,3 +213,21 @@ def test_charge_extractor_factory():
     integration, peakpos, window = extractor.extract_charge(data_ped)
 
     assert_almost_equal(integration[0][0], 76, 0)
+
+
+def test_float32_extraction():
+    telid = 11
+    event = get_test_event()
+    data = event.r0.tel[telid].adc_samples
+    nsamples = data.shape[2]
+    ped = event.mc.tel[telid].pedestal
+    data_ped = data - np.atleast_3d(ped/nsamples)
+
+    integration_64, peakpos_64, _ = \
+        LocalPeakIntegrator(None, None).extract_charge(data_ped)
+    integrator = LocalPeakIntegrator(None, None, dtype='float32')
+    integration, peakpos, window = integrator.extract_charge(data_ped)
+
+    assert integration.dtype == np.float32
+    assert_almost_equal(integration, integration_64, 3)
+    assert (peakpos == peakpos_64).all()
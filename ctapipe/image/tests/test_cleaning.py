@@ -84,3 +84,36 @@ def test_tailcuts_clean():
                                          boundary_thresh=5,
                                          keep_isolated_pixels=True)
         assert (result == mask).all()
+
+
+def test_tailcuts_clean_batch():
+    geom = CameraGeometry.make_rectangular(20, 20)
+    images = np.random.RandomState(1).exponential(3, size=(50, 400))
+    picture_thresh = np.linspace(6, 8, 50)[:, None]  # per-image thresholds
+
+    for keep_isolated_pixels in [False, True]:
+        masks = cleaning.tailcuts_clean_batch(
+            geom, images, picture_thresh=picture_thresh, boundary_thresh=5,
+            keep_isolated_pixels=keep_isolated_pixels
+        )
+        assert masks.shape == images.shape
+        for image, thresh, mask in zip(images, picture_thresh, masks):
+            expected = cleaning.tailcuts_clean(
+                geom, image, picture_thresh=thresh[0], boundary_thresh=5,
+                keep_isolated_pixels=keep_isolated_pixels
+            )
+            assert (mask == expected).all()
+
+
+def test_dilate_batch():
+    geom = CameraGeometry.make_rectangular(20, 20)
+    masks = np.zeros((3, 400), dtype=bool)
+    masks[0, 210] = True
+    masks[2, [0, 210]] = True
+
+    dmasks = cleaning.dilate_batch(geom, masks)
+    for mask, dmask in zip(masks, dmasks):
+        assert (dmask == cleaning.dilate(geom, mask)).all()
+    assert dmasks[0].sum() == 1 + 4
+    assert dmasks[1].sum() == 0
+
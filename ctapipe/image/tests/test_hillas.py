@@ -1,8 +1,10 @@
 from ctapipe.instrument import CameraGeometry
 from ctapipe.image import tailcuts_clean, toymodel
 from ctapipe.image.hillas import (hillas_parameters_1, hillas_parameters_2,
-                                  hillas_parameters_3, hillas_parameters_4)
+                                  hillas_parameters_3, hillas_parameters_4,
+                                  hillas_parameters_batch, pixel_moments)
 from astropy import units as u
+import numpy as np
 from numpy import isclose
 from numpy.random import seed
 
@@ -85,3 +87,66 @@ def test_hillas_with_units():
 def test_hillas_unitless():
     do_test_hillas(withunits=False)
 
+
+def test_hillas_batch():
+    images = []
+    for psi_angle in ['30d', '120d', '-30d', '-120d']:
+        px, py, image = create_sample_image(psi_angle)
+        images.append(image)
+    images.append(np.zeros_like(image))  # an empty image gives NaNs
+    images = np.ma.masked_equal(images, 0)
+
+    batch = hillas_parameters_batch(px, py, images)
+    assert batch.size.shape == (5,)
+    assert np.isnan(batch.length[-1])
+
+    for ii, image in enumerate(images[:-1]):
+        result = hillas_parameters_4(px, py, image.filled(0))
+        assert isclose(result.size, batch.size[ii])
+        assert isclose(result.cen_x, batch.cen_x[ii])
+        assert isclose(result.cen_y, batch.cen_y[ii])
+        assert isclose(result.length, batch.length[ii])
+        assert isclose(result.width, batch.width[ii])
+        assert isclose(result.miss, batch.miss[ii])
+        assert isclose(result.phi.rad, batch.phi[ii])
+        assert isclose(result.psi.rad, batch.psi[ii])
+        assert isclose(result.skewness, batch.skewness[ii])
+        assert isclose(result.kurtosis, batch.kurtosis[ii])
+
+
+
+def test_pixel_moments_cache():
+    lst = CameraGeometry.from_name("LSTCam")
+    nectar = CameraGeometry.from_name("NectarCam")
+
+    moments = pixel_moments(lst.pix_x, lst.pix_y)
+    assert moments.shape == (14, len(lst.pix_id))
+    assert np.allclose(moments[0], lst.pix_x.value)
+    assert np.allclose(moments[12], lst.pix_x.value * lst.pix_y.value ** 3)
+
+    # another camera does not evict the first one, and views of the same
+    # coordinate arrays share the cache entry
+    pixel_moments(nectar.pix_x, nectar.pix_y)
+    assert pixel_moments(lst.pix_x.value, lst.pix_y.value) is moments
+    assert pixel_moments(lst.pix_x, lst.pix_y, recalculate_pixels=True) \
+        is not moments
+
+    # arrays modified in place must be recalculated, which does not touch
+    # the cache
+    pix_x = lst.pix_x.value.copy()
+    cached = pixel_moments(pix_x, lst.pix_y.value)
+    pix_x *= 2
+    assert np.allclose(pixel_moments(pix_x, lst.pix_y.value,
+                                     recalculate_pixels=True)[0], pix_x)
+    assert pixel_moments(pix_x, lst.pix_y.value) is cached
+
+    # alternating cameras gives the same results as fresh computations
+    px, py, image = create_sample_image()
+    result = hillas_parameters_4(px, py, image, recalculate_pixels=False)
+    hillas_parameters_4(nectar.pix_x, nectar.pix_y,
+                        np.ones(len(nectar.pix_id)), recalculate_pixels=False)
+    cached = hillas_parameters_4(px, py, image, recalculate_pixels=False)
+    fresh = hillas_parameters_4(px, py, image)
+    assert isclose(result.length, cached.length)
+    assert isclose(result.width, fresh.width)
+    assert isclose(cached.psi.rad, fresh.psi.rad)
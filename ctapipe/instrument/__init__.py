@@ -1,10 +1,10 @@
-from .camera import CameraGeometry
+from .camera import CameraGeometry, CameraGeometryRegistry, geometry_registry
 from .atmosphere import get_atmosphere_profile_table, get_atmosphere_profile_functions
 from .telescope import TelescopeDescription
 from .optics import OpticsDescription
 from .subarray import SubarrayDescription
 
 
-__all__ = ['CameraGeometry',
+__all__ = ['CameraGeometry', 'CameraGeometryRegistry', 'geometry_registry',
            'get_atmosphere_profile_functions', 'TelescopeDescription',
            'OpticsDescription','SubarrayDescription']
\ No newline at end of file
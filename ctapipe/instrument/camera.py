@@ -2,7 +2,9 @@
 """
 Utilities for reading or working with Camera geometry files
 """
+import hashlib
 import logging
+import weakref
 from collections import defaultdict
 
 import numpy as np
@@ -10,6 +12,7 @@ from astropy import units as u
 from astropy.coordinates import Angle
 from astropy.table import Table
 from astropy.utils import lazyproperty
+from scipy.sparse import csr_matrix
 from scipy.spatial import cKDTree as KDTree
 
 from ctapipe.utils import get_table_dataset, find_all_matching_datasets
@@ -17,7 +20,7 @@ from ctapipe.utils.linalg import rotation_matrix_2d
 from ctapipe.core import Provenance
 
 
-__all__ = ['CameraGeometry',]
+__all__ = ['CameraGeometry', 'CameraGeometryRegistry', 'geometry_registry']
 
 logger = logging.getLogger(__name__)
 
@@ -50,9 +53,10 @@ class CameraGeometry:
     Cherenkov Camera that us useful for imaging algorithms and
     displays. It contains lists of pixel positions, areas, pixel
     shapes, as well as a neighbor (adjacency) list and matrix for each pixel. 
-    In general the neighbor_matrix attribute should be used in any algorithm 
-    needing pixel neighbors, since it is much faster. See for example 
-    `ctapipe.image.tailcuts_clean` 
+    In general the neighbor_matrix_sparse attribute should be used in any 
+    algorithm needing pixel neighbors, since it is much faster and its memory
+    use scales with the number of neighbors rather than with npix**2. See for
+    example `ctapipe.image.tailcuts_clean` 
 
     The class is intended to be generic, and work with any Cherenkov
     Camera geometry, including those that have square vs hexagonal
@@ -322,7 +326,26 @@ class CameraGeometry:
 
     @lazyproperty
     def neighbor_matrix(self):
-        return _neighbor_list_to_matrix(self.neighbors)
+        """
+        Dense npix x npix boolean adjacency matrix. Prefer
+        `neighbor_matrix_sparse` for large cameras.
+        """
+        return self.neighbor_matrix_sparse.toarray()
+
+    @lazyproperty
+    def neighbor_matrix_sparse(self):
+        """
+        Boolean adjacency matrix in compressed sparse row format
+        (`scipy.sparse.csr_matrix`), where row i holds the neighbors of
+        pixel i. ``neighbor_matrix_sparse.indptr`` and
+        ``neighbor_matrix_sparse.indices`` can be used directly as an
+        adjacency list.
+
+        Returns
+        -------
+        scipy.sparse.csr_matrix
+        """
+        return _neighbor_list_to_sparse_matrix(self.neighbors)
 
     @lazyproperty
     def neighbor_matrix_where(self):
@@ -334,7 +357,9 @@ class CameraGeometry:
         -------
         ndarray
         """
-        return np.ascontiguousarray(np.array(np.where(self.neighbor_matrix)).T)
+        matrix = self.neighbor_matrix_sparse
+        pixels = np.repeat(np.arange(matrix.shape[0]), np.diff(matrix.indptr))
+        return np.ascontiguousarray(np.column_stack((pixels, matrix.indices)))
 
     def rotate(self, angle):
         """rotate the camera coordinates about the center of the camera by
@@ -399,13 +424,140 @@ class CameraGeometry:
 
         return cls(cam_id=-1,
                    pix_id=ids,
-                   pix_x=xx * u.m,
-                   pix_y=yy * u.m,
+                   pix_x=xx,
+                   pix_y=yy,
                    pix_area=(2 * rr) ** 2,
                    neighbors=None,
                    pix_type='rectangular')
 
 
+class CameraGeometryRegistry:
+    """
+    Registry of `CameraGeometry` instances that are looked up once per
+    telescope, rather than once per event.
+
+    `CameraGeometry.guess()` is memoized, but building its identifier
+    requires serialising the full pixel position array on every call. The
+    registry keys each geometry on the telescope id, a digest of the pixel
+    positions, the number of pixels and the focal length, so that a
+    telescope id reused with a different camera, e.g. in another file, gets
+    its own geometry. Lookups from events with `from_event` are first done
+    on the telescope id and the identity of the ``event.inst`` pixel
+    position and focal length arrays (which are filled once per file), so
+    the digest is only computed when these arrays change. The same
+    instance should be shared by all components
+    that need the geometry of a telescope (e.g. `CameraDL1Calibrator` and
+    `analyze_muon_event`), which is what the module-level
+    `geometry_registry` is for.
+
+    Attributes
+    ----------
+    hits : int
+        number of lookups that returned an already registered geometry
+    misses : int
+        number of lookups that required a new geometry to be constructed
+    """
+
+    def __init__(self):
+        self._geometries = {}
+        self._by_identity = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._geometries)
+
+    def __repr__(self):
+        return "{}(n_geometries={}, hits={}, misses={})".format(
+            self.__class__.__name__, len(self), self.hits, self.misses
+        )
+
+    def get(self, pix_x, pix_y, optical_foclen, tel_id=None):
+        """
+        Obtain the `CameraGeometry` for a telescope, constructing it with
+        `CameraGeometry.guess()` the first time it is requested.
+
+        Parameters
+        ----------
+        pix_x : `astropy.units.Quantity`
+            x position of each pixel
+        pix_y : `astropy.units.Quantity`
+            y position of each pixel
+        optical_foclen : `astropy.units.Quantity`
+            focal length of the telescope
+        tel_id : int or None
+            telescope id. If None, only the pixel positions and focal length
+            identify the geometry.
+
+        Returns
+        -------
+        `CameraGeometry`
+        """
+        digest = hashlib.sha1(np.ascontiguousarray(pix_x.value))
+        digest.update(np.ascontiguousarray(pix_y.value))
+        key = (tel_id, digest.digest(), str(pix_x.unit), str(pix_y.unit),
+               len(pix_x), optical_foclen.to(u.m).value)
+
+        try:
+            geom = self._geometries[key]
+            self.hits += 1
+        except KeyError:
+            geom = CameraGeometry.guess(pix_x, pix_y, optical_foclen)
+            self._geometries[key] = geom
+            self.misses += 1
+
+        return geom
+
+    def from_event(self, event, telid):
+        """
+        Obtain the `CameraGeometry` for a telescope in an event.
+
+        Parameters
+        ----------
+        event : container
+            A `ctapipe` event container
+        telid : int
+            The telescope id.
+
+        Returns
+        -------
+        `CameraGeometry`
+        """
+        pixel_pos = event.inst.pixel_pos[telid]
+        optical_foclen = event.inst.optical_foclen[telid]
+        key = (telid, id(pixel_pos), id(optical_foclen))
+        try:
+            pos_ref, foclen_ref, geom = self._by_identity[key]
+            # the ids could be reused by new arrays once the old ones died
+            if pos_ref() is pixel_pos and foclen_ref() is optical_foclen:
+                self.hits += 1
+                return geom
+        except KeyError:
+            pass
+
+        geom = self.get(*pixel_pos, optical_foclen, tel_id=telid)
+        try:
+            # entries are dropped when their arrays are garbage collected
+            forget = lambda ref: self._by_identity.pop(key, None)
+            self._by_identity[key] = (weakref.ref(pixel_pos, forget),
+                                      weakref.ref(optical_foclen, forget),
+                                      geom)
+        except TypeError:
+            pass  # e.g. positions given as a tuple, only looked up by digest
+        return geom
+
+    def clear(self):
+        """ remove all registered geometries and reset the counters """
+        self._geometries.clear()
+        self._by_identity.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+# registry shared by all components that look up geometries per telescope
+geometry_registry = CameraGeometryRegistry()
+
+
 # ======================================================================
 # utility functions:
 # ======================================================================
@@ -481,15 +633,31 @@ def _neighbor_list_to_matrix(neighbors):
     convert a neighbor adjacency list (list of list of neighbors) to a 2D 
     numpy array, which is much faster (and can simply be multiplied)
     """
+    return _neighbor_list_to_sparse_matrix(neighbors).toarray()
 
-    npix = len(neighbors)
-    neigh2d = np.zeros(shape=(npix, npix), dtype=np.bool)
 
-    for ipix, neighbors in enumerate(neighbors):
-        for jn, neighbor in enumerate(neighbors):
-            neigh2d[ipix, neighbor] = True
+def _neighbor_list_to_sparse_matrix(neighbors):
+    """
+    convert a neighbor adjacency list (list of list of neighbors) to a
+    boolean `scipy.sparse.csr_matrix` with sorted column indices, so that
+    the non-zero entries are ordered in the same way as
+    ``np.where(neighbor_matrix)``
+    """
 
-    return neigh2d
+    npix = len(neighbors)
+    n_neighbors = np.array([len(neigh) for neigh in neighbors], dtype=np.intp)
+    indptr = np.zeros(npix + 1, dtype=np.intp)
+    np.cumsum(n_neighbors, out=indptr[1:])
+    if indptr[-1] > 0:
+        indices = np.concatenate([np.asarray(neigh, dtype=np.intp)
+                                  for neigh in neighbors])
+    else:
+        indices = np.zeros(0, dtype=np.intp)
+    data = np.ones(indptr[-1], dtype=np.bool_)
+
+    matrix = csr_matrix((data, indices, indptr), shape=(npix, npix))
+    matrix.sum_duplicates()  # also sorts the indices of each row
+    return matrix
 
 
 
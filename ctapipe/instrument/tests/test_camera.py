@@ -1,6 +1,7 @@
 import numpy as np
 from astropy import units as u
-from ctapipe.instrument import CameraGeometry
+from ctapipe.instrument import CameraGeometry, CameraGeometryRegistry
+from ctapipe.io.containers import DataContainer
 from ctapipe.instrument.camera import _find_neighbor_pixels, \
     _get_min_pixel_seperation
 from numpy import median
@@ -37,6 +38,44 @@ def test_guess_camera():
     assert geom.pix_type.startswith('rect')
 
 
+def test_geometry_registry():
+    px = np.linspace(-10, 10, 11328) * u.m
+    py = np.linspace(-10, 10, 11328) * u.m
+    registry = CameraGeometryRegistry()
+
+    geom = registry.get(px, py, 0 * u.m, tel_id=1)
+    assert registry.misses == 1 and registry.hits == 0
+    assert registry.get(px, py, 0 * u.m, tel_id=1) is geom
+    assert registry.misses == 1 and registry.hits == 1
+
+    # without a telescope id the pixel positions identify the geometry
+    assert registry.get(px, py, 0 * u.m) is geom
+    assert registry.get(px, py, 0 * u.m) is geom
+    assert registry.misses == 2 and registry.hits == 2
+    assert len(registry) == 2
+
+    # the same telescope id with other pixel positions is another camera
+    other = registry.get(-px, py, 0 * u.m, tel_id=1)
+    assert other is not geom
+    assert registry.misses == 3 and len(registry) == 3
+
+    # events are looked up by the identity of their instrument arrays
+    event = DataContainer()
+    event.inst.pixel_pos[1] = u.Quantity([px, py])
+    event.inst.optical_foclen[1] = 0 * u.m
+    assert registry.from_event(event, 1) is geom
+    assert registry.from_event(event, 1) is geom
+    assert registry.misses == 3 and registry.hits == 4
+    assert len(registry._by_identity) == 1
+    event.inst.pixel_pos[1] = u.Quantity([-px, py])
+    assert registry.from_event(event, 1) is other
+    assert len(registry._by_identity) == 1
+
+    registry.clear()
+    assert len(registry) == 0
+    assert registry.misses == 0 and registry.hits == 0
+
+
 def test_get_min_pixel_seperation():
     x, y = np.meshgrid(np.linspace(-5, 5, 5), np.linspace(-5, 5, 5))
     pixsep = _get_min_pixel_seperation(x.ravel(), y.ravel())
@@ -57,6 +96,19 @@ def test_neighbor_pixels():
     assert int(median(recgeom.neighbor_matrix.sum(axis=1))) == 4
     assert int(median(hexgeom.neighbor_matrix.sum(axis=1))) == 6
 
+
+def test_neighbor_matrix_sparse():
+    geom = CameraGeometry.make_rectangular(5, 5)
+    sparse = geom.neighbor_matrix_sparse
+
+    assert sparse.shape == (25, 25)
+    assert (sparse.toarray() == geom.neighbor_matrix).all()
+    assert set(sparse.indices[sparse.indptr[12]:sparse.indptr[13]]) == \
+        set(geom.neighbors[12])
+    assert (geom.neighbor_matrix_where ==
+            np.array(np.where(geom.neighbor_matrix)).T).all()
+
+
 def test_to_and_from_table():
     geom = CameraGeometry.from_name("LSTCam")
     tab = geom.to_table()
@@ -4,11 +4,13 @@ Handles reading of different event/waveform containing files
 from abc import abstractmethod
 from os.path import basename, splitext, dirname, join, exists
 import numpy as np
-from traitlets import Unicode, Int, CaselessStrEnum, observe
+from traitlets import Unicode, Int, Bool, CaselessStrEnum, observe
 from copy import deepcopy
 from ctapipe.core import Component, Factory
 from ctapipe.utils import get_dataset
-from ctapipe.io.hessio import hessio_event_source, hessio_get_list_event_ids
+from ctapipe.io.hessio import (hessio_event_source, hessio_chunk_source,
+                               hessio_event_index, hessio_get_subarray,
+                               hessio_get_list_event_ids)
 
 
 class EventFileReader(Component):
@@ -271,9 +273,37 @@ class EventFileReader(Component):
 
 
 class HessioFileReader(EventFileReader):
+    """
+    `EventFileReader` for simtelarray files, read with `pyhessio`.
+
+    The description of the telescopes is available as `subarray` without
+    iterating over the events.
+
+    With `use_index`, a sidecar index of the events in the file (see
+    `ctapipe.io.hessio.hessio_event_index`) is built on first use and
+    reused afterwards, so that `num_events` and `event_id_list` do not
+    require a scan of the file, and `get_event` knows where to stop. The
+    index is written to `index_path`, next to the input file by default,
+    so set it to a writable location when the data is read-only.
+    """
     name = 'HessioFileReader'
     origin = 'hessio'
 
+    use_index = Bool(False, help='Use a sidecar index of the events in the '
+                                 'file, built on first use').tag(config=True)
+    index_path = Unicode(None, allow_none=True,
+                         help='Path of the event index file, by default '
+                              'the input_path with ".index.ecsv" '
+                              'appended').tag(config=True)
+
+    _event_index = None
+    _subarray = None
+
+    @observe('input_path', 'index_path')
+    def on_index_changed(self, change):
+        self._event_index = None
+        self._subarray = None
+
     @staticmethod
     def check_file_compatibility(file_path):
         compatible = True
@@ -282,11 +312,38 @@ class HessioFileReader(EventFileReader):
             compatible = False
         return compatible
 
+    @property
+    def subarray(self):
+        """
+        `ctapipe.instrument.SubarrayDescription` of the telescopes in the
+        file, available before reading the events, see
+        `ctapipe.io.hessio.hessio_get_subarray`
+        """
+        if self._subarray is None:
+            self._subarray = hessio_get_subarray(self.input_path)
+        return self._subarray
+
+    @property
+    def event_index(self):
+        """
+        `astropy.table.Table` indexing all events in the file, see
+        `ctapipe.io.hessio.hessio_build_event_index`
+        """
+        if self._event_index is None:
+            self._event_index = hessio_event_index(self.input_path,
+                                                   index_path=self.index_path)
+        return self._event_index
+
     @property
     def num_events(self):
         self.log.info("Obtaining number of events in file...")
         if self._num_events:
             pass
+        elif self.use_index:
+            num_events = len(self.event_index)
+            if self.max_events:
+                num_events = min(num_events, self.max_events)
+            self._num_events = num_events
         else:
             self._num_events = len(self.event_id_list)
         self.log.info("Number of events inside file = {}"
@@ -298,6 +355,9 @@ class HessioFileReader(EventFileReader):
         self.log.info("Retrieving list of event ids...")
         if self._event_id_list:
             pass
+        elif self.use_index:
+            event_ids = self.event_index['event_id'][:self.max_events]
+            self._event_id_list = event_ids.tolist()
         else:
             self.log.info("Building new list of event ids...")
             ids = hessio_get_list_event_ids(self.input_path,
@@ -306,6 +366,32 @@ class HessioFileReader(EventFileReader):
         self.log.info("List of event ids retrieved.")
         return self._event_id_list
 
+    def get_event(self, requested_event, use_event_id=False):
+        """
+        Obtain the requested event. With `use_index`, events that are not in
+        the file are reported immediately, instead of after a full scan.
+
+        Parameters
+        ----------
+        requested_event : int
+            Seek to a paricular event index
+        use_event_id : bool
+            If True ,'requested_event' now seeks for a particular event id
+            instead of index
+
+        Returns
+        -------
+        event : `ctapipe` event-container
+
+        """
+        if self.use_index:
+            column = 'event_id' if use_event_id else 'count'
+            if requested_event not in self.event_index[column]:
+                raise IndexError("event {}={} is not in file '{}'".format(
+                    column, requested_event, self.input_path
+                ))
+        return super().get_event(requested_event, use_event_id=use_event_id)
+
     def read(self, allowed_tels=None, requested_event=None,
              use_event_id=False):
         """
@@ -342,6 +428,28 @@ class HessioFileReader(EventFileReader):
         self.log.debug("File reading complete")
         return source
 
+    def read_chunks(self, chunk_size=100, allowed_tels=None):
+        """
+        Read the file in chunks of events stored column-wise in
+        preallocated arrays, see `ctapipe.io.hessio.hessio_chunk_source`.
+
+        Parameters
+        ----------
+        chunk_size : int
+            number of events per chunk
+        allowed_tels : list[int]
+            select only a subset of telescope, if None, all are read.
+
+        Returns
+        -------
+        source : generator
+            A generator that can be iterated over to obtain
+            `ctapipe.io.hessio.HessioEventChunk`
+        """
+        return hessio_chunk_source(self.input_path, chunk_size=chunk_size,
+                                   max_events=self.max_events,
+                                   allowed_tels=allowed_tels)
+
 
 # External Children
 try:
@@ -1,3 +1,5 @@
+import json
+import os
 import re
 from abc import abstractmethod, ABCMeta
 from collections import defaultdict
@@ -9,12 +11,15 @@ from astropy.time import Time
 from astropy.units import Quantity
 
 import ctapipe
-from ctapipe.core import Component
+from ctapipe.core import Component, ContainerBatch, Provenance
+from ctapipe.core.traits import Int, Bool, Enum
 
 __all__ = ['TableWriter',
            'TableReader',
            'HDF5TableWriter',
-           'HDF5TableReader']
+           'HDF5TableReader',
+           'shard_filename',
+           'merge_hdf5_files']
 
 PYTABLES_TYPE_MAP = {
     'float': tables.Float64Col,
@@ -32,6 +37,7 @@ class TableWriter(Component, metaclass=ABCMeta):
         super().__init__(parent, **kwargs)
         self._transforms = defaultdict(dict)
         self._exclusions = defaultdict(list)
+        self._variable_length = defaultdict(list)
 
     def exclude(self, table_name, pattern):
         """
@@ -52,6 +58,28 @@ class TableWriter(Component, metaclass=ABCMeta):
                 return True
         return False
 
+    def set_variable_length(self, table_name, pattern):
+        """
+        Allow the shape of the array columns matching the pattern to change
+        from row to row (keeping the same number of dimensions), e.g. for the
+        images of different camera types. This must be called before the
+        first write to the table.
+
+        Parameters
+        ----------
+        table_name: str
+            name of table on which to apply the setting
+        pattern: str
+            regular expression string to match column name
+        """
+        self._variable_length[table_name].append(re.compile(pattern))
+
+    def _is_column_variable_length(self, table_name, col_name):
+        for pattern in self._variable_length[table_name]:
+            if pattern.match(col_name):
+                return True
+        return False
+
     def add_column_transform(self, table_name, col_name, transform):
         """
         Add a transformation function for a column. This function will be
@@ -78,7 +106,7 @@ class TableWriter(Component, metaclass=ABCMeta):
         Write the contents of the given container to a table.  The first call
         to write  will create a schema and initialize the table within the
         file. The shape of data within the container must not change between
-        calls, since variable-length arrays are not supported.
+        calls, except for the columns declared with `set_variable_length()`.
 
         Parameters
         ----------
@@ -123,6 +151,46 @@ class HDF5TableWriter(TableWriter):
     change the table_name attribute to write() to specify which one to write
     to.
 
+    The shape of the array columns is fixed by the first container written
+    to a table, except for those declared with `set_variable_length()`,
+    which may have a different shape in each row. Their flattened values are
+    concatenated in a separate extendable array next to the table (named
+    ``<table_name>__<column>``), and the table holds the ``<column>_start``
+    position in it and the ``<column>_shape`` of each row. Unlike
+    variable-length HDF5 types, these arrays are chunked and thus compressed.
+
+    >>> writer.set_variable_length('dl1', 'image|peakpos|mask')
+
+    By default each row is written immediately. With a `buffer_size` above
+    0, rows are instead buffered in a `ctapipe.core.ContainerBatch` per table
+    and appended `buffer_size` rows at a time, the column transforms being
+    applied to whole columns (so custom transforms must then accept arrays).
+    Tables with variable-length columns are always written row by row.
+    Buffered rows are written by `flush()` and `close()`, which is called
+    when leaving a ``with`` block:
+
+    >>> with HDF5TableWriter('out.h5', group_name='dl1') as writer:
+    >>>     for event in source:
+    >>>         writer.write('hillas', hillas_container)
+
+    The nodes are not compressed by default. Set `complevel` (and
+    optionally `complib`, `shuffle` and `bitshuffle`) to compress them with
+    the corresponding `filters`, or pass a `tables.Filters` as ``filters``.
+    The blosc compressors are faster than zlib, but files written with them
+    need the blosc HDF5 plugin to be read outside of pytables. The HDF5 chunk shape of the
+    tables is chosen by pytables from `expected_rows`, unless `chunkshape` is
+    set. These settings are recorded in the attributes of each table
+    (``COMPLIB``, ``COMPLEVEL``, ``SHUFFLE``, ``BITSHUFFLE``,
+    ``EXPECTED_ROWS``, ``CHUNKSHAPE``).
+
+    A file must only be written by one process. When processing in parallel,
+    give each process a different `shard` number, so that it writes its own
+    ``<name>.partNNN.h5`` file (see `shard_filename`), and merge the shards
+    with `merge_hdf5_files` or the ``ctapipe-merge-hdf5`` tool. The
+    provenance of the process is stored in each file on `close()`, in the
+    ``/CTAPIPE_PROVENANCE`` array, which holds one JSON-encoded activity per
+    row.
+
     TODO:
     - ability to write several containers to the same table (appending a
     string to each column name). Perhaps `write(name, dict(method_a=cont,
@@ -139,19 +207,75 @@ class HDF5TableWriter(TableWriter):
     group_name: str
         name of group into which to put all of the tables generated by this
         Writer (it will be placed under "/" in the file)
+    kwargs:
+        values of the traits of the writer (e.g. ``buffer_size=0`` or
+        ``parent=tool``), the other ones are passed to `tables.open_file`
 
     """
 
+    buffer_size = Int(0, help='Number of rows buffered per table before '
+                              'they are written to the file, 0 to write '
+                              'each row immediately. Column transforms of '
+                              'buffered tables get whole '
+                              'columns').tag(config=True)
+    complib = Enum(tables.filters.all_complibs, default_value='zlib',
+                   help='Compression library, the blosc ones can only be '
+                        'read by HDF5 tools with the blosc '
+                        'plugin').tag(config=True)
+    complevel = Int(0, help='Compression level from 0 to 9, 0 to disable '
+                            'compression').tag(config=True)
+    shuffle = Bool(True, help='Byte-shuffle the data before compressing '
+                              'it').tag(config=True)
+    bitshuffle = Bool(False, help='Bit-shuffle the data before compressing '
+                                  'it (blosc only), instead of '
+                                  'byte-shuffling it').tag(config=True)
+    expected_rows = Int(10000, help='Expected number of rows of each table, '
+                                    'used to choose the chunk '
+                                    'shape').tag(config=True)
+    chunkshape = Int(None, allow_none=True,
+                     help='Number of rows per HDF5 chunk of the tables, by '
+                          'default chosen from expected_rows').tag(config=True)
+    shard = Int(None, allow_none=True,
+                help='Number of the shard written by this process, if the '
+                     'output is split in <name>.partNNN.h5 '
+                     'files').tag(config=True)
+
     def __init__(self, filename, group_name, **kwargs):
-        super().__init__()
+        traits = {name: kwargs.pop(name) for name in self.class_trait_names()
+                  if name in kwargs}
+        super().__init__(**traits)
+        kwargs.setdefault('filters', self.filters)
         self._schemas = {}
         self._tables = {}
+        self._buffers = {}
+        self._colnames = {}
+        self._variable_length_data = defaultdict(dict)
+        if self.shard is not None:
+            filename = shard_filename(filename, self.shard)
+        self.filename = filename
         self._h5file = tables.open_file(filename, mode="w", **kwargs)
+        if self.shard is not None:
+            self._h5file.root._v_attrs['SHARD'] = self.shard
         self._group = self._h5file.create_group("/", group_name)
         self.log.debug("h5file: {}".format(self._h5file))
 
+    @property
+    def filters(self):
+        """ `tables.Filters` built from the compression configuration """
+        return tables.Filters(complevel=self.complevel,
+                              complib=self.complib,
+                              shuffle=self.shuffle and not self.bitshuffle,
+                              bitshuffle=self.bitshuffle)
+
     def __del__(self):
-        self._h5file.close()
+        if hasattr(self, '_h5file'):
+            self.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
 
     def _create_hdf5_table_schema(self, table_name, container):
         """
@@ -198,7 +322,28 @@ class HDF5TableWriter(TableWriter):
                 value = tr(value)
                 self.add_column_transform(table_name, col_name, tr)
 
-            if isinstance(value, np.ndarray):
+            if isinstance(value, np.ndarray) and \
+                    self._is_column_variable_length(table_name, col_name):
+                typename = value.dtype.name
+                shape = (None, ) * value.ndim
+                data_name = '{}__{}'.format(table_name, col_name)
+                data = self._h5file.create_earray(
+                    where=self._group,
+                    name=data_name,
+                    atom=tables.Atom.from_dtype(value.dtype),
+                    shape=(0, ),
+                    expectedrows=self.expected_rows * max(value.size, 1),
+                    title="values of column {} of {}".format(col_name,
+                                                             table_name)
+                )
+                self._variable_length_data[table_name][col_name] = data
+                meta['{}_VARLEN'.format(col_name)] = data_name
+                Schema.columns[col_name + '_start'] = tables.Int64Col()
+                Schema.columns[col_name + '_shape'] = tables.Int64Col(
+                    shape=value.ndim
+                )
+
+            elif isinstance(value, np.ndarray):
                 typename = value.dtype.name
                 coltype = PYTABLES_TYPE_MAP[typename]
                 shape = value.shape
@@ -229,15 +374,34 @@ class HDF5TableWriter(TableWriter):
         meta = self._create_hdf5_table_schema(table_name, container)
         meta.update(container.meta)  # copy metadata from container
 
+        chunkshape = None
+        if self.chunkshape is not None:
+            chunkshape = (self.chunkshape, )
         table = self._h5file.create_table(where=self._group,
                                           name=table_name,
                                           title="storage of {}".format(
                                               container.__class__.__name__),
-                                          description=self._schemas[table_name])
+                                          description=self._schemas[table_name],
+                                          expectedrows=self.expected_rows,
+                                          chunkshape=chunkshape)
+
+        # record the storage settings, as actually used by pytables
+        meta['COMPLIB'] = table.filters.complib or ''
+        meta['COMPLEVEL'] = table.filters.complevel
+        meta['SHUFFLE'] = table.filters.shuffle
+        meta['BITSHUFFLE'] = table.filters.bitshuffle
+        meta['EXPECTED_ROWS'] = self.expected_rows
+        meta['CHUNKSHAPE'] = table.chunkshape[0]
+
         for key, val in meta.items():
             table.attrs[key] = val
 
         self._tables[table_name] = table
+        index_columns = {col_name + suffix
+                         for col_name in self._variable_length_data[table_name]
+                         for suffix in ('_start', '_shape')}
+        self._colnames[table_name] = [colname for colname in table.colnames
+                                      if colname not in index_columns]
 
     def _append_row(self, table_name, container):
         """
@@ -247,7 +411,15 @@ class HDF5TableWriter(TableWriter):
         table = self._tables[table_name]
         row = table.row
 
-        for colname in table.colnames:
+        for colname, data in self._variable_length_data[table_name].items():
+            value = self._apply_col_transform(table_name, colname,
+                                              container[colname])
+            value = np.asanyarray(value)
+            row[colname + '_start'] = data.nrows
+            row[colname + '_shape'] = value.shape
+            data.append(value.ravel())
+
+        for colname in self._colnames[table_name]:
             value = self._apply_col_transform(table_name, colname,
                                               container[colname])
 
@@ -255,25 +427,94 @@ class HDF5TableWriter(TableWriter):
 
         row.append()
 
+    def _append_batch(self, table_name, batch):
+        """
+        append all rows of a `ContainerBatch` to an already initialized
+        table at once. The column transforms are applied to whole columns.
+        """
+        table = self._tables[table_name]
+        table.flush()  # rows appended with table.row come first
+        rows = np.empty(len(batch), dtype=table.dtype)
+
+        # the rows of a batch all have the same shape
+        for colname, data in self._variable_length_data[table_name].items():
+            values = np.asanyarray(
+                self._apply_col_transform(table_name, colname, batch[colname])
+            )
+            size = int(np.prod(values.shape[1:]))
+            rows[colname + '_start'] = (data.nrows
+                                        + size * np.arange(len(batch)))
+            rows[colname + '_shape'] = values.shape[1:]
+            data.append(values.ravel())
+
+        for colname in self._colnames[table_name]:
+            rows[colname] = self._apply_col_transform(table_name, colname,
+                                                      batch[colname])
+        table.append(rows)
+
     def write(self, table_name, container):
         """
         Write the contents of the given container to a table.  The first call
         to write  will create a schema and initialize the table within the
         file. The shape of data within the container must not change between
-        calls, since variable-length arrays are not supported.
+        calls, except for the columns declared with `set_variable_length()`.
 
         Parameters
         ----------
         table_name: str
             name of table to write to
-        container: `ctapipe.core.Container`
-            container to write
+        container: `ctapipe.core.Container` or `ctapipe.core.ContainerBatch`
+            container to write, or batch of containers to write at once
         """
+        if isinstance(container, ContainerBatch):
+            if len(container) == 0:
+                return
+            if table_name not in self._schemas:
+                first_row = container.to_container(0)
+                first_row.meta.update(container.meta)
+                self._setup_new_table(table_name, first_row)
+            # keep the rows in order
+            self._flush_buffer(table_name)
+            self._append_batch(table_name, container)
+            return
 
         if table_name not in self._schemas:
             self._setup_new_table(table_name, container)
 
-        self._append_row(table_name, container)
+        if self.buffer_size > 0 and \
+                not self._variable_length_data[table_name]:
+            buffer = self._buffers.get(table_name)
+            if buffer is None:
+                buffer = ContainerBatch(container.__class__,
+                                        capacity=self.buffer_size)
+                self._buffers[table_name] = buffer
+            buffer.append(container)
+            if len(buffer) >= self.buffer_size:
+                self._flush_buffer(table_name)
+        else:
+            self._append_row(table_name, container)
+
+    def _flush_buffer(self, table_name):
+        """ append the rows buffered for a table, if any """
+        buffer = self._buffers.get(table_name)
+        if buffer is not None and len(buffer) > 0:
+            self._append_batch(table_name, buffer)
+            buffer.clear()
+
+    def flush(self):
+        """ write all buffered rows to the file """
+        for table_name in self._buffers:
+            self._flush_buffer(table_name)
+        self._h5file.flush()
+
+    def close(self):
+        """ write all buffered rows and the provenance, and close the file """
+        if self._h5file.isopen:
+            try:
+                self.flush()
+                _write_provenance(self._h5file)
+            finally:
+                self._h5file.close()
 
 
 class TableReader(Component, metaclass=ABCMeta):
@@ -341,7 +582,8 @@ class HDF5TableReader(TableReader):
 
     Columns that were written by SimpleHDF5TableWriter and which had unit
     transforms applied, will have the units re-applied when reading (the
-    unit used is stored in the header attributes).
+    unit used is stored in the header attributes). Variable-length columns
+    are read back from their separate array.
 
     Note that this is only useful if you want to read all information *one
     event at a time* into a container, which is not very I/O efficient. For
@@ -349,6 +591,17 @@ class HDF5TableReader(TableReader):
     table data directly, for example to read an entire column or table at
     once (which means not using the Container data structure).
 
+    For this, `read_chunks(path, container_class)` reads blocks of rows as
+    `ctapipe.core.ContainerBatch` columns, optionally only a subset of the
+    columns and only the rows matching a condition, which is evaluated
+    in-kernel by pytables:
+
+    >>> batches = reader.read_chunks('/dl1/hillas', HillasParametersContainer,
+    >>>                              columns=['intensity', 'width', 'length'],
+    >>>                              where='intensity > 100')
+    >>> for batch in batches:
+    >>>     batch['width']  # Quantity array
+
     Todo:
     - add ability to synchronize reading of multiple tables on a key
 
@@ -368,9 +621,19 @@ class HDF5TableReader(TableReader):
         """
         super().__init__()
         self._tables = {}
+        self._variable_length_data = defaultdict(dict)
         self._h5file = tables.open_file(filename)
         pass
 
+    def _get_variable_length_data(self, tab):
+        """ dict of the arrays holding the variable-length columns of a
+        table, by column name """
+        return {
+            attr[:-len('_VARLEN')]: self._h5file.get_node(tab._v_parent,
+                                                          tab.attrs[attr])
+            for attr in tab.attrs._f_list() if attr.endswith('_VARLEN')
+        }
+
     def _setup_table(self, table_name, container):
         tab = self._h5file.get_node(table_name)
         self._tables[table_name] = tab
@@ -393,7 +656,16 @@ class HDF5TableReader(TableReader):
         """ identifies which columns in the table to read into the container,
         by comparing their names."""
         tab = self._tables[table_name]
+        variable_length_data = self._get_variable_length_data(tab)
+        index_columns = {colname + suffix for colname in variable_length_data
+                         for suffix in ('_start', '_shape')}
+        for colname, data in variable_length_data.items():
+            if colname in container.fields:
+                self._variable_length_data[table_name][colname] = data
+
         for colname in tab.colnames:
+            if colname in index_columns:
+                continue
             if colname in container.fields:
                 self._cols_to_read[table_name].append(colname)
             else:
@@ -405,7 +677,8 @@ class HDF5TableReader(TableReader):
         # also check that the container doesn't have fields that are not
         # in the table:
         for colname in container.fields:
-            if colname not in self._cols_to_read[table_name]:
+            if colname not in self._cols_to_read[table_name] and \
+                    colname not in variable_length_data:
                 self.log.warn("Table '{}' is missing column '{}' that is "
                               "in container {}. It will be skipped"
                               .format(table_name, colname,
@@ -441,12 +714,290 @@ class HDF5TableReader(TableReader):
                                                                colname,
                                                                row[colname])
 
+            variable_length_data = self._variable_length_data[table_name]
+            for colname, data in variable_length_data.items():
+                start = row[colname + '_start']
+                shape = row[colname + '_shape']
+                value = data[start:start + np.prod(shape)].reshape(shape)
+                container[colname] = self._apply_col_transform(table_name,
+                                                               colname,
+                                                               value)
+
             yield container
             row_count += 1
 
+    def read_chunks(self, table_name, container_class, chunk_size=10000,
+                    columns=None, where=None, condvars=None):
+        """
+        Returns a generator that reads the table in blocks of rows, as
+        `ctapipe.core.ContainerBatch` objects holding the columns (with the
+        units re-applied), without going through a container per row.
+        Variable-length columns are object arrays holding the array (or
+        Quantity) of each row.
 
+        Parameters
+        ----------
+        table_name: str
+            HDF5 path of the table
+        container_class: type
+            `ctapipe.core.Container` subclass of the rows
+        chunk_size: int
+            number of table rows read at once. With `where`, each batch
+            only holds the matching rows among them (batches with no match are
+            skipped).
+        columns: list or None
+            names of the columns to read, by default all the ones that are
+            fields of `container_class`
+        where: str or None
+            condition selecting the rows, in the syntax of
+            `tables.Table.read_where`, e.g. ``'(size > 100) & (width > 0)'``
+        condvars: dict or None
+            values of the variables in `where` that are not column names
+        """
+        tab = self._h5file.get_node(table_name)
+        variable_length_data = self._get_variable_length_data(tab)
+        available = list(tab.colnames) + list(variable_length_data)
+        if columns is None:
+            columns = [colname for colname in available
+                       if colname in container_class.fields]
+        else:
+            missing = [colname for colname in columns
+                       if colname not in available]
+            if missing:
+                raise KeyError("Table '{}' has no columns {}"
+                               .format(table_name, missing))
+
+        meta = {key: tab.attrs[key] for key in tab.attrs._f_list()}
+        units = {colname: meta[colname + '_UNIT'] for colname in columns
+                 if colname + '_UNIT' in meta}
+        # the units of variable-length columns are applied to each row
+        varlen_units = {colname: units.pop(colname, None)
+                        for colname in columns
+                        if colname in variable_length_data}
+
+        for start in range(0, tab.nrows, chunk_size):
+            stop = min(start + chunk_size, tab.nrows)
+            if where is None:
+                rows = tab.read(start, stop)
+            else:
+                rows = tab.read_where(where, condvars=condvars,
+                                      start=start, stop=stop)
+                if len(rows) == 0:
+                    continue
+
+            batch_columns = {}
+            for colname in columns:
+                if colname in variable_length_data:
+                    batch_columns[colname] = _read_variable_length(
+                        variable_length_data[colname],
+                        rows[colname + '_start'],
+                        rows[colname + '_shape'],
+                        varlen_units[colname],
+                    )
+                else:
+                    batch_columns[colname] = rows[colname]
+
+            yield ContainerBatch.from_columns(
+                container_class,
+                batch_columns,
+                units=units,
+                meta=meta,
+            )
 
 
+def _read_variable_length(data, starts, shapes, unit=None):
+    """
+    read the rows of a variable-length column with a single read of the
+    covered range of ``data``, into an object array of arrays (or Quantities,
+    if ``unit`` is given)
+    """
+    values = np.empty(len(starts), dtype=object)
+    if len(starts) == 0:
+        return values
+    shapes = shapes.reshape(len(starts), -1)
+    sizes = shapes.prod(axis=1)
+    first = starts.min()
+    block = data[first:(starts + sizes).max()]
+    for index, (start, size) in enumerate(zip(starts - first, sizes)):
+        value = block[start:start + size].reshape(shapes[index])
+        values[index] = value if unit is None else Quantity(value, unit)
+    return values
+
+
+def shard_filename(filename, shard):
+    """
+    Name of the file written by one process of a sharded output, e.g.
+    ``dl1.part002.h5`` for shard 2 of ``dl1.h5``.
+
+    Parameters
+    ----------
+    filename: str
+        name of the merged file
+    shard: int
+        number of the shard
+    """
+    base, ext = os.path.splitext(filename)
+    return '{}.part{:03d}{}'.format(base, shard, ext or '.h5')
+
+
+PROVENANCE_NODE = 'CTAPIPE_PROVENANCE'
+
+
+def _read_provenance(h5file):
+    """ list of the provenance activities stored in a file """
+    path = '/' + PROVENANCE_NODE
+    if path not in h5file:
+        return []
+    return [json.loads(activity) for activity in h5file.get_node(path)]
+
+
+def _write_provenance(h5file, activities=()):
+    """
+    append the given provenance activities and those of the current process
+    to the ``CTAPIPE_PROVENANCE`` array of the root node, which holds one
+    JSON-encoded activity per row, skipping the activities already in it
+    """
+    path = '/' + PROVENANCE_NODE
+    if path in h5file:
+        node = h5file.get_node(path)
+    else:
+        node = h5file.create_vlarray('/', PROVENANCE_NODE,
+                                     atom=tables.VLUnicodeAtom(),
+                                     title='ctapipe provenance activities')
+
+    provenance = Provenance()
+    current = provenance.finished_activities + provenance.active_activities
+    uuids = {activity['activity_uuid']
+             for activity in _read_provenance(h5file)}
+    for activity in list(activities) + [a.provenance for a in current]:
+        if activity['activity_uuid'] not in uuids:
+            uuids.add(activity['activity_uuid'])
+            node.append(json.dumps(activity, default=str))
+
+
+def _get_output_group(h5file, path):
+    """ get a group, creating it and its parents if needed """
+    if path in h5file:
+        return h5file.get_node(path)
+    parent, name = path.rsplit('/', 1)
+    return h5file.create_group(_get_output_group(h5file, parent or '/'), name)
+
+
+def _check_same_layout(node, output_node):
+    """ check that a node can be appended to the one of the output file """
+    filename = node._v_file.filename
+    if node.dtype != output_node.dtype or node.shape[1:] != \
+            output_node.shape[1:]:
+        raise ValueError("'{}' in '{}' does not have the same columns or "
+                         "shape as in the first file".format(
+                             node._v_pathname, filename))
+
+    # the column transforms must be the same, e.g. the units of the values
+    if isinstance(node, tables.Table):
+        transform_attrs = [
+            attr for attr in set(node.attrs._f_list())
+            | set(output_node.attrs._f_list())
+            if attr.endswith('_UNIT') or attr.endswith('_VARLEN')
+        ]
+        for attr in transform_attrs:
+            value = node.attrs[attr] if attr in node.attrs else None
+            output_value = (output_node.attrs[attr]
+                            if attr in output_node.attrs else None)
+            if value != output_value:
+                raise ValueError("'{}' in '{}' has {}={}, but {} in the "
+                                 "first file".format(
+                                     node._v_pathname, filename, attr,
+                                     value, output_value))
+
+
+def _append_node(node, output, chunk_size, offsets=None):
+    """
+    append the rows of a table or extendable array to the same node of the
+    output, ``chunk_size`` rows at a time, adding ``offsets`` to the given
+    columns
+    """
+    path = node._v_pathname
+    if path not in output:
+        parent = _get_output_group(output, node._v_parent._v_pathname)
+        node._f_copy(newparent=parent, newname=node._v_name)
+        return
+
+    output_node = output.get_node(path)
+    if not isinstance(node, (tables.Table, tables.EArray)):
+        raise ValueError("cannot append '{}' of type {}".format(
+            path, node.__class__.__name__))
+    _check_same_layout(node, output_node)
+
+    for start in range(0, node.nrows, chunk_size):
+        rows = node.read(start, min(start + chunk_size, node.nrows))
+        for colname, offset in (offsets or {}).items():
+            rows[colname] += offset
+        output_node.append(rows)
+
+
+def merge_hdf5_files(input_files, output_file, overwrite=False,
+                     chunk_size=100000):
+    """
+    Merge files written by `HDF5TableWriter` (e.g. the shards written in
+    parallel, see `shard_filename`) into one file, concatenating the tables
+    and the arrays of variable-length columns with the same path. The data
+    are copied in blocks of rows, without going through containers.
+
+    The tables must have the same columns and column transforms (units) in
+    all files, otherwise a `ValueError` is raised. The provenance stored
+    in the input files is merged, together with the one of the current
+    process. The attributes of the tables are taken from the first file.
+
+    Parameters
+    ----------
+    input_files: list
+        names of the files to merge, in order
+    output_file: str
+        name of the merged file
+    overwrite: bool
+        overwrite the output file if it exists
+    chunk_size: int
+        number of rows copied at once
+    """
+    input_files = list(input_files)
+    if not input_files:
+        raise ValueError("no input files to merge")
+
+    with tables.open_file(input_files[0]) as h5file:
+        h5file.copy_file(output_file, overwrite=overwrite)
+
+    with tables.open_file(output_file, mode='a') as output:
+        provenance = []
+        if 'SHARD' in output.root._v_attrs:
+            del output.root._v_attrs.SHARD
+
+        for filename in input_files[1:]:
+            with tables.open_file(filename) as h5file:
+                # append the tables first, shifting the positions of their
+                # variable-length values by the size of the arrays holding
+                # them, which are appended afterwards
+                for table in h5file.walk_nodes('/', 'Table'):
+                    offsets = {}
+                    for attr in table.attrs._f_list():
+                        if attr.endswith('_VARLEN'):
+                            data_path = '/'.join([
+                                table._v_parent._v_pathname.rstrip('/'),
+                                table.attrs[attr]
+                            ])
+                            if data_path in output:
+                                colname = attr[:-len('_VARLEN')] + '_start'
+                                offsets[colname] = output.get_node(
+                                    data_path).nrows
+                    _append_node(table, output, chunk_size, offsets)
+
+                for node in h5file.walk_nodes('/', 'Leaf'):
+                    if not isinstance(node, tables.Table) and \
+                            node._v_pathname != '/' + PROVENANCE_NODE:
+                        _append_node(node, output, chunk_size)
+
+                provenance.extend(_read_provenance(h5file))
+
+        _write_provenance(output, provenance)
 
 
 def tr_convert_and_strip_unit(quantity, unit):
@@ -4,13 +4,20 @@ Components to read HESSIO data.
 
 This requires the hessio python library to be installed
 """
+import hashlib
 import logging
+import os
+import pickle
+import tempfile
 
+import numpy as np
 from astropy import units as u
 from astropy.coordinates import Angle
+from astropy.table import Table
 from astropy.time import Time
 
 from .containers import DataContainer
+from .. import __version__
 from ..core import Provenance
 from ..instrument import TelescopeDescription, SubarrayDescription
 
@@ -28,7 +35,14 @@ except ImportError as err:
     raise err
 
 __all__ = [
+    'TELESCOPE_FIELDS',
     'hessio_event_source',
+    'hessio_chunk_source',
+    'hessio_build_event_index',
+    'hessio_event_index',
+    'hessio_get_subarray',
+    'HessioEventChunk',
+    'HessioTelescopeChunk',
 ]
 
 
@@ -70,8 +84,121 @@ def hessio_get_list_event_ids(url, max_events=None):
                            .format(url))
 
 
+INDEX_VERSION = 1
+
+#: per-telescope fields filled by `hessio_event_source`, which can be
+#: selected with its ``fields`` argument
+TELESCOPE_FIELDS = (
+    'adc_samples', 'adc_sums', 'num_samples',
+    'dc_to_pe', 'pedestal', 'reference_pulse_shape', 'photo_electron_image',
+    'refstep', 'time_slice',
+    'azimuth_raw', 'altitude_raw', 'azimuth_cor', 'altitude_cor',
+)
+
+
+def hessio_build_event_index(url):
+    """
+    Scan a hessio file once and build an index of its events.
+
+    Parameters
+    ----------
+    url : str
+        path to file to open
+
+    Returns
+    -------
+    index : `astropy.table.Table`
+        one row per event, with columns ``count`` (position of the event in
+        the file), ``event_id``, ``tels_with_data`` (comma-separated
+        telescope ids) and ``mc_energy``. The table meta records the size
+        and modification time of the file, to detect an outdated index.
+    """
+    counts, event_ids, tels, energies = [], [], [], []
+    try:
+        with open_hessio(url) as pyhessio:
+            Provenance().add_input_file(url, role='r0.sub.evt')
+            for counter, event_id in enumerate(pyhessio.move_to_next_event()):
+                counts.append(counter)
+                event_ids.append(event_id)
+                tels.append(','.join(
+                    str(tel_id)
+                    for tel_id in sorted(pyhessio.get_teldata_list())
+                ))
+                energies.append(pyhessio.get_mc_shower_energy())
+    except HessioError:
+        raise RuntimeError("hessio_build_event_index failed to open '{}'"
+                           .format(url))
+
+    index = Table(
+        [np.array(counts, dtype=np.int64),
+         np.array(event_ids, dtype=np.int64),
+         np.array(tels, dtype=str),
+         u.Quantity(energies, u.TeV)],
+        names=['count', 'event_id', 'tels_with_data', 'mc_energy'],
+    )
+    index.meta.update(_index_file_meta(url))
+    return index
+
+
+def hessio_event_index(url, index_path=None, rebuild=False):
+    """
+    Load the sidecar event index of a hessio file, building and writing it
+    with `hessio_build_event_index` if it does not exist yet or no longer
+    matches the file.
+
+    Parameters
+    ----------
+    url : str
+        path to the hessio file
+    index_path : str, optional
+        path of the index file, by default ``url + '.index.ecsv'``
+    rebuild : bool
+        rebuild the index even if an up-to-date one exists
+
+    Returns
+    -------
+    index : `astropy.table.Table`
+        see `hessio_build_event_index`
+    """
+    if index_path is None:
+        index_path = url + '.index.ecsv'
+
+    if not rebuild and os.path.exists(index_path):
+        try:
+            index = Table.read(index_path, format='ascii.ecsv')
+        except Exception as err:
+            logger.warning("event index '{}' is unreadable, rebuilding it: {}"
+                           .format(index_path, err))
+        else:
+            expected = _index_file_meta(url)
+            if all(index.meta.get(key) == value
+                   for key, value in expected.items()):
+                return index
+            logger.info("event index '{}' is outdated, rebuilding it"
+                        .format(index_path))
+
+    index = hessio_build_event_index(url)
+    try:
+        index.write(index_path, format='ascii.ecsv', overwrite=True)
+    except OSError as err:
+        logger.warning("could not write event index '{}': {}"
+                       .format(index_path, err))
+    return index
+
+
+def _index_file_meta(url):
+    stat = os.stat(url)
+    return {
+        'INPUT': os.path.basename(url),
+        'INPUT_SIZE': stat.st_size,
+        'INPUT_MTIME': stat.st_mtime,
+        'INDEX_VERSION': INDEX_VERSION,
+    }
+
+
 def hessio_event_source(url, max_events=None, allowed_tels=None,
-                        requested_event=None, use_event_id=False):
+                        requested_event=None, use_event_id=False,
+                        fields=None, pooled=False):
     """A generator that streams data from an EventIO/HESSIO MC data file
     (e.g. a standard CTA data file.)
 
@@ -91,7 +218,26 @@ def hessio_event_source(url, max_events=None, allowed_tels=None,
     use_event_id : bool
         If True ,'requested_event' now seeks for a particular event id instead
         of index
+    fields : list[str]
+        per-telescope fields to read, out of `TELESCOPE_FIELDS`. If None, all
+        are read. Reading only the fields a tool uses avoids copying the
+        waveforms of all telescopes, e.g. ``fields=[]`` for trigger or MC
+        shower information only, in which case no `r0.tel` or `mc.tel`
+        entries are filled.
+    pooled : bool
+        Reuse the per-telescope containers of previous events (see
+        `ctapipe.core.Map.release`), so that calibrators can recycle their
+        arrays instead of allocating new ones for every event. Arrays of
+        an event must then not be kept beyond the next event.
     """
+    if fields is None:
+        fields = set(TELESCOPE_FIELDS)
+    else:
+        fields = set(fields)
+        unknown = fields - set(TELESCOPE_FIELDS)
+        if unknown:
+            raise ValueError("unknown telescope fields: {}"
+                             .format(sorted(unknown)))
 
     with open_hessio(url) as pyhessio:
         # the container is initialized once, and data is replaced within
@@ -158,68 +304,471 @@ def hessio_event_source(url, max_events=None, allowed_tels=None,
 
             data.count = counter
 
-            # this should be done in a nicer way to not re-allocate the
-            # data each time (right now it's just deleted and garbage
-            # collected)
+            # clear the previous telescopes, either keeping their containers
+            # for reuse or letting them be garbage collected
+            for tel_map in (data.r0.tel, data.r1.tel, data.dl0.tel,
+                            data.dl1.tel, data.mc.tel):
+                if pooled:
+                    tel_map.release()
+                else:
+                    tel_map.clear()
 
-            data.r0.tel.clear()
-            data.r1.tel.clear()
-            data.dl0.tel.clear()
-            data.dl1.tel.clear()
-            data.mc.tel.clear()  # clear the previous telescopes
-
-            _fill_instrument_info(data, pyhessio)
+            if not data.inst.telescope_ids:
+                # the run header is only known once the first event is read
+                _fill_instrument_info(data, _read_instrument_info(pyhessio))
 
             for tel_id in data.r0.tels_with_data:
+                _fill_telescope(data, pyhessio, tel_id, fields)
 
-                # event.mc.tel[tel_id] = MCCameraContainer()
-
-                data.mc.tel[tel_id].dc_to_pe \
-                    = pyhessio.get_calibration(tel_id)
-                data.mc.tel[tel_id].pedestal \
-                    = pyhessio.get_pedestal(tel_id)
-
-                data.r0.tel[tel_id].adc_samples = \
-                    pyhessio.get_adc_sample(tel_id)
-                if data.r0.tel[tel_id].adc_samples.size == 0:
-                    # To handle ASTRI and dst files
-                    data.r0.tel[tel_id].adc_samples = \
-                        pyhessio.get_adc_sum(tel_id)[..., None]
-                data.r0.tel[tel_id].adc_sums = \
-                    pyhessio.get_adc_sum(tel_id)
-                data.mc.tel[tel_id].reference_pulse_shape = \
-                    pyhessio.get_ref_shapes(tel_id)
-
-                nsamples = pyhessio.get_event_num_samples(tel_id)
-                if nsamples <= 0:
-                    nsamples = 1
-                data.r0.tel[tel_id].num_samples = nsamples
-
-                # load the data per telescope/pixel
-                hessio_mc_npe = pyhessio.get_mc_number_photon_electron
-                data.mc.tel[tel_id].photo_electron_image \
-                    = hessio_mc_npe(telescope_id=tel_id)
-                data.mc.tel[tel_id].meta['refstep'] = \
-                    pyhessio.get_ref_step(tel_id)
-                data.mc.tel[tel_id].time_slice = \
-                    pyhessio.get_time_slice(tel_id)
-                data.mc.tel[tel_id].azimuth_raw = \
-                    pyhessio.get_azimuth_raw(tel_id)
-                data.mc.tel[tel_id].altitude_raw = \
-                    pyhessio.get_altitude_raw(tel_id)
-                data.mc.tel[tel_id].azimuth_cor = \
-                    pyhessio.get_azimuth_cor(tel_id)
-                data.mc.tel[tel_id].altitude_cor = \
-                    pyhessio.get_altitude_cor(tel_id)
             yield data
             counter += 1
 
+            if requested_event is not None:
+                # the requested event was found, no need to read on
+                pyhessio.close_file()
+                return
+
             if max_events and counter >= max_events:
                 pyhessio.close_file()
                 return
 
 
-def _fill_instrument_info(data, pyhessio):
+def hessio_chunk_source(url, chunk_size=100, max_events=None,
+                        allowed_tels=None):
+    """A generator that streams data from an EventIO/HESSIO MC data file in
+    chunks of ``chunk_size`` events, stored column-wise in preallocated
+    arrays.
+
+    Unlike `hessio_event_source`, no `DataContainer` is filled, and no
+    astropy objects are created per event: the event and telescope data of
+    each chunk are copied into arrays that are allocated once and reused for
+    all following chunks. This is the fastest way to get the raw data of a
+    file into numpy for vectorised processing.
+
+    Parameters
+    ----------
+    url : str
+        path to file to open
+    chunk_size : int
+        number of events per chunk. The last chunk may be shorter.
+    max_events : int, optional
+        maximum number of events to read
+    allowed_tels : list[int]
+        select only a subset of telescope, if None, all are read.
+        Events without any of the selected telescopes are skipped.
+
+    Yields
+    ------
+    chunk : `HessioEventChunk`
+        The same object is yielded for every chunk, and its contents are
+        replaced after each yield, so copy the arrays you need to keep.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be positive, got {}"
+                         .format(chunk_size))
+
+    with open_hessio(url) as pyhessio:
+        Provenance().add_input_file(url, role='dl0.sub.evt')
+        counter = 0
+        if allowed_tels is not None:
+            allowed_tels = set(allowed_tels)
+        chunk = HessioEventChunk(chunk_size)
+        chunk.meta['origin'] = 'hessio'
+        chunk.meta['input'] = url
+
+        for event_id in pyhessio.move_to_next_event():
+            tels_with_data = set(pyhessio.get_teldata_list())
+            if allowed_tels is not None:
+                tels_with_data &= allowed_tels
+                if len(tels_with_data) == 0:
+                    continue  # skip event
+
+            chunk._fill_event(pyhessio, counter, event_id, tels_with_data)
+            counter += 1
+
+            if len(chunk) == chunk_size:
+                yield chunk
+                chunk._reset()
+
+            if max_events and counter >= max_events:
+                break
+
+        if len(chunk) > 0:
+            yield chunk
+
+
+class HessioTelescopeChunk:
+    """
+    Data of one telescope for the events of a `HessioEventChunk` in which it
+    has data, stored in arrays with the event as first axis.
+
+    Columns are accessed by name, e.g. ``tel_chunk['adc_samples']`` has shape
+    (n_events, n_chan, n_pix, n_samples). ``event_index`` gives the position
+    of each row in the event columns of the chunk.
+
+    Attributes
+    ----------
+    tel_id : int
+        telescope id
+    n_events : int
+        number of events in the chunk with data of this telescope
+    """
+
+    #: names of the per-event telescope columns
+    columns = ('adc_samples', 'adc_sums', 'pedestal', 'dc_to_pe',
+               'photo_electron_image')
+
+    def __init__(self, tel_id, chunk_size):
+        self.tel_id = tel_id
+        self.chunk_size = chunk_size
+        self.n_events = 0
+        self._event_index = np.empty(chunk_size, dtype=np.int64)
+        self._buffers = {}
+
+    def __len__(self):
+        return self.n_events
+
+    def __getitem__(self, name):
+        if name == 'event_index':
+            return self._event_index[:self.n_events]
+        return self._buffers[name][:self.n_events]
+
+    def __repr__(self):
+        return "{}(tel_id={}, n_events={})".format(
+            self.__class__.__name__, self.tel_id, self.n_events
+        )
+
+    def _set(self, name, array):
+        """ copy ``array`` into the row of the current event """
+        buffer = self._buffers.get(name)
+        if buffer is None:
+            # allocate on first use, as the shapes are only known once the
+            # telescope has data
+            buffer = np.empty((self.chunk_size, ) + array.shape,
+                              dtype=array.dtype)
+            self._buffers[name] = buffer
+        elif buffer.shape[1:] != array.shape:
+            raise ValueError("shape of '{}' of telescope {} changed from {} "
+                             "to {}".format(name, self.tel_id,
+                                            buffer.shape[1:], array.shape))
+        buffer[self.n_events] = array
+
+    def _fill(self, pyhessio, event_index):
+        tel_id = self.tel_id
+        adc_sums = pyhessio.get_adc_sum(tel_id)
+        adc_samples = pyhessio.get_adc_sample(tel_id)
+        if adc_samples.size == 0:
+            # To handle ASTRI and dst files
+            adc_samples = adc_sums[..., None]
+
+        self._event_index[self.n_events] = event_index
+        self._set('adc_samples', adc_samples)
+        self._set('adc_sums', adc_sums)
+        self._set('pedestal', pyhessio.get_pedestal(tel_id))
+        self._set('dc_to_pe', pyhessio.get_calibration(tel_id))
+        self._set('photo_electron_image',
+                  pyhessio.get_mc_number_photon_electron(telescope_id=tel_id))
+        self.n_events += 1
+
+
+class HessioEventChunk:
+    """
+    Data of up to ``chunk_size`` consecutive events of a HESSIO file,
+    stored column-wise, as yielded by `hessio_chunk_source`.
+
+    Event columns are accessed by name, e.g. ``chunk['event_id']``, and have
+    the event as first axis. Columns with a unit (the MC shower parameters)
+    are returned as `~astropy.units.Quantity` views of the underlying arrays,
+    so only one unit object is created per column and chunk. The data of
+    each telescope are in ``chunk.tel[tel_id]``, see `HessioTelescopeChunk`.
+
+    Attributes
+    ----------
+    n_events : int
+        number of events in the chunk
+    tel : dict
+        `HessioTelescopeChunk` by telescope id, for all telescopes seen so
+        far. Use `tels_with_data` for those with data in this chunk.
+    meta : dict
+        origin and input file of the events
+    """
+
+    #: event columns, with their dtype and unit
+    columns = {
+        'count': (np.int64, None),
+        'event_id': (np.int64, None),
+        'run_id': (np.int64, None),
+        'gps_time_s': (np.int64, None),
+        'gps_time_ns': (np.int64, None),
+        'mc_energy': (np.float64, u.TeV),
+        'mc_alt': (np.float64, u.rad),
+        'mc_az': (np.float64, u.rad),
+        'mc_core_x': (np.float64, u.m),
+        'mc_core_y': (np.float64, u.m),
+        'mc_h_first_int': (np.float64, u.m),
+    }
+
+    def __init__(self, chunk_size):
+        self.chunk_size = chunk_size
+        self.n_events = 0
+        self.tel = {}
+        self.meta = {}
+        self._buffers = {
+            name: np.empty(chunk_size, dtype=dtype)
+            for name, (dtype, _) in self.columns.items()
+        }
+
+    def __len__(self):
+        return self.n_events
+
+    def __getitem__(self, name):
+        column = self._buffers[name][:self.n_events]
+        unit = self.columns[name][1]
+        if unit is not None:
+            return u.Quantity(column, unit, copy=False)
+        return column
+
+    def __repr__(self):
+        return "{}(n_events={}, tels_with_data={})".format(
+            self.__class__.__name__, self.n_events,
+            sorted(self.tels_with_data)
+        )
+
+    @property
+    def tels_with_data(self):
+        """ set of ids of the telescopes with data in this chunk """
+        return {tel_id for tel_id, tel in self.tel.items() if tel.n_events}
+
+    @property
+    def gps_time(self):
+        """ central trigger time of the events as `~astropy.time.Time` """
+        return Time(self['gps_time_s'] * u.s, self['gps_time_ns'] * u.ns,
+                    format='unix', scale='utc')
+
+    def _reset(self):
+        self.n_events = 0
+        for tel in self.tel.values():
+            tel.n_events = 0
+
+    def _fill_event(self, pyhessio, counter, event_id, tels_with_data):
+        row = self.n_events
+        buffers = self._buffers
+
+        buffers['count'][row] = counter
+        buffers['event_id'][row] = event_id
+        buffers['run_id'][row] = pyhessio.get_run_number()
+        (buffers['gps_time_s'][row],
+         buffers['gps_time_ns'][row]) = pyhessio.get_central_event_gps_time()
+        buffers['mc_energy'][row] = pyhessio.get_mc_shower_energy()
+        buffers['mc_alt'][row] = pyhessio.get_mc_shower_altitude()
+        buffers['mc_az'][row] = pyhessio.get_mc_shower_azimuth()
+        buffers['mc_core_x'][row] = pyhessio.get_mc_event_xcore()
+        buffers['mc_core_y'][row] = pyhessio.get_mc_event_ycore()
+        buffers['mc_h_first_int'][row] = pyhessio.get_mc_shower_h_first_int()
+
+        for tel_id in tels_with_data:
+            tel = self.tel.get(tel_id)
+            if tel is None:
+                tel = HessioTelescopeChunk(tel_id, self.chunk_size)
+                self.tel[tel_id] = tel
+            tel._fill(pyhessio, row)
+
+        self.n_events += 1
+
+
+def _fill_telescope(data, pyhessio, tel_id, fields):
+    """
+    fill the r0 and mc data of one telescope, calling only the pyhessio
+    getters of the requested fields.
+    """
+    if 'dc_to_pe' in fields:
+        data.mc.tel[tel_id].dc_to_pe = pyhessio.get_calibration(tel_id)
+    if 'pedestal' in fields:
+        data.mc.tel[tel_id].pedestal = pyhessio.get_pedestal(tel_id)
+
+    if 'adc_samples' in fields:
+        data.r0.tel[tel_id].adc_samples = pyhessio.get_adc_sample(tel_id)
+        if data.r0.tel[tel_id].adc_samples.size == 0:
+            # To handle ASTRI and dst files
+            data.r0.tel[tel_id].adc_samples = \
+                pyhessio.get_adc_sum(tel_id)[..., None]
+    if 'adc_sums' in fields:
+        data.r0.tel[tel_id].adc_sums = pyhessio.get_adc_sum(tel_id)
+    if 'reference_pulse_shape' in fields:
+        data.mc.tel[tel_id].reference_pulse_shape = \
+            pyhessio.get_ref_shapes(tel_id)
+
+    if 'num_samples' in fields:
+        nsamples = pyhessio.get_event_num_samples(tel_id)
+        if nsamples <= 0:
+            nsamples = 1
+        data.r0.tel[tel_id].num_samples = nsamples
+
+    # load the data per telescope/pixel
+    if 'photo_electron_image' in fields:
+        hessio_mc_npe = pyhessio.get_mc_number_photon_electron
+        data.mc.tel[tel_id].photo_electron_image \
+            = hessio_mc_npe(telescope_id=tel_id)
+    if 'refstep' in fields:
+        data.mc.tel[tel_id].meta['refstep'] = pyhessio.get_ref_step(tel_id)
+    if 'time_slice' in fields:
+        data.mc.tel[tel_id].time_slice = pyhessio.get_time_slice(tel_id)
+    if 'azimuth_raw' in fields:
+        data.mc.tel[tel_id].azimuth_raw = pyhessio.get_azimuth_raw(tel_id)
+    if 'altitude_raw' in fields:
+        data.mc.tel[tel_id].altitude_raw = pyhessio.get_altitude_raw(tel_id)
+    if 'azimuth_cor' in fields:
+        data.mc.tel[tel_id].azimuth_cor = pyhessio.get_azimuth_cor(tel_id)
+    if 'altitude_cor' in fields:
+        data.mc.tel[tel_id].altitude_cor = pyhessio.get_altitude_cor(tel_id)
+
+
+def hessio_get_subarray(url, cache_dir=None):
+    """
+    Get the description of the telescope array simulated in a hessio file,
+    without reading more than its first event.
+
+    If an on-disk cache is enabled (see `_read_instrument_info`), the
+    description is cached per array layout of the run header, so opening
+    further files of the same production is fast.
+
+    Parameters
+    ----------
+    url : str
+        path to file to open
+    cache_dir : str, optional
+        directory of the on-disk cache, see `_read_instrument_info`
+
+    Returns
+    -------
+    subarray : `ctapipe.instrument.SubarrayDescription`
+    """
+    try:
+        with open_hessio(url) as pyhessio:
+            Provenance().add_input_file(url, role='dl0.sub.evt')
+            for _ in pyhessio.move_to_next_event():
+                return _read_instrument_info(pyhessio, cache_dir)['subarray']
+    except HessioError:
+        raise RuntimeError("hessio_get_subarray failed to open '{}'"
+                           .format(url))
+    raise RuntimeError("no events in '{}'".format(url))
+
+
+def _instrument_cache_dir():
+    """ directory of the on-disk instrument cache, None if disabled """
+    return os.getenv('CTAPIPE_CACHE_DIR') or None
+
+
+def _read_instrument_info(pyhessio, cache_dir=None):
+    """
+    Build the `SubarrayDescription` of the run in the open hessio file,
+    together with the per-telescope information still needed for the
+    deprecated fields of `InstrumentContainer`.
+
+    `TelescopeDescription.guess` is called only once per distinct telescope
+    type. The on-disk cache is opt-in: if ``cache_dir`` is given, or else
+    the ``CTAPIPE_CACHE_DIR`` environment variable is set, the result is
+    pickled there, keyed by a hash of the array layout in the run header
+    (including the pixel positions), so it is built only once per
+    production. Only point the cache to a directory you trust, as its
+    content is unpickled.
+
+    Returns
+    -------
+    info : dict
+        with keys ``telescope_ids``, ``subarray``, ``pixel_pos`` and
+        ``num_channels``
+    """
+    telescope_ids = list(pyhessio.get_telescope_ids())
+    layout = []
+    pixel_positions = {}
+    for tel_id in telescope_ids:
+        try:
+            pix_pos = pyhessio.get_pixel_position(tel_id)
+            layout.append((
+                tel_id,
+                # the geometry is part of the cached description
+                hashlib.sha1(np.ascontiguousarray(pix_pos)).hexdigest(),
+                pyhessio.get_num_pixels(tel_id),
+                pyhessio.get_num_channel(tel_id),
+                tuple(pyhessio.get_telescope_position(tel_id)),
+                pyhessio.get_optical_foclen(tel_id),
+                pyhessio.get_mirror_area(tel_id),
+                pyhessio.get_mirror_number(tel_id),
+            ))
+            pixel_positions[tel_id] = pix_pos
+        except HessioGeneralError:
+            pass
+
+    cache_dir = cache_dir or _instrument_cache_dir()
+    cache_path = None
+    if cache_dir is not None:
+        key = hashlib.sha1(repr((__version__, telescope_ids, layout))
+                           .encode()).hexdigest()
+        cache_path = os.path.join(cache_dir, 'subarray_{}.pkl'.format(key))
+
+    if cache_path is not None and os.path.exists(cache_path):
+        try:
+            with open(cache_path, 'rb') as cache_file:
+                return pickle.load(cache_file)
+        except Exception as err:
+            logger.warning("ignoring unreadable instrument cache '{}': {}"
+                           .format(cache_path, err))
+
+    info = dict(telescope_ids=telescope_ids,
+                subarray=SubarrayDescription("MonteCarloArray"),
+                pixel_pos={}, num_channels={})
+    # telescopes of the same type share their description
+    known_types = {}
+    for (tel_id, _, npix, nchans, tel_pos, foclen, mirror_area,
+         num_tiles) in layout:
+        pix_pos = pixel_positions[tel_id]
+        tel_type = (pix_pos.tobytes(), foclen, mirror_area, num_tiles)
+        if tel_type not in known_types:
+            pix_pos = pix_pos * u.m
+            tel = TelescopeDescription.guess(*pix_pos, foclen * u.m)
+            tel.optics.mirror_area = mirror_area * u.m ** 2
+            tel.optics.num_mirror_tiles = num_tiles
+            known_types[tel_type] = (tel, pix_pos)
+
+        tel, pix_pos = known_types[tel_type]
+        info['subarray'].tels[tel_id] = tel
+        info['subarray'].positions[tel_id] = tel_pos * u.m
+        info['pixel_pos'][tel_id] = pix_pos
+        info['num_channels'][tel_id] = nchans
+
+    if cache_path is not None:
+        _write_instrument_cache(cache_path, info)
+
+    return info
+
+
+def _write_instrument_cache(cache_path, info):
+    """
+    Pickle ``info`` to ``cache_path`` atomically: the pickle is written to a
+    temporary file in the same directory and moved into place, so that
+    concurrent readers (e.g. the workers of `MultiFileEventSource`) never
+    see a partially written file.
+    """
+    cache_dir = os.path.dirname(cache_path)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as cache_file:
+                pickle.dump(info, cache_file, pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, cache_path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+    except OSError as err:
+        logger.warning("could not write instrument cache '{}': {}"
+                       .format(cache_path, err))
+
+    return info
+
+
+def _fill_instrument_info(data, info):
     """
     fill the data.inst structure with instrumental information.
 
@@ -227,39 +776,21 @@ def _fill_instrument_info(data, pyhessio):
     ----------
     data: DataContainer
         data container to fill in
-
+    info: dict
+        instrument information, as returned by `_read_instrument_info`
     """
-    if not data.inst.telescope_ids:
-        data.inst.telescope_ids = list(pyhessio.get_telescope_ids())
-        data.inst.subarray = SubarrayDescription("MonteCarloArray")
-
-        for tel_id in data.inst.telescope_ids:
-            try:
-
-                pix_pos = pyhessio.get_pixel_position(tel_id) * u.m
-                foclen = pyhessio.get_optical_foclen(tel_id) * u.m
-                mirror_area = pyhessio.get_mirror_area(tel_id) * u.m ** 2
-                num_tiles = pyhessio.get_mirror_number(tel_id)
-                tel_pos = pyhessio.get_telescope_position(tel_id) * u.m
-
-                tel = TelescopeDescription.guess(*pix_pos, foclen)
-                tel.optics.mirror_area = mirror_area
-                tel.optics.num_mirror_tiles = num_tiles
-                data.inst.subarray.tels[tel_id] = tel
-                data.inst.subarray.positions[tel_id] = tel_pos
-
-                # deprecated fields that will become part of
-                # TelescopeDescription or SubrrayDescription
-                data.inst.optical_foclen[tel_id] = foclen
-                data.inst.pixel_pos[tel_id] = pix_pos
-                data.inst.tel_pos[tel_id] = tel_pos
-
-                nchans = pyhessio.get_num_channel(tel_id)
-                npix = pyhessio.get_num_pixels(tel_id)
-                data.inst.num_channels[tel_id] = nchans
-                data.inst.num_pixels[tel_id] = npix
-                data.inst.mirror_dish_area[tel_id] = mirror_area
-                data.inst.mirror_numtiles[tel_id] = num_tiles
-
-            except HessioGeneralError:
-                pass
+    subarray = info['subarray']
+    data.inst.telescope_ids = info['telescope_ids']
+    data.inst.subarray = subarray
+
+    # deprecated fields that will become part of
+    # TelescopeDescription or SubrrayDescription
+    for tel_id, tel in subarray.tels.items():
+        pix_pos = info['pixel_pos'][tel_id]
+        data.inst.optical_foclen[tel_id] = tel.optics.effective_focal_length
+        data.inst.pixel_pos[tel_id] = pix_pos
+        data.inst.tel_pos[tel_id] = subarray.positions[tel_id]
+        data.inst.num_channels[tel_id] = info['num_channels'][tel_id]
+        data.inst.num_pixels[tel_id] = pix_pos.shape[1]
+        data.inst.mirror_dish_area[tel_id] = tel.optics.mirror_area
+        data.inst.mirror_numtiles[tel_id] = tel.optics.num_mirror_tiles
@@ -0,0 +1,177 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+"""
+Read several simtelarray files in parallel, with one decoding process per
+file. This requires the hessio python library to be installed.
+"""
+import multiprocessing
+import os
+import pickle
+import queue
+import traceback
+from glob import glob
+
+from traitlets import Unicode, Int, Bool, List
+
+from ctapipe.core import Component, Provenance
+from ctapipe.io.hessio import hessio_chunk_source
+
+__all__ = ['MultiFileEventSource']
+
+
+class MultiFileEventSource(Component):
+    """
+    Event source decoding a list of simtelarray files in a pool of worker
+    processes.
+
+    As pyhessio can only read one file per process, each worker decodes its
+    files with `ctapipe.io.hessio.hessio_chunk_source` and sends the
+    resulting `ctapipe.io.hessio.HessioEventChunk` objects back to the
+    consuming process. Iterating over the source yields these chunks,
+    ``chunk.meta['input']`` telling which file they come from.
+
+    With `ordered` (the default), chunks are yielded in the order of the
+    files and of the events within each file, independent of the number of
+    workers. Otherwise, they are yielded as soon as any worker has decoded
+    them, which avoids waiting for slow files.
+
+    The number of chunks waiting to be consumed is bounded by `queue_size`
+    per worker, so the memory use does not depend on the number of files.
+
+    Attributes
+    ----------
+    input_paths : list
+        paths or glob patterns of the files to read
+    """
+    name = 'MultiFileEventSource'
+
+    input_paths = List(Unicode, help='Paths or glob patterns of the input '
+                                     'files').tag(config=True)
+    n_workers = Int(None, allow_none=True,
+                    help='Number of worker processes, by default the number '
+                         'of CPUs').tag(config=True)
+    chunk_size = Int(100, help='Number of events per chunk').tag(config=True)
+    max_events = Int(None, allow_none=True,
+                     help='Maximum number of events read from each '
+                          'file').tag(config=True)
+    allowed_tels = List(Int, default_value=None, allow_none=True,
+                        help='Telescopes to read, by default '
+                             'all').tag(config=True)
+    ordered = Bool(True, help='Yield the chunks in the order of the files, '
+                              'instead of as soon as they are '
+                              'decoded').tag(config=True)
+    queue_size = Int(4, help='Maximum number of decoded chunks waiting per '
+                             'worker').tag(config=True)
+
+    def __init__(self, config, tool, **kwargs):
+        """
+        Parameters
+        ----------
+        config : traitlets.loader.Config
+            Configuration specified by config file or cmdline arguments.
+            Used to set traitlet values.
+            Set to None if no configuration to pass.
+        tool : ctapipe.core.Tool
+            Tool executable that is calling this component.
+            Passes the correct logger to the component.
+            Set to None if no Tool to pass.
+        kwargs
+        """
+        super().__init__(config=config, parent=tool, **kwargs)
+
+    @property
+    def files(self):
+        """ list of the input files, with the glob patterns expanded """
+        files = []
+        for path in self.input_paths:
+            matches = sorted(glob(path))
+            if not matches:
+                raise FileNotFoundError("no file matches '{}'".format(path))
+            files.extend(matches)
+        return files
+
+    def __iter__(self):
+        files = self.files
+        if not files:
+            return
+
+        n_workers = min(self.n_workers or os.cpu_count() or 1, len(files))
+        for path in files:
+            Provenance().add_input_file(path, role='dl0.sub.evt')
+
+        if self.ordered:
+            # files are dealt round-robin to the workers, each with its own
+            # queue, so reading the queues round-robin restores the order
+            queues = [multiprocessing.Queue(self.queue_size)
+                      for _ in range(n_workers)]
+        else:
+            queues = [multiprocessing.Queue(self.queue_size * n_workers)]
+
+        workers = []
+        for worker_index in range(n_workers):
+            worker = multiprocessing.Process(
+                target=_decode_files,
+                args=(list(enumerate(files))[worker_index::n_workers],
+                      queues[worker_index % len(queues)],
+                      self.chunk_size, self.max_events, self.allowed_tels),
+                daemon=True,
+            )
+            worker.start()
+            workers.append(worker)
+        self.log.info("decoding %d files with %d workers", len(files),
+                      n_workers)
+
+        try:
+            n_done = 0
+            while n_done < len(files):
+                result_queue = queues[n_done % len(queues)]
+                file_index, payload = _get(result_queue, workers)
+                if isinstance(payload, _WorkerError):
+                    raise RuntimeError("decoding '{}' failed:\n{}"
+                                       .format(files[file_index], payload))
+                if payload is None:
+                    n_done += 1
+                else:
+                    yield pickle.loads(payload)
+        finally:
+            for worker in workers:
+                if worker.is_alive():
+                    worker.terminate()
+                worker.join()
+
+
+class _WorkerError(str):
+    """ traceback of an exception raised in a worker """
+
+
+def _get(result_queue, workers, timeout=1):
+    """ get from a queue, failing if the workers died without a result """
+    while True:
+        try:
+            return result_queue.get(timeout=timeout)
+        except queue.Empty:
+            crashed = [w for w in workers if w.exitcode not in (None, 0)]
+            if crashed:
+                raise RuntimeError("worker process exited with code {}"
+                                   .format(crashed[0].exitcode))
+
+
+def _decode_files(files, result_queue, chunk_size, max_events, allowed_tels):
+    """
+    Worker process: decode ``files``, a list of (file_index, path), and put
+    (file_index, pickled chunk) into ``result_queue``, followed by
+    (file_index, None) once a file is finished.
+    """
+    for file_index, path in files:
+        try:
+            source = hessio_chunk_source(path, chunk_size=chunk_size,
+                                         max_events=max_events,
+                                         allowed_tels=allowed_tels)
+            for chunk in source:
+                # pickle now, as the chunk is refilled after the next step of
+                # the source, possibly before the queue has sent it
+                payload = pickle.dumps(chunk, pickle.HIGHEST_PROTOCOL)
+                result_queue.put((file_index, payload))
+        except Exception:
+            result_queue.put((file_index, _WorkerError(traceback.format_exc())))
+            return
+        result_queue.put((file_index, None))
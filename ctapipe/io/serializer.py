@@ -2,16 +2,22 @@
 Serialize ctapipe containers to file
 """
 
+import os
 from abc import ABC, abstractmethod
 from gzip import open as gzip_open
+from io import BytesIO
 from pickle import dump
 
 import numpy as np
+import tables
 from astropy import log
+from astropy.io import fits
 from astropy.table import Table, Column
+from astropy.time import Time
+from astropy.units import Quantity
 from traitlets import Unicode
 
-from ctapipe.core import Container
+from ctapipe.core import Container, ContainerBatch
 
 __all__ = ['Serializer']
 
@@ -43,7 +49,7 @@ class Serializer:
         ----------
         filename: str
             full path name for i/o file
-        format: str ('fits', 'img', 'pickle')
+        format: str ('fits', 'hdf5', 'img', 'pickle')
         mode: str ('write', 'read')
             : use this serializer as writer or reader
         mode: str
@@ -63,7 +69,7 @@ class Serializer:
                              format(mode))
         self._writer = None
 
-        if self.format == 'fits':
+        if self.format in ('fits', 'hdf5'):
             self._writer = TableWriter(outfile=filename, mode=mode,
                                        format=format)
         elif self.format == 'pickle':
@@ -72,7 +78,8 @@ class Serializer:
             raise NotImplementedError('img serializer format is'
                                       ' not yet implemented')
         else:
-            raise ValueError('You can serialize only on pickle, fits or img')
+            raise ValueError('You can serialize only on pickle, fits, hdf5 '
+                             'or img')
 
     def __enter__(self):
         return self
@@ -92,7 +99,8 @@ class Serializer:
 
     def add_container(self, container):
         """
-        Add a container to serializer
+        Add a container (or a `ctapipe.core.ContainerBatch` of containers) to
+        serializer
         """
         self._writer.add_container(container)
 
@@ -162,7 +170,7 @@ class GZipPickleWriter(Writer):
         ------
         TypeError: When container is not type of container
         """
-        if not isinstance(container, Container):
+        if not isinstance(container, (Container, ContainerBatch)):
             raise TypeError('Can write only Containers')
         dump(container, self.file_object)
 
@@ -246,31 +254,174 @@ def to_table(container):
                  meta=container.meta)
 
 
+def batch_to_table(batch):
+    """
+    Convert a `ctapipe.core.ContainerBatch` to an `astropy.Table` with one
+    row per container
+
+    Parameters
+    ----------
+    batch: ctapipe.core.ContainerBatch
+
+    Returns
+    -------
+    Table: astropy.Table
+    """
+    names = [name for name in batch.colnames
+             if name not in not_writeable_fields]
+    return Table(data=[batch[name] for name in names], names=names,
+                 meta=batch.meta)
+
+
+class _FITSTableStream:
+    """
+    Binary table HDU written chunk by chunk: the rows of each chunk are
+    appended to the file, and the number of rows in the header is updated
+    on `close`.
+    """
+
+    def __init__(self, filename):
+        self._file = open(filename, 'wb')
+        fits.PrimaryHDU().writeto(self._file)
+        self._header = None
+        self._header_offset = None
+        self._n_rows = 0
+
+    def write(self, table):
+        """ append the rows of a table, with the same columns as the first
+        one """
+        hdu = fits.table_to_hdu(table)
+        buffer = BytesIO()
+        hdu.writeto(buffer)
+        header = hdu.header
+        if header['PCOUNT'] != 0:
+            raise ValueError("variable-length columns can not be streamed")
+
+        raw = buffer.getvalue()
+        n_bytes = header['NAXIS1'] * header['NAXIS2']
+        data_offset = len(raw) - _fits_padded_size(n_bytes)
+
+        if self._header is None:
+            self._header = header
+            self._header_offset = self._file.tell()
+            self._file.write(raw[data_offset - len(header.tostring()):
+                                 data_offset])
+        elif _fits_column_formats(header) != \
+                _fits_column_formats(self._header):
+            raise ValueError("the columns of the chunk do not match the ones "
+                             "of the table: {} != {}".format(
+                                 _fits_column_formats(header),
+                                 _fits_column_formats(self._header)))
+
+        self._file.write(raw[data_offset:data_offset + n_bytes])
+        self._n_rows += len(table)
+
+    def close(self):
+        """ pad the data and write the final header """
+        if self._header is not None:
+            n_bytes = self._header['NAXIS1'] * self._n_rows
+            self._file.write(b'\0' * (_fits_padded_size(n_bytes) - n_bytes))
+            self._header['NAXIS2'] = self._n_rows
+            self._file.seek(self._header_offset)
+            self._file.write(self._header.tostring().encode('ascii'))
+        self._file.close()
+
+
+FITS_BLOCK_SIZE = 2880
+
+
+def _fits_padded_size(n_bytes):
+    """ size of data padded to full FITS blocks """
+    return -(-n_bytes // FITS_BLOCK_SIZE) * FITS_BLOCK_SIZE
+
+
+def _fits_column_formats(header):
+    """ names and binary formats of the columns of a table header """
+    return [(header['TTYPE{}'.format(i)], header['TFORM{}'.format(i)],
+             header.get('TDIM{}'.format(i)))
+            for i in range(1, header['TFIELDS'] + 1)]
+
+
+class _HDF5TableStream:
+    """
+    pytables table written chunk by chunk, with units stored in the
+    ``<column>_UNIT`` attributes as by `ctapipe.io.HDF5TableWriter`
+    """
+
+    def __init__(self, filename, table_name):
+        self._h5file = tables.open_file(filename, mode='w')
+        self._table_name = table_name
+        self._table = None
+
+    def write(self, table):
+        """ append the rows of a table, with the same columns as the first
+        one """
+        columns = {}
+        units = {}
+        for name in table.colnames:
+            column = table[name]
+            if isinstance(column, Time):
+                column = column.utc.mjd
+            elif getattr(column, 'unit', None) is not None:
+                units[name] = str(column.unit)
+            columns[name] = np.asarray(column)
+
+        rows = np.empty(len(table), dtype=[
+            (name, values.dtype, values.shape[1:])
+            for name, values in columns.items()
+        ])
+        for name, values in columns.items():
+            rows[name] = values
+
+        if self._table is None:
+            self._table = self._h5file.create_table('/', self._table_name,
+                                                    description=rows.dtype)
+            for key, value in table.meta.items():
+                self._table.attrs[key] = value
+            for name, unit in units.items():
+                self._table.attrs['{}_UNIT'.format(name)] = unit
+        self._table.append(rows)
+
+    def close(self):
+        self._h5file.close()
+
+
 class TableWriter(Writer):
     """
-    Fits table writer
+    Table writer, streaming the containers to a FITS or HDF5 file.
+
+    The containers are collected in chunks of `chunk_size` rows, which are
+    appended to the output table as soon as they are complete, so that the
+    memory used does not depend on the number of rows. All chunks must have
+    the same columns with the same shapes. In HDF5 files, the table is named
+    after the container class, like the FITS extension.
     """
-    def __init__(self, outfile, format='fits', mode='w'):
+    def __init__(self, outfile, format='fits', mode='w', chunk_size=1000):
         """
         Parameters
         ----------
         outfile: str
             output file name
         format: str
-            'fits' or 'img'
+            'fits' or 'hdf5'
         mode: str
             'w'	open for writing, truncating the file first
             'x'	open for exclusive creation, failing if the file already exists
+        chunk_size: int
+            number of containers written at once
         Raises
         ------
         NotImplementedError: when mode is correct but not yet implemented
-        ValueError: when mode is not correct
+        ValueError: when mode or format is not correct
+        FileExistsError: when the file exists and mode is 'x'
         """
         super().__init__(outfile)
-        self.table = Table()
-        self._created_table = False
+        if format not in ('fits', 'hdf5'):
+            raise ValueError('{} is not a valid table format. Use fits or '
+                             'hdf5'.format(format))
         self.format = format
         self.outfile = outfile
+        self.chunk_size = chunk_size
         if mode == 'w':
             self.overwrite = True
         elif mode == 'x':
@@ -281,54 +432,101 @@ class TableWriter(Writer):
         else:
             raise ValueError('{} is not a valid write mode. Use x, w or a'.
                              format(mode))
+        if not self.overwrite and os.path.exists(outfile):
+            raise FileExistsError('file exists: {} and mode is {}'.
+                                  format(outfile, mode))
+        self._stream = None
+        self._rows = []
+        self._meta = None
+        self._units = {}
+        self.n_rows = 0
 
     def _setup_table(self, container):
         """
-        Create Fits table and HDU
+        Open the output file, using the metadata of the first container
 
         Parameters
         ----------
-        container: ctapipe.core.Container
+        container: ctapipe.core.Container or ctapipe.core.ContainerBatch
         """
-        # Create Table from Container
-        self.table = to_table(container)
+        if isinstance(container, ContainerBatch):
+            container_class = container.container_class
+        else:
+            container_class = type(container)
+            self._units = {
+                key: container.fields[key].unit or value.unit
+                for key, value in writeable_items(container).items()
+                if isinstance(value, Quantity)
+            }
+        self._meta = dict(container.meta)
 
-        # Write HDU name
         if self.format == "fits":
-            self.table.meta["EXTNAME"] = type(container).__name__
-        self._created_table = True
+            # Write HDU name
+            self._meta["EXTNAME"] = container_class.__name__
+            self._stream = _FITSTableStream(self.outfile)
+        else:
+            self._stream = _HDF5TableStream(self.outfile,
+                                            container_class.__name__)
+
+    def _write_rows(self):
+        """ write the collected containers as a chunk """
+        if not self._rows:
+            return
+        names = list(self._rows[0])
+        table = Table(data=[Column(np.stack([row[name] for row in self._rows]),
+                                   unit=self._units.get(name))
+                            for name in names],
+                      names=names, meta=self._meta)
+        self._rows = []
+        self._write_table(table)
+
+    def _write_table(self, table):
+        self._stream.write(table)
+        self.n_rows += len(table)
 
     def add_container(self, container):
         """
-        Add a container as a table row
+        Add a container as a table row, or all containers of a
+        `ctapipe.core.ContainerBatch` at once
+
         Parameters
         ----------
-        container: ctapipe.core.Container
+        container: ctapipe.core.Container or ctapipe.core.ContainerBatch
 
         Raises
         ------
         TypeError: When add another type than Container
         """
+        if isinstance(container, ContainerBatch):
+            if len(container) == 0:
+                return
+            if self._stream is None:
+                self._setup_table(container)
+            self._write_rows()
+            table = batch_to_table(container)
+            table.meta = self._meta
+            self._write_table(table)
+            return
+
         if not isinstance(container, Container):
             raise TypeError("Can write only Containers")
 
-        if not self._created_table:
+        if self._stream is None:
             self._setup_table(container)
-        else:
-            self.table.add_row(writeable_items(container))
+        # copy the values, as containers are usually reused
+        row = {}
+        for key, value in writeable_items(container).items():
+            if key in self._units:
+                value = value.to(self._units[key]).value
+            row[key] = np.array(value)
+        self._rows.append(row)
+        if len(self._rows) >= self.chunk_size:
+            self._write_rows()
 
-    def close(self, **kwargs):
+    def close(self):
         """
-        Write Fits table to file
-        Parameters
-        ----------
-        kwargs to be passed to `astropy.Table.write method`
-
-        Returns
-        -------
-        Fits Table
+        Write the remaining rows and close the file
         """
-        # Write table using astropy.table write method
-        self.table.write(output=self.outfile, format=self.format,
-                         overwrite=self.overwrite, **kwargs)
-        return self.table
+        if self._stream is not None:
+            self._write_rows()
+            self._stream.close()
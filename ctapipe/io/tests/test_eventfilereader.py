@@ -1,4 +1,5 @@
 from os.path import join, dirname
+import pytest
 from ctapipe.utils import get_dataset
 from ctapipe.io.eventfilereader import EventFileReader, \
     EventFileReaderFactory, HessioFileReader
@@ -54,3 +55,41 @@ def test_event_file_reader_factory():
     file = cls(None, None)
     num_events = file.num_events
     assert(num_events == 9)
+
+
+def test_hessio_event_index(tmpdir):
+    dataset = get_dataset("gamma_test.simtel.gz")
+    index_path = str(tmpdir.join("gamma_test.index.ecsv"))
+    file = HessioFileReader(None, None, input_path=dataset,
+                            use_index=True, index_path=index_path)
+    assert file.num_events == 9
+    assert file.event_id_list[2] == 803
+    assert file.event_index['tels_with_data'][0] == '38,47'
+
+    # a new reader uses the index written by the first one
+    file = HessioFileReader(None, None, input_path=dataset,
+                            use_index=True, index_path=index_path)
+    assert len(file.event_index) == 9
+    event = file.get_event(803, True)
+    assert event.count == 2
+
+    with pytest.raises(IndexError):
+        file.get_event(12345, True)
+
+
+def test_hessio_event_index_corrupt(tmpdir):
+    dataset = get_dataset("gamma_test.simtel.gz")
+    index_path = tmpdir.join("gamma_test.index.ecsv")
+    index_path.write("# %ECSV 0.9\n# truncated")
+    file = HessioFileReader(None, None, input_path=dataset,
+                            use_index=True, index_path=str(index_path))
+    assert file.num_events == 9
+
+
+def test_hessio_no_index_by_default(tmpdir):
+    dataset = get_dataset("gamma_test.simtel.gz")
+    index_path = tmpdir.join("gamma_test.index.ecsv")
+    file = HessioFileReader(None, None, input_path=dataset,
+                            index_path=str(index_path))
+    assert file.num_events == 9
+    assert not index_path.exists()
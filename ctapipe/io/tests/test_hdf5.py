@@ -1,8 +1,10 @@
-from ctapipe.io.containers import R0CameraContainer, MCEventContainer
+from ctapipe.io.containers import (R0CameraContainer, MCEventContainer,
+                                  DL1CameraContainer)
 from ctapipe.io.hdftableio import HDF5TableWriter, HDF5TableReader
 import numpy as np
 from astropy import units as u
 import tables
+import json
 import pytest
 
 @pytest.fixture(scope='session')
@@ -78,6 +80,221 @@ def test_read_whole_table(temp_h5_file):
     for cont in reader.read('/R0/MC', mc):
         print(cont)
 
+
+def test_write_container_batch(tmpdir):
+    from ctapipe.core import ContainerBatch
+
+    filename = str(tmpdir.join('batch.h5'))
+    batch = ContainerBatch(MCEventContainer)
+    for ii in range(10):
+        mc = MCEventContainer()
+        mc.energy = ii * u.TeV
+        mc.core_x = ii * u.m
+        batch.append(mc)
+
+    writer = HDF5TableWriter(filename, group_name='data')
+    writer.write('MC', batch)
+    writer.write('MC', batch)  # append a second time
+    del writer
+
+    reader = HDF5TableReader(filename)
+    energies = [mc.energy.to(u.TeV).value
+                for mc in reader.read('/data/MC', MCEventContainer())]
+    assert energies == list(range(10)) * 2
+
+
+@pytest.mark.parametrize('buffer_size', [0, 1, 7, 1000])
+def test_buffered_write(tmpdir, buffer_size):
+    filename = str(tmpdir.join('buffered.h5'))
+    r0tel = R0CameraContainer()
+    mc = MCEventContainer()
+    r0tel.adc_sums = np.zeros(5)
+    r0tel.num_samples = 10
+
+    with HDF5TableWriter(filename, group_name='data',
+                         buffer_size=buffer_size) as writer:
+        for ii in range(20):
+            # containers are reused, so the buffer must copy their values
+            r0tel.adc_sums[:] = ii
+            mc.energy = ii * u.GeV  # stored in TeV
+            writer.write('tel_001', r0tel)
+            writer.write('MC', mc)
+
+    with tables.open_file(filename) as h5file:
+        assert h5file.root.data.MC.attrs['energy_UNIT'] == 'TeV'
+        np.testing.assert_allclose(h5file.root.data.MC.col('energy'),
+                                   np.arange(20) / 1000)
+        adc_sums = h5file.root.data.tel_001.col('adc_sums')
+        assert adc_sums.shape == (20, 5)
+        np.testing.assert_array_equal(adc_sums[:, 0], np.arange(20))
+
+
+def test_read_chunks(tmpdir):
+    filename = str(tmpdir.join('chunks.h5'))
+    mc = MCEventContainer()
+    with HDF5TableWriter(filename, group_name='data') as writer:
+        for ii in range(25):
+            mc.energy = ii * u.TeV
+            mc.core_x = -ii * u.m
+            writer.write('MC', mc)
+
+    reader = HDF5TableReader(filename)
+
+    batches = list(reader.read_chunks('/data/MC', MCEventContainer,
+                                      chunk_size=10))
+    assert [len(batch) for batch in batches] == [10, 10, 5]
+    assert batches[0]['energy'].unit == u.TeV
+    assert batches[0].to_container(3).core_x == -3 * u.m
+
+    # column selection and in-kernel selection of the rows
+    batches = list(reader.read_chunks('/data/MC', MCEventContainer,
+                                      chunk_size=10, columns=['energy'],
+                                      where='(energy > emin) & (energy < 22)',
+                                      condvars=dict(emin=12)))
+    assert [len(batch) for batch in batches] == [7, 2]
+    assert batches[0].colnames == ['energy']
+    energies = np.concatenate([batch['energy'].value for batch in batches])
+    np.testing.assert_array_equal(energies, np.arange(13, 22))
+
+    with pytest.raises(KeyError):
+        next(reader.read_chunks('/data/MC', MCEventContainer,
+                                columns=['foo']))
+
+
+def test_variable_length_columns(tmpdir):
+    from ctapipe.core import ContainerBatch
+
+    filename = str(tmpdir.join('varlen.h5'))
+    filters = tables.Filters(complevel=5, complib='blosc:zstd')
+    n_pixels = [1855, 2048, 11328, 1855]
+
+    dl1 = DL1CameraContainer()
+    with HDF5TableWriter(filename, group_name='dl1',
+                         filters=filters) as writer:
+        writer.set_variable_length('images', 'image|peakpos')
+        for ii, n_pix in enumerate(n_pixels):
+            dl1.image = np.full((1, n_pix), ii, dtype=np.float32) * u.electron
+            dl1.peakpos = np.arange(n_pix).reshape(1, n_pix)
+            writer.write('images', dl1)
+
+        # a batch holds images of a single camera type
+        batch = ContainerBatch(DL1CameraContainer)
+        for ii in range(3):
+            dl1.image = np.full((1, 10), ii, dtype=np.float32) * u.electron
+            dl1.peakpos = np.zeros((1, 10), dtype=int)
+            batch.append(dl1)
+        writer.write('images', batch)
+
+    with tables.open_file(filename) as h5file:
+        assert h5file.root.dl1.images__image.filters.complib == 'blosc:zstd'
+        assert h5file.root.dl1.images__image.nrows == sum(n_pixels) + 30
+
+    reader = HDF5TableReader(filename)
+    images = [cont.image.copy()
+              for cont in reader.read('/dl1/images', DL1CameraContainer())]
+    assert [image.shape for image in images] == \
+        [(1, n_pix) for n_pix in n_pixels] + [(1, 10)] * 3
+    assert images[2].unit == u.electron
+    assert np.all(images[2].value == 2)
+    assert np.all(images[-1].value == 2)
+
+    batches = list(reader.read_chunks('/dl1/images', DL1CameraContainer,
+                                      chunk_size=5, columns=['image',
+                                                             'peakpos']))
+    assert [len(batch) for batch in batches] == [5, 2]
+    peakpos = batches[0].to_container(1).peakpos
+    np.testing.assert_array_equal(peakpos, np.arange(2048).reshape(1, 2048))
+    assert batches[1]['image'][0].unit == u.electron
+
+
+def test_storage_settings(tmpdir):
+    from traitlets.config import Config
+
+    filename = str(tmpdir.join('settings.h5'))
+    config = Config({'HDF5TableWriter': {'complib': 'blosc:lz4',
+                                         'complevel': 3,
+                                         'chunkshape': 64}})
+    mc = MCEventContainer()
+    mc.energy = 1 * u.TeV
+    with HDF5TableWriter(filename, group_name='data', config=config,
+                         bitshuffle=True, expected_rows=100) as writer:
+        writer.write('MC', mc)
+
+    with tables.open_file(filename) as h5file:
+        table = h5file.root.data.MC
+        assert table.filters.complib == 'blosc:lz4'
+        assert table.filters.complevel == 3
+        assert table.chunkshape == (64, )
+        assert table.attrs['COMPLIB'] == 'blosc:lz4'
+        assert table.attrs['COMPLEVEL'] == 3
+        assert table.attrs['BITSHUFFLE']
+        assert not table.attrs['SHUFFLE']
+        assert table.attrs['EXPECTED_ROWS'] == 100
+        assert table.attrs['CHUNKSHAPE'] == 64
+
+    # by default, the nodes are not compressed
+    with HDF5TableWriter(filename, group_name='data') as writer:
+        writer.write('MC', mc)
+
+    with tables.open_file(filename) as h5file:
+        assert h5file.root.data.MC.filters.complevel == 0
+
+
+def test_merge_shards(tmpdir):
+    from ctapipe.core import Provenance
+    from ctapipe.io.hdftableio import shard_filename, merge_hdf5_files
+
+    filename = str(tmpdir.join('dl1.h5'))
+    assert shard_filename(filename, 2) == str(tmpdir.join('dl1.part002.h5'))
+
+    dl1 = DL1CameraContainer()
+    mc = MCEventContainer()
+    shards = []
+    for shard in range(3):
+        Provenance().start_activity('shard{}'.format(shard))
+        with HDF5TableWriter(filename, group_name='dl1',
+                             shard=shard) as writer:
+            writer.set_variable_length('images', 'image')
+            for ii in range(4):
+                dl1.image = np.full(10 * (shard + 1), shard, dtype=np.float32)
+                mc.energy = (10 * shard + ii) * u.TeV
+                writer.write('images', dl1)
+                writer.write('MC', mc)
+        Provenance().finish_activity()
+        shards.append(writer.filename)
+
+    merged = str(tmpdir.join('merged.h5'))
+    merge_hdf5_files(shards, merged)
+
+    reader = HDF5TableReader(merged)
+    energies = [mc.energy.value
+                for mc in reader.read('/dl1/MC', MCEventContainer())]
+    assert energies == [10 * shard + ii for shard in range(3)
+                        for ii in range(4)]
+    images = [cont.image.copy() for cont in
+              reader.read('/dl1/images', DL1CameraContainer())]
+    assert [len(image) for image in images] == [10] * 4 + [20] * 4 + [30] * 4
+    assert np.all(images[-1] == 2)
+
+    with tables.open_file(merged) as h5file:
+        assert 'SHARD' not in h5file.root._v_attrs
+        provenance = [json.loads(activity)
+                      for activity in h5file.root.CTAPIPE_PROVENANCE]
+    names = [activity['activity_name'] for activity in provenance]
+    assert {'shard0', 'shard1', 'shard2'} <= set(names)
+    uuids = [activity['activity_uuid'] for activity in provenance]
+    assert len(uuids) == len(set(uuids))
+
+    # tables with different units can not be merged
+    mc.energy = 1 * u.TeV
+    with HDF5TableWriter(filename, group_name='dl1', shard=3) as writer:
+        writer.write('MC', mc)
+        writer._tables['MC'].attrs['energy_UNIT'] = 'GeV'
+    with pytest.raises(ValueError):
+        merge_hdf5_files([shards[0], writer.filename], merged,
+                         overwrite=True)
+
+
 if __name__ == '__main__':
 
     import logging
@@ -85,4 +302,4 @@ if __name__ == '__main__':
 
     test_write_container("test.h5")
     test_read_container("test.h5")
-    test_read_whole_table("test.h5")
\ No newline at end of file
+    test_read_whole_table("test.h5")
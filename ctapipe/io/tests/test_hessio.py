@@ -1,4 +1,7 @@
-from ctapipe.io.hessio import hessio_event_source
+import numpy as np
+
+from ctapipe.io.hessio import (hessio_event_source, hessio_chunk_source,
+                               hessio_get_subarray)
 from ctapipe.utils import get_dataset
 
 
@@ -23,3 +26,69 @@ def test_get_specific_event():
     event = next(source)
     assert event.count == 2
     assert event.dl0.event_id == 803
+
+
+
+def test_chunk_source():
+    dataset = get_dataset("gamma_test.simtel.gz")
+    events = hessio_event_source(dataset)
+    n_events = []
+    for chunk in hessio_chunk_source(dataset, chunk_size=4):
+        n_events.append(len(chunk))
+        for tel in chunk.tel.values():
+            assert len(tel['event_index']) == len(tel['adc_samples'])
+
+        for index in range(len(chunk)):
+            event = next(events)
+            assert chunk['count'][index] == event.count
+            assert chunk['event_id'][index] == event.r0.event_id
+            assert chunk['mc_energy'][index] == event.mc.energy
+            for tel_id in event.r0.tels_with_data:
+                tel = chunk.tel[tel_id]
+                row = np.nonzero(tel['event_index'] == index)[0][0]
+                assert np.array_equal(tel['adc_samples'][row],
+                                      event.r0.tel[tel_id].adc_samples)
+
+    assert n_events == [4, 4, 1]
+
+
+def test_field_selection():
+    dataset = get_dataset("gamma_test.simtel.gz")
+    event = next(hessio_event_source(dataset, fields=[]))
+    assert event.r0.tels_with_data == {38, 47}
+    assert len(event.r0.tel) == 0
+    assert len(event.mc.tel) == 0
+    assert event.mc.energy > 0
+
+    event = next(hessio_event_source(dataset, fields=['adc_sums']))
+    assert event.r0.tel[38].adc_sums is not None
+    assert event.r0.tel[38].adc_samples is None
+    assert len(event.mc.tel) == 0
+
+
+def test_get_subarray(tmpdir):
+    dataset = get_dataset("gamma_test.simtel.gz")
+    subarray = hessio_get_subarray(dataset, cache_dir=str(tmpdir))
+    assert len(tmpdir.listdir()) == 1
+
+    event = next(hessio_event_source(dataset, fields=[]))
+    assert set(subarray.tels) == set(event.inst.subarray.tels)
+    assert subarray.tels[38].camera.cam_id == \
+        event.inst.subarray.tels[38].camera.cam_id
+
+    # the second time, the subarray is read from the cache
+    cached = hessio_get_subarray(dataset, cache_dir=str(tmpdir))
+    assert set(cached.tels) == set(subarray.tels)
+    assert (cached.positions[38] == subarray.positions[38]).all()
+
+
+def test_get_subarray_cache_opt_in(tmpdir, monkeypatch):
+    dataset = get_dataset("gamma_test.simtel.gz")
+    monkeypatch.delenv('CTAPIPE_CACHE_DIR', raising=False)
+    monkeypatch.setenv('HOME', str(tmpdir))
+    hessio_get_subarray(dataset)
+    assert len(tmpdir.listdir()) == 0
+
+    monkeypatch.setenv('CTAPIPE_CACHE_DIR', str(tmpdir))
+    hessio_get_subarray(dataset)
+    assert [path.ext for path in tmpdir.listdir()] == ['.pkl']
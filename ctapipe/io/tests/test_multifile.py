@@ -0,0 +1,18 @@
+from ctapipe.io.hessio import hessio_event_source
+from ctapipe.io.multifile import MultiFileEventSource
+from ctapipe.utils import get_dataset
+
+
+def test_multifile_event_source():
+    dataset = get_dataset("gamma_test.simtel.gz")
+    event_ids = [event.r0.event_id for event in hessio_event_source(dataset)]
+
+    source = MultiFileEventSource(None, None, input_paths=[dataset, dataset],
+                                  n_workers=2, chunk_size=4)
+    chunks = list(source)
+    assert [chunk.meta['input'] for chunk in chunks] == [dataset] * 6
+    assert [event_id for chunk in chunks
+            for event_id in chunk['event_id']] == event_ids * 2
+
+    source.ordered = False
+    assert sum(len(chunk) for chunk in source) == 2 * len(event_ids)
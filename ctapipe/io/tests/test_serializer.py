@@ -2,10 +2,14 @@ from copy import deepcopy
 from os import remove
 
 import pytest
+from astropy import units as u
 from astropy.io import fits
 
+from ctapipe.core import ContainerBatch
+from ctapipe.io.containers import MCEventContainer
+from ctapipe.io.hdftableio import HDF5TableReader
 from ctapipe.io.hessio import hessio_event_source
-from ctapipe.io.serializer import Serializer
+from ctapipe.io.serializer import Serializer, TableWriter
 from ctapipe.io.sources import PickleSource
 from ctapipe.utils import get_dataset
 
@@ -152,4 +156,42 @@ def test_fits_context_manager(fits_file_name):
     remove(fits_file_name)
 
 
+def test_fits_container_batch(fits_file_name):
+    batch = ContainerBatch(type(input_containers[0].dl0))
+    for container in input_containers:
+        batch.append(container.dl0)
+
+    with Serializer(filename=fits_file_name, format='fits', mode='w') as writer:
+        writer.add_container(batch)
+        writer.add_container(batch)
+
+    hdu = fits.open(fits_file_name)[1]
+    assert list(hdu.data["event_id"]) == [408, 409, 803] * 2
+    assert hdu.header["EXTNAME"] == "DL0Container"
+    remove(fits_file_name)
+
+
+@pytest.mark.parametrize('format', ['fits', 'hdf5'])
+def test_table_writer_chunks(tmpdir, format):
+    filename = str(tmpdir.join('chunks.' + format))
+    mc = MCEventContainer()
+    writer = TableWriter(filename, format=format, chunk_size=10)
+    for energy in range(25):
+        mc.energy = energy * u.TeV
+        writer.add_container(mc)
+        # only the rows of the current chunk are kept in memory
+        assert len(writer._rows) < 10
+    writer.close()
+
+    if format == 'fits':
+        hdu = fits.open(filename)[1]
+        assert hdu.header["EXTNAME"] == "MCEventContainer"
+        assert list(hdu.data["energy"]) == list(range(25))
+    else:
+        reader = HDF5TableReader(filename)
+        energies = [mc.energy.value for mc in
+                    reader.read('/MCEventContainer', MCEventContainer())]
+        assert energies == list(range(25))
+
+
 # TODO test FITSSource class
\ No newline at end of file
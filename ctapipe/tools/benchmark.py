@@ -0,0 +1,80 @@
+"""
+Time the main ctapipe algorithms on toymodel inputs for each known camera and
+write the results to a table, optionally comparing them to the results of a
+previous run to spot performance regressions.
+"""
+from astropy.table import Table
+
+from ctapipe.benchmarks import (get_benchmark_names, run_benchmarks,
+                                compare_benchmarks)
+from ctapipe.core import Tool, Provenance
+from ctapipe.core.traits import Unicode, Dict, Bool, Int, Float, List
+
+
+class BenchmarkTool(Tool):
+    description = Unicode(__doc__)
+    name = 'ctapipe-benchmark'
+
+    outfile = Unicode('benchmarks.ecsv',
+                      help='output filename, in any format supported by '
+                           'astropy.table (e.g. *.ecsv, *.fits, '
+                           '*.h5)').tag(config=True)
+    reference = Unicode('', help='benchmark table of a previous run to '
+                                 'compare with').tag(config=True)
+    cameras = List(Unicode, default_value=None, allow_none=True,
+                   help='cameras to benchmark, by default all known '
+                        'cameras').tag(config=True)
+    benchmarks = List(Unicode, default_value=None, allow_none=True,
+                      help='benchmarks to run, by default all of '
+                           'them').tag(config=True)
+    repeat = Int(5, help='number of timing runs per benchmark').tag(
+        config=True)
+    tolerance = Float(0.2, help='relative slow-down with respect to the '
+                                'reference above which a benchmark is '
+                                'reported as a regression').tag(config=True)
+    overwrite = Bool(False, help='overwrite existing output file').tag(
+        config=True)
+
+    aliases = Dict({'outfile': 'BenchmarkTool.outfile',
+                    'reference': 'BenchmarkTool.reference',
+                    'cameras': 'BenchmarkTool.cameras',
+                    'benchmarks': 'BenchmarkTool.benchmarks',
+                    'repeat': 'BenchmarkTool.repeat'})
+
+    flags = Dict({'overwrite': ({'BenchmarkTool': {'overwrite': True}},
+                                'Enable overwriting of output file')})
+
+    examples = ('ctapipe-benchmark --outfile bench.ecsv --overwrite\n'
+                'ctapipe-benchmark --cameras LSTCam --reference bench.ecsv')
+
+    def setup(self):
+        self.results = None
+        unknown = set(self.benchmarks or []) - set(get_benchmark_names())
+        if unknown:
+            raise ValueError("Unknown benchmarks: {}".format(sorted(unknown)))
+
+    def start(self):
+        self.results = run_benchmarks(cameras=self.cameras,
+                                      names=self.benchmarks,
+                                      repeat=self.repeat,
+                                      log=self.log)
+
+    def finish(self):
+        self.results.write(self.outfile, overwrite=self.overwrite)
+        Provenance().add_output_file(self.outfile)
+        self.log.info('\n %s', self.results)
+
+        if self.reference:
+            Provenance().add_input_file(self.reference)
+            comparison = compare_benchmarks(Table.read(self.reference),
+                                            self.results,
+                                            tolerance=self.tolerance)
+            for row in comparison[comparison['regression']]:
+                self.log.warning("regression in %s for %s: %.2fx slower",
+                                 row['benchmark'], row['camera'],
+                                 row['ratio'])
+
+
+def main():
+    tool = BenchmarkTool()
+    tool.run()
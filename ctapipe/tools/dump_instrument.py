@@ -50,7 +50,7 @@ class DumpInstrumentTool(Tool):
 
 
     def setup(self):
-        source = hessio_event_source(self.infile)
+        source = hessio_event_source(self.infile, fields=[])
         data = next(source)  # get one event, so the instrument table is there
         del source
         self.inst = data.inst  # keep a pointer to the instrument stuff
@@ -106,7 +106,8 @@ class DumpTriggersTool(Tool):
 
     def start(self):
         """ main event loop """
-        source = hessio.hessio_event_source(self.infile)
+        # only the trigger information is used
+        source = hessio.hessio_event_source(self.infile, fields=[])
 
         for event in source:
             self.add_event_to_table(event)
@@ -1,12 +1,18 @@
 """
 Extract data necessary to calcualte charge resolution from raw data files.
+
+The calibration can be run in float32 instead of float64 (``--dtype
+float32``). With ``--compare-dtype``, each event is also calibrated in
+float64, and the deviation of the extracted charges and the throughput of
+both calibrations are reported at the end.
 """
 
 import os
+from time import perf_counter
 
 import numpy as np
 from tqdm import tqdm
-from traitlets import Dict, List, Int, Unicode
+from traitlets import Dict, List, Int, Unicode, Bool, CaselessStrEnum
 
 from ctapipe.analysis.camera.chargeresolution import ChargeResolutionCalculator
 from ctapipe.calib.camera.dl0 import CameraDL0Reducer
@@ -28,6 +34,13 @@ class ChargeResolutionGenerator(Tool):
     output_name = Unicode('charge_resolution',
                           help='Name of the output charge resolution pickle '
                                'file').tag(config=True)
+    dtype = CaselessStrEnum(['float64', 'float32'], 'float64',
+                            help='Floating point type of the '
+                                 'calibration').tag(config=True)
+    compare_dtype = Bool(False, help='Also calibrate in float64, and report '
+                                     'the precision and throughput of the '
+                                     'calibration in dtype with respect to '
+                                     'it').tag(config=True)
 
     aliases = Dict(dict(f='HessioFileReader.input_path',
                         max_events='HessioFileReader.max_events',
@@ -43,7 +56,11 @@ class ChargeResolutionGenerator(Tool):
                         max_pe='ChargeResolutionCalculator.max_pe',
                         T='ChargeResolutionGenerator.telescopes',
                         O='ChargeResolutionGenerator.output_name',
+                        dtype='ChargeResolutionGenerator.dtype',
                         ))
+    flags = Dict({'compare-dtype': ({'ChargeResolutionGenerator':
+                                         {'compare_dtype': True}},
+                                    'Compare the calibration with float64')})
     classes = List([HessioFileReader,
                     ChargeExtractorFactory,
                     CameraDL1Calibrator,
@@ -56,7 +73,13 @@ class ChargeResolutionGenerator(Tool):
         self.r1 = None
         self.dl0 = None
         self.dl1 = None
+        self.reference = None
         self.calculator = None
+        self.timings = {}
+        self.n_events = 0
+        self.deviation_max = 0
+        self.deviation_sum2 = 0
+        self.n_charges = 0
 
     def setup(self):
         self.log_format = "%(levelname)s: %(message)s [%(name)s.%(funcName)s]"
@@ -64,6 +87,19 @@ class ChargeResolutionGenerator(Tool):
 
         self.file_reader = HessioFileReader(**kwargs)
 
+        self.r1, self.dl0, self.dl1 = self._setup_calibration(self.dtype)
+        if self.compare_dtype and self.dtype == 'float64':
+            self.log.warning("dtype is float64, nothing to compare")
+        elif self.compare_dtype:
+            self.reference = self._setup_calibration('float64')
+        self.timings = {'float64': 0, self.dtype: 0}
+
+        self.calculator = ChargeResolutionCalculator(**kwargs)
+
+    def _setup_calibration(self, dtype):
+        """ R1, DL0 and DL1 calibrators working in ``dtype`` """
+        kwargs = dict(config=self.config, tool=self, dtype=dtype)
+
         extractor_factory = ChargeExtractorFactory(**kwargs)
         extractor_class = extractor_factory.get_class()
         extractor = extractor_class(**kwargs)
@@ -71,13 +107,21 @@ class ChargeResolutionGenerator(Tool):
         r1_factory = CameraR1CalibratorFactory(origin=self.file_reader.origin,
                                                **kwargs)
         r1_class = r1_factory.get_class()
-        self.r1 = r1_class(**kwargs)
+        r1 = r1_class(**kwargs)
 
-        self.dl0 = CameraDL0Reducer(**kwargs)
+        dl0 = CameraDL0Reducer(**kwargs)
 
-        self.dl1 = CameraDL1Calibrator(extractor=extractor, **kwargs)
+        dl1 = CameraDL1Calibrator(extractor=extractor, **kwargs)
+        return r1, dl0, dl1
 
-        self.calculator = ChargeResolutionCalculator(**kwargs)
+    def _calibrate(self, event, calibration, dtype):
+        """ calibrate the event, adding the time spent to the timings """
+        r1, dl0, dl1 = calibration
+        t_start = perf_counter()
+        r1.calibrate(event)
+        dl0.reduce(event)
+        dl1.calibrate(event)
+        self.timings[dtype] += perf_counter() - t_start
 
     def start(self):
         desc = "Filling Charge Resolution"
@@ -96,9 +140,13 @@ class ChargeResolutionGenerator(Tool):
                                        'true charge!')
                     raise
 
-            self.r1.calibrate(event)
-            self.dl0.reduce(event)
-            self.dl1.calibrate(event)
+            reference = {}
+            if self.reference is not None:
+                self._calibrate(event, self.reference, 'float64')
+                reference = {telid: event.dl1.tel[telid].image[0].copy()
+                             for telid in event.dl1.tels_with_data}
+            self._calibrate(event, (self.r1, self.dl0, self.dl1), self.dtype)
+            self.n_events += 1
 
             if self.telescopes:
                 tels = []
@@ -110,6 +158,13 @@ class ChargeResolutionGenerator(Tool):
                 true_charge = event.mc.tel[telid].photo_electron_image
                 measured_charge = event.dl1.tel[telid].image[0]
                 self.calculator.add_charges(true_charge, measured_charge)
+                if telid in reference:
+                    # the float64 reference promotes the difference
+                    deviation = np.abs(measured_charge - reference[telid])
+                    self.deviation_max = max(self.deviation_max,
+                                             deviation.max())
+                    self.deviation_sum2 += np.sum(deviation ** 2)
+                    self.n_charges += deviation.size
 
     def finish(self):
         directory = self.file_reader.output_directory
@@ -117,6 +172,22 @@ class ChargeResolutionGenerator(Tool):
         ouput_path = os.path.join(directory, name)
         self.calculator.save(ouput_path)
 
+        if self.n_events == 0:
+            return
+        for dtype in sorted(set(self.timings)):
+            if self.timings[dtype] > 0:
+                self.log.info("calibration in %s: %.1f events/s", dtype,
+                              self.n_events / self.timings[dtype])
+        if self.reference is not None:
+            self.log.info("speed-up of %s with respect to float64: %.2f",
+                          self.dtype,
+                          self.timings['float64'] / self.timings[self.dtype])
+        if self.n_charges > 0:
+            self.log.info("charge deviation of %s with respect to float64: "
+                          "max %.3g p.e., rms %.3g p.e.", self.dtype,
+                          self.deviation_max,
+                          np.sqrt(self.deviation_sum2 / self.n_charges))
+
 
 def main():
     exe = ChargeResolutionGenerator()
@@ -0,0 +1,66 @@
+"""
+Merge HDF5 files written by `ctapipe.io.hdftableio.HDF5TableWriter`, e.g.
+the ``<name>.partNNN.h5`` shards written by parallel processes, into a
+single file. Tables are concatenated with bulk copies, after checking that
+they have the same columns and units in all files, and the provenance of
+all inputs is kept.
+"""
+from glob import glob
+
+from ctapipe.core import Tool, Provenance, ToolConfigurationError
+from ctapipe.core.traits import Unicode, Dict, Bool, Int, List
+from ctapipe.io.hdftableio import merge_hdf5_files
+
+
+class MergeHDF5Tool(Tool):
+    description = Unicode(__doc__)
+    name = 'ctapipe-merge-hdf5'
+
+    input_files = List(Unicode, help='input files or glob patterns, which '
+                                     'can also be given as positional '
+                                     'arguments').tag(config=True)
+    outfile = Unicode('', help='merged output file').tag(config=True)
+    chunk_size = Int(100000, help='number of rows copied at '
+                                  'once').tag(config=True)
+    overwrite = Bool(False, help='overwrite existing output file').tag(
+        config=True)
+
+    aliases = Dict({'input_files': 'MergeHDF5Tool.input_files',
+                    'outfile': 'MergeHDF5Tool.outfile',
+                    'chunk_size': 'MergeHDF5Tool.chunk_size'})
+
+    flags = Dict({'overwrite': ({'MergeHDF5Tool': {'overwrite': True}},
+                                'Enable overwriting of output file')})
+
+    examples = 'ctapipe-merge-hdf5 --outfile dl1.h5 dl1.part*.h5'
+
+    def setup(self):
+        if not self.outfile:
+            raise ToolConfigurationError("no output file given")
+
+        self.files = []
+        for pattern in list(self.input_files) + list(self.extra_args):
+            matches = sorted(glob(pattern))
+            if not matches:
+                raise ToolConfigurationError("no file matches '{}'"
+                                             .format(pattern))
+            self.files.extend(matches)
+        if not self.files:
+            raise ToolConfigurationError("no input files given")
+
+    def start(self):
+        for filename in self.files:
+            Provenance().add_input_file(filename)
+        Provenance().add_output_file(self.outfile)
+        self.log.info("merging %d files into '%s'", len(self.files),
+                      self.outfile)
+        merge_hdf5_files(self.files, self.outfile, overwrite=self.overwrite,
+                         chunk_size=self.chunk_size)
+
+    def finish(self):
+        pass
+
+
+def main():
+    tool = MergeHDF5Tool()
+    tool.run()
@@ -36,7 +36,9 @@ entry_points['console_scripts'] = [
     'ctapipe-chargeres-plot = ctapipe.tools.plot_charge_resolution:main',
     'ctapipe-chargeres-hist = '
     'ctapipe.tools.plot_charge_resolution_variation_hist:main',
-    'ctapipe-dump-instrument=ctapipe.tools.dump_instrument:main'
+    'ctapipe-dump-instrument=ctapipe.tools.dump_instrument:main',
+    'ctapipe-benchmark = ctapipe.tools.benchmark:main',
+    'ctapipe-merge-hdf5 = ctapipe.tools.merge_hdf5:main',
 ]
 
 package.version.update_release_version()